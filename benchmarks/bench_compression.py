@@ -0,0 +1,89 @@
+"""
+Size and latency report for compressed prompt documents.
+
+Builds a sample DB with compression disabled (the old plain-TEXT layout),
+measures file size and load latency, runs DBManager.recompress() and
+measures again.
+
+Usage:
+    python benchmarks/bench_compression.py [--prompts 300] [--blocks 20] [--rounds 300]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.db_manager import DBManager
+
+WORDS = ("the rate limiter drops requests when the session token expires so refresh "
+         "auth middleware retries backoff cache invalidation handler config module").split()
+
+
+def make_prompt(i, blocks, rng):
+    items = []
+    for b in range(blocks):
+        note = " ".join(rng.choice(WORDS) for _ in range(rng.randint(50, 400)))
+        if b % 3 == 0:
+            items.append({"plugin_id": "core.message", "is_active": True, "height": 100, "data": {"text": note}})
+        elif b % 3 == 1:
+            items.append({"plugin_id": "core.file", "is_active": True, "height": 100,
+                          "data": {"path": f"/projects/demo_{i}/src/pkg_{b}/module_{b}.py", "mode": "Relative Path",
+                                   "text": note, "use_codeblock": True}})
+        else:
+            items.append({"plugin_id": "core.tree", "is_active": True, "height": 180,
+                          "data": {"path": f"/projects/demo_{i}/src", "mode": "Relative Path", "text": note,
+                                   "ignore": ".git, __pycache__, node_modules",
+                                   "inject": [f"/projects/demo_{i}/src/pkg_{k}/module_{k}.py" for k in range(40)]}})
+    return {"project_root": f"/projects/demo_{i}", "settings": {"include_tree": True}, "items": items}
+
+
+def measure(args):
+    samples = []
+    for r in range(args.rounds):
+        start = time.perf_counter()
+        DBManager.load_prompt(f"prompt_{r % args.prompts}")
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    conn = DBManager._get_connection()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(DBManager.get_db_path()), statistics.mean(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=300)
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    DBManager.set_db_path(os.path.join(tempfile.mkdtemp(prefix="bench_zlib_"), "bench.db"))
+
+    threshold = DBManager.COMPRESS_MIN_BYTES
+    DBManager.COMPRESS_MIN_BYTES = float("inf")  # Write everything as plain TEXT first
+    for i in range(args.prompts):
+        DBManager.save_prompt(f"prompt_{i}", make_prompt(i, args.blocks, rng))
+    DBManager._get_connection().execute("VACUUM")
+    before = measure(args)
+
+    DBManager.COMPRESS_MIN_BYTES = threshold
+    start = time.perf_counter()
+    stats = DBManager.recompress(vacuum=True)
+    recompress_s = time.perf_counter() - start
+    after = measure(args)
+
+    print(f"{args.prompts} prompts x {args.blocks} blocks, {args.rounds} loads")
+    print(f"{'':<14}{'size KiB':>10}{'load mean ms':>14}{'load p95 ms':>13}")
+    for label, (size, mean, p95) in (("plain TEXT", before), ("compressed", after)):
+        print(f"{label:<14}{size / 1024:>10.0f}{mean:>14.3f}{p95:>13.3f}")
+    print(f"recompress: {stats['rewritten']} blocks rewritten in {recompress_s:.2f}s "
+          f"({before[0] / max(after[0], 1):.2f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
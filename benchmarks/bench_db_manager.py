@@ -0,0 +1,97 @@
+"""
+DBManager latency benchmark: pooled connections vs. one connection per call.
+
+The "per-call" mode reproduces the old _get_connection(): a makedirs check,
+a fresh sqlite3.connect with default pragmas (rollback journal,
+synchronous=FULL) for every call, closed again when the call returns.
+
+Usage:
+    python benchmarks/bench_db_manager.py [--prompts 200] [--blocks 12] [--rounds 300]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.db_manager import DBManager
+
+POOLED_GET_CONNECTION = DBManager._get_connection
+
+
+def per_call_connection():
+    folder = os.path.dirname(DBManager._db_path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    conn = sqlite3.connect(DBManager._db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.execute("PRAGMA foreign_keys = ON")
+    # Closed by refcounting when the DBManager call returns, like the old finally: close()
+    return conn
+
+
+def make_prompt(i, blocks):
+    return {
+        "project_root": f"/projects/demo_{i}",
+        "settings": {"include_tree": True, "global_ignore": ".git, __pycache__, node_modules"},
+        "items": [
+            {
+                "plugin_id": "core.file" if b % 2 else "core.message",
+                "is_active": True,
+                "height": 100,
+                "data": {"path": f"/projects/demo_{i}/src/module_{b}.py", "text": "Note " * 40},
+            }
+            for b in range(blocks)
+        ],
+    }
+
+
+def timed(fn, rounds):
+    samples = []
+    for r in range(rounds):
+        start = time.perf_counter()
+        fn(r)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(mode, args):
+    folder = tempfile.mkdtemp(prefix=f"bench_{mode}_")
+    DBManager._get_connection = staticmethod(per_call_connection if mode == "per-call" else POOLED_GET_CONNECTION)
+    DBManager.set_db_path(os.path.join(folder, "bench.db"))
+
+    for i in range(args.prompts):
+        DBManager.save_prompt(f"prompt_{i}", make_prompt(i, args.blocks))
+
+    doc = make_prompt(0, args.blocks)
+    results = {
+        "save": timed(lambda r: DBManager.save_prompt(f"prompt_{r % args.prompts}", doc), args.rounds),
+        "load": timed(lambda r: DBManager.load_prompt(f"prompt_{r % args.prompts}"), args.rounds),
+        "list": timed(lambda r: DBManager.get_all_prompts(), args.rounds),
+    }
+    DBManager.close_connection()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{args.prompts} prompts x {args.blocks} blocks, {args.rounds} rounds per operation")
+    print(f"{'mode':<10}{'op':<6}{'mean ms':>10}{'p95 ms':>10}")
+    for mode in ("per-call", "pooled"):
+        for op, (mean, p95) in run(mode, args).items():
+            print(f"{mode:<10}{op:<6}{mean:>10.3f}{p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
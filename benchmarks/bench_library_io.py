@@ -0,0 +1,99 @@
+"""
+Throughput of library-level JSONL import/export.
+
+Writes a synthetic JSONL library, then measures:
+  - import (upsert) into an empty DB, batched in one transaction
+  - the same prompts saved one by one with save_prompt (old path: one transaction each)
+  - export of the whole library
+  - re-import with "skip" (everything exists) and "upsert" (everything overwritten)
+Peak Python memory of import/export is measured in a separate pass with
+tracemalloc (tracing slows Python down a lot, so it is kept out of the timings).
+
+Usage:
+    python benchmarks/bench_library_io.py [--prompts 10000] [--blocks 8]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.db_manager import DBManager
+
+
+def make_prompt(i, blocks):
+    return {
+        "name": f"prompt_{i:05d}",
+        "project_root": f"/projects/demo_{i % 50}",
+        "settings": {"include_tree": True, "global_ignore": ".git, __pycache__, node_modules"},
+        "items": [
+            {
+                "plugin_id": "core.file" if b % 2 else "core.message",
+                "is_active": True,
+                "height": 100,
+                "data": {"path": f"/projects/demo_{i % 50}/src/module_{b}.py",
+                         "text": f"Prompt {i} block {b}: " + "notes about the change " * 12},
+            }
+            for b in range(blocks)
+        ],
+    }
+
+
+def timed(label, fn, prompts):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed:>9.2f}{prompts / elapsed:>12.0f}")
+
+
+def peak_mib(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=10000)
+    parser.add_argument("--blocks", type=int, default=8)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="bench_library_")
+    source = os.path.join(folder, "library.jsonl")
+    with open(source, "w", encoding="utf-8") as f:
+        for i in range(args.prompts):
+            f.write(json.dumps(make_prompt(i, args.blocks)) + "\n")
+    print(f"{args.prompts} prompts x {args.blocks} blocks, library file {os.path.getsize(source) / 1024 / 1024:.1f} MiB")
+    print(f"{'operation':<24}{'seconds':>9}{'prompts/s':>12}")
+
+    def save_one_by_one():
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                doc = json.loads(line)
+                DBManager.save_prompt(doc.pop("name"), doc)
+
+    DBManager.set_db_path(os.path.join(folder, "per_save.db"))
+    timed("save_prompt loop", save_one_by_one, args.prompts)
+
+    DBManager.set_db_path(os.path.join(folder, "library.db"))
+    timed("import (empty DB)", lambda: DBManager.import_library(source), args.prompts)
+    exported = os.path.join(folder, "export.jsonl")
+    timed("export", lambda: DBManager.export_library(exported), args.prompts)
+    timed("re-import skip", lambda: DBManager.import_library(source, mode="skip"), args.prompts)
+    timed("re-import upsert", lambda: DBManager.import_library(source, mode="upsert"), args.prompts)
+
+    DBManager.set_db_path(os.path.join(folder, "memory.db"))
+    print(f"peak Python memory: import {peak_mib(lambda: DBManager.import_library(source)):.1f} MiB, "
+          f"export {peak_mib(lambda: DBManager.export_library(exported)):.1f} MiB "
+          f"(library file {os.path.getsize(source) / 1024 / 1024:.1f} MiB)")
+    DBManager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,75 @@
 import sqlite3
 import json
 import os
+import re
+import threading
+import time
+import zlib
+import difflib
+from contextlib import contextmanager
+from pathlib import Path
 from datetime import datetime
 
 class DBManager:
+    """
+    SQLite storage for saved prompts.
+
+    Layout (schema version 5):
+        prompts:     one row per prompt (name, project_root, settings JSON, block_count, updated_at,
+                     last_opened_at, last_saved_at, last_activity_at)
+        blocks:      one row per block (prompt_id, position, plugin_id, is_active, height, data JSON)
+        prompts_fts: FTS5 index (rowid = prompts.id) over name, block text and paths
+        meta:        small key/value table for one-shot markers
+        revisions:   append-only history per prompt; full snapshots every
+                     REVISION_SNAPSHOT_INTERVAL revisions, line deltas in between
+
+    Large blocks.data documents are stored zlib-compressed (see _encode_data).
+
+    The schema version lives in PRAGMA user_version and is brought up to date
+    by init_db(), one migration step at a time. PRAGMA application_id marks the
+    file as a prompt database; other SQLite files are refused, never migrated.
+
+    Connections are pooled per thread and kept open (see _get_connection),
+    so callers must not close them.
+    """
     _db_path = "prompt_builder.db"  # Default
+    _local = threading.local()      # Per-thread pooled connection
+    _generation = 0                 # Bumped on DB switch so pooled connections reopen
+    _fts_unavailable = False        # Set once if this SQLite build has no FTS5
+
+    # Connection tuning
+    STATEMENT_CACHE_SIZE = 256          # Prepared statements kept per connection
+    CACHE_SIZE_KIB = 16 * 1024          # Page cache (PRAGMA cache_size, negative = KiB)
+    MMAP_SIZE = 128 * 1024 * 1024       # Memory-mapped I/O window
+    BUSY_TIMEOUT_MS = 5000
+
+    # PRAGMA application_id of prompt databases ("PTB1")
+    APPLICATION_ID = 0x50544231
+
+    # Transparent compression of stored JSON documents
+    COMPRESS_MARKER = b"ZLB1"           # Format marker prefixed to compressed BLOB values
+    COMPRESS_MIN_BYTES = 512            # Smaller documents stay plain TEXT
+    COMPRESS_LEVEL = 6
+
+    # Revision history: rev 1, 1+N, 1+2N... are full snapshots, so rebuilding
+    # any revision applies at most N-1 deltas
+    REVISION_SNAPSHOT_INTERVAL = 10
+
+    # Online backups (see backup_db): copied BACKUP_PAGES_PER_STEP pages at a
+    # time into <db folder>/backups, newest BACKUP_KEEP automatic copies kept
+    BACKUP_PAGES_PER_STEP = 1024
+    BACKUP_KEEP = 10
+    BACKUP_INTERVAL_MIN = 60
 
     @classmethod
     def set_db_path(cls, path):
-        """Sets the active database path and initializes tables if needed."""
+        """
+        Sets the active database path and initializes tables if needed.
+        Raises ValueError (keeping the current path) if path is another app's database.
+        """
+        cls.check_database(path)
         cls._db_path = path
+        cls._generation += 1
         cls.init_db()
 
     @classmethod
@@ -18,21 +78,88 @@ class DBManager:
 
     @staticmethod
     def _get_connection():
+        """Returns this thread's long-lived connection, opening it on first use."""
+        local = DBManager._local
+        conn = getattr(local, "conn", None)
+        if conn is not None and local.generation == DBManager._generation:
+            return conn
+
+        DBManager.close_connection()
+
         # Ensure directory exists if it's a path
         folder = os.path.dirname(DBManager._db_path)
         if folder and not os.path.exists(folder):
             os.makedirs(folder)
-            
-        conn = sqlite3.connect(DBManager._db_path)
+
+        # Autocommit mode: transactions are opened explicitly with _transaction()
+        conn = sqlite3.connect(
+            DBManager._db_path,
+            isolation_level=None,
+            timeout=DBManager.BUSY_TIMEOUT_MS / 1000,
+            cached_statements=DBManager.STATEMENT_CACHE_SIZE,
+        )
         conn.row_factory = sqlite3.Row
+        DBManager._apply_pragmas(conn)
+
+        local.conn = conn
+        local.generation = DBManager._generation
         return conn
 
     @staticmethod
-    def init_db():
-        """Creates the necessary tables if they don't exist."""
-        conn = DBManager._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
+    def _apply_pragmas(conn):
+        # WAL lets readers (e.g. the DB editor) run while a save is in progress.
+        # Filesystems without shared-memory support keep their journal mode.
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{DBManager.CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size = {DBManager.MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA foreign_keys = ON")
+
+    @staticmethod
+    def close_connection():
+        """Closes the calling thread's pooled connection (e.g. when a worker thread exits)."""
+        local = DBManager._local
+        conn = getattr(local, "conn", None)
+        local.conn = None
+        if conn is not None:
+            try: conn.close()
+            except sqlite3.Error: pass
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn, mode="IMMEDIATE"):
+        """Runs the enclosed statements in a single transaction (IMMEDIATE = write lock up front)."""
+        conn.execute(f"BEGIN {mode}")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # SQLite may already have rolled back (e.g. SQLITE_FULL): don't mask the error
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _now():
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # --- Schema Migrations ---
+
+    @staticmethod
+    def _migrations():
+        """Ordered migration steps. Step N upgrades the schema to user_version N."""
+        return [
+            DBManager._migrate_1_initial,
+            DBManager._migrate_2_normalize,
+            DBManager._migrate_3_fts,
+            DBManager._migrate_4_activity,
+            DBManager._migrate_5_revisions,
+        ]
+
+    @staticmethod
+    def _migrate_1_initial(conn):
+        # Original single-table layout (the whole prompt as one JSON document)
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS prompts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT UNIQUE NOT NULL,
@@ -40,54 +167,884 @@ class DBManager:
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        conn.commit()
-        conn.close()
+
+    @staticmethod
+    def _migrate_2_normalize(conn):
+        # Split the legacy JSON document into a prompts header and one row per block
+        conn.execute("ALTER TABLE prompts RENAME TO prompts_legacy")
+        conn.execute("""
+            CREATE TABLE prompts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                project_root TEXT NOT NULL DEFAULT '',
+                settings TEXT NOT NULL DEFAULT '{}',
+                block_count INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE blocks (
+                id INTEGER PRIMARY KEY,
+                prompt_id INTEGER NOT NULL REFERENCES prompts(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                plugin_id TEXT,
+                is_active INTEGER NOT NULL DEFAULT 1,
+                height INTEGER NOT NULL DEFAULT 0,
+                data TEXT NOT NULL DEFAULT '{}'
+            )
+        """)
+        conn.execute("CREATE UNIQUE INDEX idx_prompts_name ON prompts(name)")
+        conn.execute("CREATE INDEX idx_prompts_updated_at ON prompts(updated_at)")
+        conn.execute("CREATE UNIQUE INDEX idx_blocks_prompt_position ON blocks(prompt_id, position)")
+
+        legacy = conn.execute("SELECT id, name, data, updated_at FROM prompts_legacy")
+        for row in legacy.fetchall():
+            try:
+                doc = json.loads(row["data"])
+            except (TypeError, ValueError):
+                # Keep unreadable documents visible instead of dropping them
+                print(f"[DBManager] Could not parse legacy prompt '{row['name']}', kept as text.")
+                doc = {"items": [{"plugin_id": "core.message", "data": {"text": str(row["data"])}}]}
+
+            header, items = DBManager._split_document(doc)
+            conn.execute("""
+                INSERT INTO prompts (id, name, project_root, settings, block_count, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (row["id"], row["name"], header["project_root"], header["settings"],
+                  len(items), row["updated_at"]))
+            conn.executemany("""
+                INSERT INTO blocks (prompt_id, position, plugin_id, is_active, height, data)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [DBManager._block_to_row(row["id"], pos, item) for pos, item in enumerate(items)])
+
+        conn.execute("DROP TABLE prompts_legacy")
+
+    @staticmethod
+    def _migrate_3_fts(conn):
+        DBManager._ensure_fts(conn)
+
+    @staticmethod
+    def _migrate_4_activity(conn):
+        # Activity dates used to live in QSettings ("prompt_registry"); see import_legacy_registry()
+        conn.execute("ALTER TABLE prompts ADD COLUMN last_opened_at TIMESTAMP")
+        conn.execute("ALTER TABLE prompts ADD COLUMN last_saved_at TIMESTAMP")
+        conn.execute("ALTER TABLE prompts ADD COLUMN last_activity_at TIMESTAMP")
+        conn.execute("UPDATE prompts SET last_saved_at = updated_at, last_activity_at = updated_at")
+        conn.execute("CREATE INDEX idx_prompts_last_opened ON prompts(last_opened_at)")
+        conn.execute("CREATE INDEX idx_prompts_last_activity ON prompts(last_activity_at)")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    @staticmethod
+    def _migrate_5_revisions(conn):
+        conn.execute("""
+            CREATE TABLE revisions (
+                id INTEGER PRIMARY KEY,
+                prompt_id INTEGER NOT NULL REFERENCES prompts(id) ON DELETE CASCADE,
+                rev INTEGER NOT NULL,
+                kind TEXT NOT NULL,          -- 'full' or 'delta' (against rev - 1)
+                size INTEGER NOT NULL,       -- Length of the reconstructed document text
+                payload BLOB NOT NULL,       -- Encoded with _encode_data
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("CREATE UNIQUE INDEX idx_revisions_prompt_rev ON revisions(prompt_id, rev)")
+
+    @staticmethod
+    def _is_prompt_database(conn):
+        """Marked with APPLICATION_ID, or unmarked and either empty or holding a prompts table (older builds)."""
+        app_id = conn.execute("PRAGMA application_id").fetchone()[0]
+        if app_id: return app_id == DBManager.APPLICATION_ID
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")}
+        return not names or "prompts" in names
+
+    @staticmethod
+    def check_database(path):
+        """
+        Raises ValueError if path is an existing SQLite file that is not a prompt
+        database. Reads it on a read-only connection, so a refused file is left untouched.
+        """
+        if not os.path.isfile(path) or os.path.getsize(path) == 0: return  # Created on first use
+        conn = sqlite3.connect(DBManager._read_only_uri(path), uri=True)
+        try:
+            if not DBManager._is_prompt_database(conn):
+                raise ValueError(f"{os.path.basename(path)} is not a prompt database.")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def init_db():
+        """
+        Creates the tables if needed and applies any pending schema migrations.
+        Raises ValueError if the active file is not a prompt database (see check_database).
+        """
+        DBManager.check_database(DBManager._db_path)
+        conn = DBManager._get_connection()
+        migrations = DBManager._migrations()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > len(migrations):
+            print(f"[DBManager] Database schema v{version} is newer than this app (v{len(migrations)}).")
+            return
+
+        for target, step in enumerate(migrations, start=1):
+            if version >= target: continue
+            with DBManager._transaction(conn):
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+            version = target
+
+        if conn.execute("PRAGMA application_id").fetchone()[0] != DBManager.APPLICATION_ID:
+            conn.execute(f"PRAGMA application_id = {DBManager.APPLICATION_ID}")
+
+        # A DB migrated by a build without FTS5 gets its index once FTS5 is available
+        if not DBManager._fts_unavailable and not DBManager._has_fts(conn):
+            with DBManager._transaction(conn):
+                DBManager._ensure_fts(conn)
+
+    # --- Full-Text Search Index ---
+
+    # Block payload keys holding file/folder paths (everything else string-valued is body text)
+    FTS_PATH_KEYS = {"path", "inject", "target_path", "tree_inject_files"}
+
+    @staticmethod
+    def _has_fts(conn):
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prompts_fts'"
+        ).fetchone() is not None
+
+    @staticmethod
+    def _ensure_fts(conn):
+        """
+        Creates and fills the FTS5 index. Skipped if SQLite was built without
+        FTS5; that is reported once and not retried on later DB switches.
+        """
+        if DBManager._fts_unavailable or DBManager._has_fts(conn): return
+        try:
+            conn.execute("CREATE VIRTUAL TABLE prompts_fts USING fts5(name, body, paths)")
+        except sqlite3.OperationalError as e:
+            DBManager._fts_unavailable = True
+            print(f"[DBManager] Full-text search unavailable ({e}); falling back to name search.")
+            return
+
+        for row in conn.execute("SELECT id, name, project_root FROM prompts").fetchall():
+            blocks = conn.execute(
+                "SELECT plugin_id, is_active, height, data FROM blocks WHERE prompt_id = ? ORDER BY position",
+                (row["id"],)
+            ).fetchall()
+            items = [DBManager._row_to_block(b) for b in blocks]
+            DBManager._index_prompt(conn, row["id"], row["name"], row["project_root"], items)
+
+    @staticmethod
+    def _collect_text(value, key, body, paths):
+        if isinstance(value, str):
+            if not value.strip(): return
+            (paths if key in DBManager.FTS_PATH_KEYS else body).append(value)
+        elif isinstance(value, dict):
+            for k, v in value.items():
+                DBManager._collect_text(v, k, body, paths)
+        elif isinstance(value, list):
+            for v in value:
+                DBManager._collect_text(v, key, body, paths)
+
+    @staticmethod
+    def _index_prompt(conn, prompt_id, name, project_root, items):
+        body, paths = [], []
+        if project_root: paths.append(project_root)
+        for item in items:
+            # Only the block payload is indexed, not plugin ids / UI metadata
+            DBManager._collect_text(item.get("data", item) if item.get("plugin_id") else item, None, body, paths)
+
+        conn.execute("DELETE FROM prompts_fts WHERE rowid = ?", (prompt_id,))
+        conn.execute(
+            "INSERT INTO prompts_fts (rowid, name, body, paths) VALUES (?, ?, ?, ?)",
+            (prompt_id, name, "\n".join(body), "\n".join(paths))
+        )
+
+    @staticmethod
+    def _fts_query(text):
+        """Turns free user text into a safe FTS5 query: every word must match, last one as a prefix."""
+        terms = [t.replace('"', '""') for t in text.split()]
+        if not terms: return None
+        parts = [f'"{t}"' for t in terms[:-1]] + [f'"{terms[-1]}"*']
+        return " AND ".join(parts)
+
+    # --- Document <-> Rows ---
+
+    @staticmethod
+    def _encode_data(text):
+        """
+        Returns the value to store for a JSON document: plain TEXT when small,
+        otherwise a BLOB of COMPRESS_MARKER + zlib data (if that is actually smaller).
+        """
+        raw = text.encode("utf-8")
+        if len(raw) < DBManager.COMPRESS_MIN_BYTES:
+            return text
+        packed = DBManager.COMPRESS_MARKER + zlib.compress(raw, DBManager.COMPRESS_LEVEL)
+        return packed if len(packed) < len(raw) else text
+
+    @staticmethod
+    def _decode_data(value):
+        """Inverse of _encode_data. Only called when a document is actually read."""
+        if isinstance(value, bytes):
+            if value.startswith(DBManager.COMPRESS_MARKER):
+                value = zlib.decompress(value[len(DBManager.COMPRESS_MARKER):])
+            return value.decode("utf-8")
+        return value
+
+    @staticmethod
+    def _split_document(doc):
+        """Returns ({project_root, settings}, items) for a prompt document."""
+        if isinstance(doc, list):
+            # Very old saves were a bare list of items
+            return {"project_root": "", "settings": "{}"}, doc
+
+        header = {
+            "project_root": doc.get("project_root", "") or "",
+            "settings": json.dumps(doc.get("settings", {})),
+        }
+        return header, doc.get("items", [])
+
+    @staticmethod
+    def _block_to_row(prompt_id, position, state):
+        plugin_id = state.get("plugin_id")
+        # Legacy items (no plugin_id) are stored whole so PromptItemWidget can convert them
+        payload = state.get("data", {}) if plugin_id else state
+        return (
+            prompt_id,
+            position,
+            plugin_id,
+            1 if state.get("is_active", True) else 0,
+            int(state.get("height", 0) or 0),
+            DBManager._encode_data(json.dumps(payload)),
+        )
+
+    @staticmethod
+    def _row_to_block(row):
+        payload = json.loads(DBManager._decode_data(row["data"]))
+        if row["plugin_id"] is None:
+            return payload
+        return {
+            "plugin_id": row["plugin_id"],
+            "is_active": bool(row["is_active"]),
+            "height": row["height"],
+            "data": payload,
+        }
+
+    # --- Revision History ---
+
+    @staticmethod
+    def _revision_text(doc):
+        """
+        One line for the header and one per block, so a typical edit touches a
+        single line of the delta. Still valid JSON once joined back together.
+        """
+        if not isinstance(doc, dict) or not isinstance(doc.get("items"), list):
+            return json.dumps(doc, sort_keys=True)
+        header = json.dumps({k: v for k, v in doc.items() if k != "items"}, sort_keys=True)
+        items = [json.dumps(item, sort_keys=True) for item in doc["items"]]
+        lines = [header[:-1] + (', "items": [' if header != "{}" else '"items": [')]
+        lines += [line + "," for line in items[:-1]] + items[-1:]
+        lines.append("]}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _make_delta(old_lines, new_lines):
+        """Line delta: ["=", i1, i2] copies old_lines[i1:i2], ["+", [lines]] inserts new lines."""
+        ops = []
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append(["=", i1, i2])
+            elif j2 > j1:
+                ops.append(["+", new_lines[j1:j2]])
+        return ops
+
+    @staticmethod
+    def _apply_delta(old_lines, ops):
+        out = []
+        for op in ops:
+            if op[0] == "=":
+                out.extend(old_lines[op[1]:op[2]])
+            else:
+                out.extend(op[1])
+        return out
+
+    @staticmethod
+    def _revision_lines(conn, prompt_id, rev):
+        """Rebuilds a revision from its nearest snapshot (at most N-1 deltas)."""
+        interval = DBManager.REVISION_SNAPSHOT_INTERVAL
+        snapshot = ((rev - 1) // interval) * interval + 1
+        rows = conn.execute("""
+            SELECT kind, payload FROM revisions
+            WHERE prompt_id = ? AND rev BETWEEN ? AND ? ORDER BY rev
+        """, (prompt_id, snapshot, rev)).fetchall()
+        if not rows or rows[0]["kind"] != "full": return None
+
+        lines = []
+        for row in rows:
+            payload = DBManager._decode_data(row["payload"])
+            if row["kind"] == "full":
+                lines = payload.split("\n")
+            else:
+                lines = DBManager._apply_delta(lines, json.loads(payload))
+        return lines
+
+    @staticmethod
+    def _record_revision(conn, prompt_id, doc):
+        """Appends doc as the next revision (skipped if identical to the latest one)."""
+        text = DBManager._revision_text(doc)
+        new_lines = text.split("\n")
+        latest = conn.execute(
+            "SELECT MAX(rev) FROM revisions WHERE prompt_id = ?", (prompt_id,)
+        ).fetchone()[0] or 0
+
+        old_lines = DBManager._revision_lines(conn, prompt_id, latest) if latest else None
+        if old_lines == new_lines: return latest
+
+        rev = latest + 1
+        if old_lines is None or (rev - 1) % DBManager.REVISION_SNAPSHOT_INTERVAL == 0:
+            kind, payload = "full", text
+        else:
+            kind, payload = "delta", json.dumps(DBManager._make_delta(old_lines, new_lines))
+
+        conn.execute("""
+            INSERT INTO revisions (prompt_id, rev, kind, size, payload, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (prompt_id, rev, kind, len(text), DBManager._encode_data(payload), DBManager._now()))
+        return rev
+
+    @staticmethod
+    def list_revisions(name):
+        """Returns rows of (rev, kind, size, created_at), newest first."""
+        return DBManager._get_connection().execute("""
+            SELECT r.rev, r.kind, r.size, r.created_at
+            FROM revisions r JOIN prompts p ON p.id = r.prompt_id
+            WHERE p.name = ? ORDER BY r.rev DESC
+        """, (name,)).fetchall()
+
+    @staticmethod
+    def _revision_doc_lines(name, rev):
+        conn = DBManager._get_connection()
+        row = conn.execute(DBManager._SQL_PROMPT_ID, (name,)).fetchone()
+        if not row: return None
+        return DBManager._revision_lines(conn, row["id"], rev)
+
+    @staticmethod
+    def load_revision(name, rev):
+        """Returns the prompt document as it was at a given revision, or None."""
+        lines = DBManager._revision_doc_lines(name, rev)
+        return json.loads("\n".join(lines)) if lines is not None else None
+
+    @staticmethod
+    def diff_revisions(name, old_rev, new_rev):
+        """Unified diff (list of lines) between two revisions; old_rev 0 means "empty"."""
+        def pretty(rev):
+            doc = DBManager.load_revision(name, rev) if rev else None
+            # Indented only for display; stored revisions keep one line per block
+            return json.dumps(doc, indent=1, sort_keys=True).split("\n") if doc is not None else []
+
+        return list(difflib.unified_diff(
+            pretty(old_rev), pretty(new_rev), f"rev {old_rev}", f"rev {new_rev}", lineterm=""
+        ))
+
+    # --- Public API ---
+    # Hot statements are kept as constants so every call hits the
+    # connection's prepared-statement cache with the exact same SQL text.
+
+    _SQL_UPSERT_PROMPT = """
+        INSERT INTO prompts (name, project_root, settings, block_count, updated_at, last_saved_at, last_activity_at)
+        VALUES (?, ?, ?, ?, ?5, ?5, ?5)
+        ON CONFLICT(name) DO UPDATE SET
+            project_root=excluded.project_root,
+            settings=excluded.settings,
+            block_count=excluded.block_count,
+            updated_at=excluded.updated_at,
+            last_saved_at=excluded.last_saved_at,
+            last_activity_at=excluded.last_activity_at
+    """
+    _SQL_PROMPT_ID = "SELECT id FROM prompts WHERE name = ?"
+    _SQL_DELETE_BLOCKS = "DELETE FROM blocks WHERE prompt_id = ?"
+    _SQL_INSERT_BLOCK = """
+        INSERT INTO blocks (prompt_id, position, plugin_id, is_active, height, data)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    _SQL_LIST_PROMPTS = "SELECT id, name, updated_at, block_count FROM prompts ORDER BY updated_at DESC"
+    _SQL_MARK_OPENED = "UPDATE prompts SET last_opened_at = ?1, last_activity_at = ?1 WHERE name = ?2"
+    _SQL_PROMPT_EXISTS = "SELECT 1 FROM prompts WHERE name = ?"
+
+    # Sort keys accepted by list_prompts() -> ORDER BY clause (backed by indexes)
+    LIST_ORDER = {
+        "activity": "last_activity_at",
+        "name": "name",
+        "opened": "last_opened_at",
+        "saved": "updated_at",  # Same value as last_saved_at, already indexed
+    }
+    _SQL_PROMPT_HEADER = """
+        SELECT project_root, settings, block_count, updated_at
+        FROM prompts WHERE name = ?
+    """
+    _SQL_PROMPT_BLOCKS = """
+        SELECT b.plugin_id, b.is_active, b.height, b.data
+        FROM blocks b JOIN prompts p ON p.id = b.prompt_id
+        WHERE p.name = ?
+        ORDER BY b.position
+        LIMIT ? OFFSET ?
+    """
+
+    @staticmethod
+    def _prompt_ids(conn, names):
+        """Returns {name: id} for the names that exist."""
+        if not names: return {}
+        marks = ", ".join("?" * len(names))
+        rows = conn.execute(f"SELECT id, name FROM prompts WHERE name IN ({marks})", names).fetchall()
+        return {row["name"]: row["id"] for row in rows}
+
+    @staticmethod
+    def _write_prompts(conn, docs):
+        """
+        Writes [(name, document)] inside the caller's transaction. Statements are
+        batched with executemany so bulk imports cost about the same per prompt
+        as one save.
+        """
+        docs = list(dict(docs).items())  # Last one wins if a name repeats
+        split = [(name, *DBManager._split_document(doc)) for name, doc in docs]
+        names = [name for name, _, _ in split]
+
+        # Prompts saved before history existed: keep their stored version as rev 1
+        for name, prompt_id in DBManager._prompt_ids(conn, names).items():
+            if not conn.execute("SELECT 1 FROM revisions WHERE prompt_id = ? LIMIT 1", (prompt_id,)).fetchone():
+                DBManager._record_revision(conn, prompt_id, DBManager._fetch_document(conn, name))
+
+        now = DBManager._now()
+        conn.executemany(DBManager._SQL_UPSERT_PROMPT, [
+            (name, header["project_root"], header["settings"], len(items), now) for name, header, items in split
+        ])
+        ids = DBManager._prompt_ids(conn, names)
+
+        conn.executemany(DBManager._SQL_DELETE_BLOCKS, [(ids[name],) for name in names])
+        conn.executemany(DBManager._SQL_INSERT_BLOCK, [
+            DBManager._block_to_row(ids[name], pos, item)
+            for name, _, items in split for pos, item in enumerate(items)
+        ])
+
+        has_fts = DBManager._has_fts(conn)
+        for name, header, items in split:
+            if has_fts:
+                DBManager._index_prompt(conn, ids[name], name, header["project_root"], items)
+            DBManager._record_revision(conn, ids[name], DBManager._document(header, items))
 
     @staticmethod
     def save_prompt(name, data_dict):
         """Saves or Updates a prompt configuration."""
-        json_data = json.dumps(data_dict)
-        conn = DBManager._get_connection()
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute("""
-                INSERT INTO prompts (name, data, updated_at) 
-                VALUES (?, ?, ?)
-                ON CONFLICT(name) DO UPDATE SET
-                    data=excluded.data,
-                    updated_at=excluded.updated_at
-            """, (name, json_data, datetime.now()))
-            conn.commit()
+            conn = DBManager._get_connection()
+            with DBManager._transaction(conn):
+                DBManager._write_prompts(conn, [(name, data_dict)])
             return True, "Saved successfully."
         except Exception as e:
             return False, str(e)
-        finally:
-            conn.close()
 
     @staticmethod
-    def get_all_prompts():
-        """Returns list of (id, name, updated_at)."""
+    def export_library(path, progress=None):
+        """
+        Streams every prompt to a JSONL file, one {"name", "project_root",
+        "settings", "items"} object per line, from a single read snapshot.
+        Returns the number of prompts written.
+        """
         conn = DBManager._get_connection()
-        cursor = conn.cursor()
+        count = 0
+        with open(path, "w", encoding="utf-8") as f, DBManager._transaction(conn, "DEFERRED"):
+            prompts = conn.execute("SELECT id, name, project_root, settings FROM prompts ORDER BY id")
+            # Walks idx_blocks_prompt_position alongside the prompts, so nothing is held per prompt
+            blocks = conn.execute("""
+                SELECT prompt_id, plugin_id, is_active, height, data FROM blocks ORDER BY prompt_id, position
+            """)
+            block = blocks.fetchone()
+            for row in prompts:
+                items = []
+                while block is not None and block["prompt_id"] <= row["id"]:
+                    if block["prompt_id"] == row["id"]:
+                        items.append(DBManager._row_to_block(block))
+                    block = blocks.fetchone()
+
+                f.write(json.dumps({
+                    "name": row["name"],
+                    "project_root": row["project_root"],
+                    "settings": json.loads(row["settings"]),
+                    "items": items,
+                }, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+                if progress and count % 500 == 0: progress(count)
+        return count
+
+    @staticmethod
+    def import_library(path, mode="upsert", batch_size=500, progress=None):
+        """
+        Streams a JSONL library (see export_library) into the DB in one transaction.
+        mode "upsert" overwrites prompts with the same name, "skip" keeps them.
+        Malformed lines are skipped and reported; a DB error rolls back the whole import.
+        Returns {"imported", "skipped", "errors"} where errors lists (line number, reason).
+        """
+        conn = DBManager._get_connection()
+        stats = {"imported": 0, "skipped": 0, "errors": []}
+
+        def flush(batch):
+            if mode == "skip":
+                existing = DBManager._prompt_ids(conn, list(batch))
+                stats["skipped"] += len(existing)
+                batch = {name: doc for name, doc in batch.items() if name not in existing}
+            DBManager._write_prompts(conn, batch.items())
+            stats["imported"] += len(batch)
+            if progress: progress(stats["imported"] + stats["skipped"])
+
+        with open(path, "r", encoding="utf-8") as f, DBManager._transaction(conn):
+            batch = {}
+            for line_no, line in enumerate(f, 1):
+                if not line.strip(): continue
+                try:
+                    doc = json.loads(line)
+                    if not isinstance(doc, dict): raise ValueError("expected a JSON object")
+                    name = doc.pop("name", None)
+                    if not isinstance(name, str) or not name.strip(): raise ValueError("missing or empty name")
+                    items = doc.get("items", [])
+                    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+                        raise ValueError("items must be a list of objects")
+                    if not isinstance(doc.get("settings", {}), dict):
+                        raise ValueError("settings must be an object")
+                    if not isinstance(doc.get("project_root"), (str, type(None))):
+                        raise ValueError("project_root must be a string or null")
+                except ValueError as e:
+                    stats["errors"].append((line_no, str(e)))
+                    continue
+
+                # A repeated name inside the library: the later line wins
+                if name in batch: stats["skipped"] += 1
+                batch[name] = doc
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = {}
+            if batch: flush(batch)
+        return stats
+
+    @staticmethod
+    def get_all_prompts():
+        """Returns list of (id, name, updated_at, block_count)."""
         try:
-            cursor.execute("SELECT id, name, updated_at FROM prompts ORDER BY updated_at DESC")
-            rows = cursor.fetchall()
-            return rows
+            return DBManager._get_connection().execute(DBManager._SQL_LIST_PROMPTS).fetchall()
         except sqlite3.Error:
             return []
-        finally:
-            conn.close()
+
+    @staticmethod
+    def list_prompts(offset=0, limit=100, order="activity", descending=True):
+        """
+        Returns one page of (id, name, updated_at, block_count, last_activity_at),
+        sorted in SQL by one of LIST_ORDER.
+        """
+        column = DBManager.LIST_ORDER.get(order, DBManager.LIST_ORDER["activity"])
+        direction = "DESC" if descending else "ASC"
+        return DBManager._get_connection().execute(f"""
+            SELECT id, name, updated_at, block_count, last_activity_at
+            FROM prompts ORDER BY {column} {direction}, id {direction}
+            LIMIT ? OFFSET ?
+        """, (limit, offset)).fetchall()
+
+    @staticmethod
+    def count_prompts():
+        return DBManager._get_connection().execute("SELECT COUNT(*) FROM prompts").fetchone()[0]
+
+    @staticmethod
+    def prompt_exists(name):
+        return DBManager._get_connection().execute(DBManager._SQL_PROMPT_EXISTS, (name,)).fetchone() is not None
+
+    @staticmethod
+    def mark_opened(name):
+        """Records that a prompt was loaded into the editor."""
+        conn = DBManager._get_connection()
+        conn.execute(DBManager._SQL_MARK_OPENED, (DBManager._now(), name))
+
+    @staticmethod
+    def import_legacy_registry(registry):
+        """
+        One-shot import of the old QSettings "prompt_registry" ({name: date}) into
+        last_activity_at. Runs once per database; later calls return immediately.
+        """
+        conn = DBManager._get_connection()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'registry_imported'").fetchone():
+            return 0
+
+        rows = [(str(date), str(name)) for name, date in (registry or {}).items() if date]
+        with DBManager._transaction(conn):
+            # MAX() keeps whichever is newer: the DB save date or the registry date
+            conn.executemany("""
+                UPDATE prompts SET last_activity_at = MAX(COALESCE(last_activity_at, ''), ?1)
+                WHERE name = ?2
+            """, rows)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('registry_imported', ?)", (DBManager._now(),))
+        return len(rows)
+
+    @staticmethod
+    def get_storage_size():
+        """Returns the database size in bytes (allocated pages, excluding the WAL)."""
+        conn = DBManager._get_connection()
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_size * conn.execute("PRAGMA page_count").fetchone()[0]
+
+    @staticmethod
+    def recompress(vacuum=True, batch_size=500):
+        """
+        One-shot maintenance: re-encodes every stored block with the current
+        compression policy, then optionally VACUUMs to return freed pages to the OS.
+        Returns {"rewritten", "size_before", "size_after"}.
+        """
+        conn = DBManager._get_connection()
+        size_before = DBManager.get_storage_size()
+        rewritten, last_id = 0, 0
+
+        with DBManager._transaction(conn):
+            while True:
+                rows = conn.execute(
+                    "SELECT id, data FROM blocks WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+                if not rows: break
+                last_id = rows[-1]["id"]
+
+                updates = []
+                for row in rows:
+                    encoded = DBManager._encode_data(DBManager._decode_data(row["data"]))
+                    if encoded != row["data"]:
+                        updates.append((encoded, row["id"]))
+                conn.executemany("UPDATE blocks SET data = ? WHERE id = ?", updates)
+                rewritten += len(updates)
+
+        if vacuum:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM")
+        return {"rewritten": rewritten, "size_before": size_before, "size_after": DBManager.get_storage_size()}
+
+    @staticmethod
+    def search_prompts(text, limit=200):
+        """
+        Ranked full-text search over prompt names, block text and file/tree paths.
+        Returns rows of (id, name, updated_at, block_count, last_activity_at, snippet), best match first.
+        """
+        conn = DBManager._get_connection()
+        query = DBManager._fts_query(text)
+        if not query: return []
+
+        if not DBManager._has_fts(conn):
+            # % and _ in the user's text are literal characters, not wildcards
+            pattern = re.sub(r"([\\%_])", r"\\\1", text.strip())
+            return conn.execute("""
+                SELECT id, name, updated_at, block_count, last_activity_at, '' AS snippet
+                FROM prompts WHERE name LIKE ? ESCAPE '\\' ORDER BY last_activity_at DESC LIMIT ?
+            """, (f"%{pattern}%", limit)).fetchall()
+
+        # Column weights: name matches rank above path matches, which rank above body text
+        return conn.execute("""
+            SELECT p.id, p.name, p.updated_at, p.block_count, p.last_activity_at,
+                   snippet(prompts_fts, -1, '[', ']', '...', 10) AS snippet
+            FROM prompts_fts f JOIN prompts p ON p.id = f.rowid
+            WHERE prompts_fts MATCH ?
+            ORDER BY bm25(prompts_fts, 10.0, 1.0, 4.0)
+            LIMIT ?
+        """, (query, limit)).fetchall()
+
+    @staticmethod
+    def _fetch_header(conn, name):
+        row = conn.execute(DBManager._SQL_PROMPT_HEADER, (name,)).fetchone()
+        if not row: return None
+        return {
+            "project_root": row["project_root"],
+            "settings": json.loads(row["settings"]),
+            "block_count": row["block_count"],
+            "updated_at": row["updated_at"],
+        }
+
+    @staticmethod
+    def _fetch_blocks(conn, name, offset=0, limit=None):
+        rows = conn.execute(DBManager._SQL_PROMPT_BLOCKS, (name, -1 if limit is None else limit, offset)).fetchall()
+        return [DBManager._row_to_block(row) for row in rows]
+
+    @staticmethod
+    def load_prompt_header(name):
+        """Returns the prompt metadata (no blocks) or None."""
+        return DBManager._fetch_header(DBManager._get_connection(), name)
+
+    @staticmethod
+    def load_blocks(name, offset=0, limit=None):
+        """Returns the block states of a prompt, optionally only a window of them."""
+        return DBManager._fetch_blocks(DBManager._get_connection(), name, offset, limit)
+
+    @staticmethod
+    def _document(header, items):
+        """The document as load_prompt will return it after a save (what revisions store)."""
+        blocks = []
+        for state in items:
+            if not state.get("plugin_id"):
+                blocks.append(state)
+                continue
+            blocks.append({
+                "plugin_id": state["plugin_id"],
+                "is_active": bool(state.get("is_active", True)),
+                "height": int(state.get("height", 0) or 0),
+                "data": state.get("data", {}),
+            })
+        return {
+            "project_root": header["project_root"],
+            "settings": json.loads(header["settings"]),
+            "items": blocks,
+        }
+
+    @staticmethod
+    def _fetch_document(conn, name):
+        header = DBManager._fetch_header(conn, name)
+        if not header: return None
+        return {
+            "project_root": header["project_root"],
+            "settings": header["settings"],
+            "items": DBManager._fetch_blocks(conn, name),
+        }
 
     @staticmethod
     def load_prompt(name):
         """Returns the dictionary data for a specific prompt name."""
         conn = DBManager._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT data FROM prompts WHERE name = ?", (name,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return json.loads(row['data'])
-        return None
\ No newline at end of file
+        # One read snapshot for header + blocks
+        with DBManager._transaction(conn, "DEFERRED"):
+            return DBManager._fetch_document(conn, name)
+
+    # --- Backups ---
+
+    @staticmethod
+    def backup_dir():
+        return os.path.join(os.path.dirname(os.path.abspath(DBManager._db_path)), "backups")
+
+    @staticmethod
+    def _backup_pattern():
+        stem = os.path.splitext(os.path.basename(DBManager._db_path))[0]
+        return re.compile(re.escape(stem) + r"-\d{8}-\d{6}\.db$")
+
+    @staticmethod
+    def _copy_database(source, target, pages, progress):
+        """SQLite backup API copy; progress(copied pages, total pages) may raise to abort."""
+        def on_step(status, remaining, total):
+            if progress: progress(total - remaining, total)
+        # An open read transaction pins one snapshot for every step. Without it each
+        # step starts a new read, and a write from another connection in between
+        # makes SQLite restart the copy (endlessly, under steady saves). In WAL mode
+        # the snapshot does not block writers.
+        source.execute("BEGIN")
+        try:
+            source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            source.backup(target, pages=pages or DBManager.BACKUP_PAGES_PER_STEP, progress=on_step)
+        finally:
+            source.execute("ROLLBACK")
+
+    @staticmethod
+    def _read_only_uri(path):
+        return Path(path).absolute().as_uri() + "?mode=ro"
+
+    @staticmethod
+    def _check_backup(path, require_prompts=False):
+        conn = sqlite3.connect(DBManager._read_only_uri(path), uri=True)
+        try:
+            result = conn.execute("PRAGMA quick_check").fetchone()[0]
+            if result != "ok":
+                raise sqlite3.DatabaseError(f"Backup failed its integrity check: {result}")
+            if require_prompts and not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prompts'"
+            ).fetchone():
+                raise ValueError(f"{os.path.basename(path)} is not a prompt database.")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def backup_db(dest=None, pages=None, progress=None):
+        """
+        Online copy of the active database through the SQLite backup API.
+        Pages are copied in steps of `pages` from one read snapshot on a
+        private connection, so prompt saves keep running (WAL) and the copy
+        is the database as of the moment the backup started.
+        The copy is written as <dest>.part, integrity-checked and renamed.
+        dest defaults to backups/<name>-YYYYMMDD-HHMMSS.db.
+        Returns {"path", "size", "elapsed"}.
+        """
+        start = time.perf_counter()
+        if dest is None:
+            stem = os.path.splitext(os.path.basename(DBManager._db_path))[0]
+            dest = os.path.join(DBManager.backup_dir(), f"{stem}-{datetime.now():%Y%m%d-%H%M%S}.db")
+        folder = os.path.dirname(dest)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        part = dest + ".part"
+        source = sqlite3.connect(DBManager._db_path, timeout=DBManager.BUSY_TIMEOUT_MS / 1000)
+        target = sqlite3.connect(part)
+        try:
+            DBManager._copy_database(source, target, pages, progress)
+            # A self-contained file: no -wal sidecar when the copy is opened later
+            target.execute("PRAGMA journal_mode = DELETE")
+        except BaseException:
+            target.close()
+            if os.path.exists(part): os.remove(part)
+            raise
+        finally:
+            source.close()
+            target.close()
+
+        try:
+            DBManager._check_backup(part)
+        except BaseException:
+            os.remove(part)
+            raise
+        os.replace(part, dest)
+        return {"path": dest, "size": os.path.getsize(dest), "elapsed": time.perf_counter() - start}
+
+    @staticmethod
+    def list_backups():
+        """Automatic backups of the active database: [(path, size, mtime)], newest first."""
+        folder = DBManager.backup_dir()
+        if not os.path.isdir(folder): return []
+        pattern = DBManager._backup_pattern()
+        names = sorted((n for n in os.listdir(folder) if pattern.match(n)), reverse=True)
+        paths = [os.path.join(folder, n) for n in names]
+        return [(p, os.path.getsize(p), os.path.getmtime(p)) for p in paths]
+
+    @staticmethod
+    def rotate_backups(keep=None):
+        """Deletes automatic backups beyond the newest `keep`. Returns the removed paths."""
+        keep = DBManager.BACKUP_KEEP if keep is None else keep
+        removed = []
+        for path, _, _ in DBManager.list_backups()[keep:]:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError as e:
+                print(f"[DBManager] Could not remove old backup {path}: {e}")
+        return removed
+
+    @staticmethod
+    def restore_backup(path, pages=None, progress=None):
+        """
+        Replaces the active database's contents with a backup, in place (the
+        backup API copies into the live file under a write lock, so other
+        connections see the restored data). The current contents are backed
+        up first as backups/<name>-pre-restore-*.db.
+        Callers should then call set_db_path(get_db_path()) so pooled
+        connections reopen and the restored schema is migrated.
+        Returns {"restored", "safety_copy"}.
+        """
+        DBManager._check_backup(path, require_prompts=True)
+        stem = os.path.splitext(os.path.basename(DBManager._db_path))[0]
+        safety = DBManager.backup_db(
+            os.path.join(DBManager.backup_dir(), f"{stem}-pre-restore-{datetime.now():%Y%m%d-%H%M%S}.db"), pages
+        )
+
+        source = sqlite3.connect(DBManager._read_only_uri(path), uri=True)
+        target = sqlite3.connect(DBManager._db_path, timeout=DBManager.BUSY_TIMEOUT_MS / 1000)
+        try:
+            DBManager._copy_database(source, target, pages, progress)
+        finally:
+            source.close()
+            target.close()
+        return {"restored": path, "safety_copy": safety["path"]}
@@ -1,8 +1,11 @@
 import os
-from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QLabel, QPushButton, 
-                             QFileDialog, QSizePolicy)
-from PyQt6.QtCore import pyqtSignal
+import sqlite3
+from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QLabel, QPushButton,
+                             QFileDialog, QSizePolicy, QMenu, QMessageBox, QProgressDialog)
+from PyQt6.QtCore import Qt, QUrl, pyqtSignal
+from PyQt6.QtGui import QDesktopServices
 from components.db_manager import DBManager
+from components.db_worker import BackupWorker
 from components.styles import apply_class
 
 class DBSelector(QWidget):
@@ -11,22 +14,35 @@ class DBSelector(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        
+        self.backup_worker = None
+        self.backup_progress = None
+
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        
+
         # Label
         self.lbl_db = QLabel()
         apply_class(self.lbl_db, "text-primary font-bold")
         self.update_label()
-        
+
         # Button
         btn_switch_db = QPushButton("SWITCH DB")
         btn_switch_db.setFixedWidth(100)
         btn_switch_db.clicked.connect(self.change_database)
-        
+
+        # Backups: copied online in the background, restore replaces the DB in place
+        self.btn_backup = QPushButton("BACKUP")
+        self.btn_backup.setFixedWidth(100)
+        backup_menu = QMenu(self.btn_backup)
+        backup_menu.addAction("Back Up Now", self.backup_now)
+        backup_menu.addAction("Restore from Backup...", self.restore_backup)
+        backup_menu.addSeparator()
+        backup_menu.addAction("Open Backups Folder", self.open_backup_folder)
+        self.btn_backup.setMenu(backup_menu)
+
         layout.addWidget(self.lbl_db)
         layout.addStretch()
+        layout.addWidget(self.btn_backup)
         layout.addWidget(btn_switch_db)
 
     def update_label(self):
@@ -38,7 +54,98 @@ class DBSelector(QWidget):
         fname, _ = QFileDialog.getOpenFileName(
             self, "Select Database", "", "SQLite Files (*.db);;All Files (*)"
         )
-        if fname:
+        if not fname: return
+        previous = DBManager.get_db_path()
+        try:
             DBManager.set_db_path(fname)
-            self.update_label()
-            self.db_changed.emit(fname)
\ No newline at end of file
+        except (ValueError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Switch Database", f"Could not open {os.path.basename(fname)}:\n{e}")
+            if DBManager.get_db_path() != previous:
+                try: DBManager.set_db_path(previous)
+                except (ValueError, sqlite3.Error): pass
+            return
+        self.update_label()
+        self.db_changed.emit(fname)
+
+    # --- Backups ---
+
+    def backup_now(self):
+        self._start_backup_worker(BackupWorker(), "Backing up database...")
+
+    def restore_backup(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Restore from Backup", DBManager.backup_dir(), "SQLite Files (*.db);;All Files (*)"
+        )
+        if not fname: return
+        reply = QMessageBox.warning(
+            self, "Restore Backup",
+            f"Replace the contents of '{os.path.basename(DBManager.get_db_path())}' with "
+            f"'{os.path.basename(fname)}'?\n\nA copy of the current database is saved to the backups folder first.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes: return
+        self._start_backup_worker(BackupWorker(restore_from=fname), "Restoring database...")
+
+    def open_backup_folder(self):
+        folder = DBManager.backup_dir()
+        if not os.path.isdir(folder):
+            QMessageBox.information(self, "Backups", "No backups have been made yet.")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(folder))
+
+    def _start_backup_worker(self, worker, label):
+        if self.backup_worker is not None: return
+        self.backup_progress = QProgressDialog(label, "Cancel", 0, 100, self)
+        self.backup_progress.setWindowTitle("Backup")
+        self.backup_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.backup_progress.setMinimumDuration(300)
+        self.backup_progress.setAutoClose(False)
+        self.backup_progress.setAutoReset(False)
+        self.backup_progress.canceled.connect(worker.cancel)
+
+        self.backup_worker = worker
+        worker.progress.connect(self._on_backup_progress)
+        worker.succeeded.connect(self._on_backup_done)
+        worker.failed.connect(self._on_backup_failed)
+        self.btn_backup.setEnabled(False)
+        worker.start()
+
+    def _on_backup_progress(self, done, total):
+        if self.backup_progress is not None and total:
+            self.backup_progress.setValue(int(done * 100 / total))
+
+    def _finish_backup(self):
+        restored = self.backup_worker.restore_from
+        self.backup_worker.wait()
+        self.backup_worker = None
+        self.btn_backup.setEnabled(True)
+        if self.backup_progress is not None:
+            self.backup_progress.canceled.disconnect()
+            self.backup_progress.close()
+            self.backup_progress = None
+        return restored
+
+    def _on_backup_done(self, result):
+        if self._finish_backup():
+            # Reopen pooled connections and migrate the restored schema if it is older
+            path = DBManager.get_db_path()
+            DBManager.set_db_path(path)
+            self.db_changed.emit(path)
+            QMessageBox.information(
+                self, "Restore Backup",
+                f"Database restored from {os.path.basename(result['restored'])}.\n"
+                f"The previous contents were saved as {os.path.basename(result['safety_copy'])}."
+            )
+        else:
+            removed = f"\nRemoved {len(result['removed'])} old backup(s)." if result["removed"] else ""
+            QMessageBox.information(
+                self, "Backup",
+                f"Saved {os.path.basename(result['path'])} ({result['size'] / 1024 / 1024:.1f} MiB) "
+                f"in {result['elapsed']:.1f} s.{removed}"
+            )
+
+    def _on_backup_failed(self, error):
+        restoring = self._finish_backup()
+        if error == "Cancelled.": return
+        QMessageBox.critical(self, "Restore Backup" if restoring else "Backup", f"Failed:\n{error}")
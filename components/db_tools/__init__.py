@@ -0,0 +1,21 @@
+from .sqlite_utils import (open_connection, quote_ident, list_tables, table_key_columns,
+                           attach_database, detach_database, list_databases, suggest_alias, sql_name)
+from .table_model import PagedTableModel, format_cell
+from .query_worker import QueryWorker, QueryResultModel
+from .tasks import ConnectionTask
+from .plan_view import QueryPlanPanel
+from .export_worker import ExportWorker, EXPORT_FORMATS, export_cursor
+from .importer import ImportWorker, IMPORT_FORMATS, import_file, preview_file
+from .import_dialog import ImportDialog
+from .storage import analyze_storage, run_maintenance
+from .maintenance_view import MaintenancePanel
+from .blob_io import ValueReader, hex_dump
+from .blob_view import ValueDetailPanel
+from .schema_cache import SchemaCache
+from .schema_browser import SchemaBrowser
+from .sql_completion import CompletionIndex
+from .sql_editor import SqlEditor, SqlHighlighter
+from .db_diff import DiffWorker, diff_databases, schema_diff, format_report, write_patch
+from .diff_view import DiffPanel
+from .query_history import QueryHistory
+from .history_view import QueryHistoryPanel
@@ -0,0 +1,79 @@
+from .sqlite_utils import quote_ident
+
+class ValueReader:
+    """
+    Reads one TEXT/BLOB cell in byte ranges without loading it whole.
+
+    Ordinary (rowid) tables go through Connection.blobopen, which reads
+    straight from the pages holding the requested range. The blob handle
+    is opened per read, so no read transaction stays open on the editor's
+    connection between reads. WITHOUT ROWID tables fall back to substr()
+    on the primary key. TEXT is read as its UTF-8 bytes.
+    """
+    def __init__(self, conn, table, column, key_columns, key):
+        self.conn = conn
+        self.table = table
+        self.column = column
+        self._rowid = None
+
+        where = " AND ".join(f"{'rowid' if k == 'rowid' else quote_ident(k)} = ?" for k in key_columns)
+        self._where, self._key = where, tuple(key)
+        col = quote_ident(column)
+        row = conn.execute(
+            f"SELECT typeof({col}), length(CAST({col} AS BLOB)) FROM {quote_ident(table)} WHERE {where}", self._key
+        ).fetchone()
+        if row is None: raise LookupError("The row no longer exists.")
+        self.type, self.size = row[0], row[1] or 0
+
+        if key_columns == ["rowid"] and self.type in ("text", "blob") and hasattr(conn, "blobopen"):
+            self._rowid = self._key[0]
+
+    def read(self, offset, size):
+        if offset >= self.size: return b""
+        if self._rowid is not None:
+            with self.conn.blobopen(self.table, self.column, self._rowid, readonly=True) as blob:
+                blob.seek(offset)
+                return blob.read(size)
+        col = quote_ident(self.column)
+        row = self.conn.execute(
+            f"SELECT substr(CAST({col} AS BLOB), ?, ?) FROM {quote_ident(self.table)} WHERE {self._where}",
+            (offset + 1, size, *self._key)
+        ).fetchone()
+        return row[0] if row and row[0] is not None else b""
+
+    def chunks(self, chunk_size=64 * 1024, start=0):
+        offset = start
+        while offset < self.size:
+            data = self.read(offset, chunk_size)
+            if not data: break
+            yield data
+            offset += len(data)
+
+    def value(self):
+        """Scalar (non TEXT/BLOB) values, which are small: read directly."""
+        col = quote_ident(self.column)
+        return self.conn.execute(
+            f"SELECT {col} FROM {quote_ident(self.table)} WHERE {self._where}", self._key
+        ).fetchone()[0]
+
+    def save_to(self, path, chunk_size=1024 * 1024):
+        """Streams the whole value into a file. Returns the number of bytes written."""
+        written = 0
+        with open(path, "wb") as f:
+            for data in self.chunks(chunk_size):
+                f.write(data)
+                written += len(data)
+        return written
+
+    def close(self):
+        self._rowid = None
+
+def hex_dump(data, offset=0, width=16):
+    """Classic offset / hex / ASCII dump lines."""
+    lines = []
+    for i in range(0, len(data), width):
+        part = data[i:i + width]
+        hex_part = " ".join(f"{b:02x}" for b in part)
+        text = "".join(chr(b) if 32 <= b < 127 else "." for b in part)
+        lines.append(f"{offset + i:08x}  {hex_part:<{width * 3 - 1}}  {text}")
+    return "\n".join(lines)
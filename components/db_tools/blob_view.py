@@ -0,0 +1,158 @@
+import codecs
+import json
+import sqlite3
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QPlainTextEdit, QFileDialog, QMessageBox)
+from PyQt6.QtGui import QFont
+
+from components.db_manager import DBManager
+from components.styles import C_TEXT_MUTED
+from .blob_io import ValueReader, hex_dump
+
+class ValueDetailPanel(QWidget):
+    """
+    Shows one cell of the Table Editor in full, streamed through
+    ValueReader: Text and Hex views read CHUNK_SIZE bytes at a time
+    ("LOAD MORE" reads the next chunk), the JSON view formats values up to
+    JSON_MAX_BYTES (decoding documents DBManager stored compressed), and
+    SAVE TO FILE streams the whole value to disk.
+    """
+    CHUNK_SIZE = 64 * 1024
+    JSON_MAX_BYTES = 8 * 1024 * 1024
+
+    VIEW_TEXT = "Text"
+    VIEW_HEX = "Hex"
+    VIEW_JSON = "JSON"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.reader = None
+        self.loaded = 0
+        self._decoder = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        top = QHBoxLayout()
+        self.lbl_info = QLabel("Select a cell to see its full value.")
+        self.lbl_info.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        top.addWidget(self.lbl_info, 1)
+        self.combo_view = QComboBox()
+        self.combo_view.addItems([self.VIEW_TEXT, self.VIEW_HEX, self.VIEW_JSON])
+        self.combo_view.currentTextChanged.connect(lambda _: self.reload())
+        top.addWidget(self.combo_view)
+        layout.addLayout(top)
+
+        self.txt = QPlainTextEdit()
+        self.txt.setReadOnly(True)
+        self.txt.setFont(QFont("Consolas", 9))
+        layout.addWidget(self.txt)
+
+        bottom = QHBoxLayout()
+        self.lbl_loaded = QLabel("")
+        self.lbl_loaded.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        bottom.addWidget(self.lbl_loaded, 1)
+        self.btn_more = QPushButton("LOAD MORE")
+        self.btn_more.clicked.connect(self.load_more)
+        bottom.addWidget(self.btn_more)
+        self.btn_save = QPushButton("SAVE TO FILE...")
+        self.btn_save.clicked.connect(self.save_to_file)
+        bottom.addWidget(self.btn_save)
+        layout.addLayout(bottom)
+
+        self._update_buttons()
+
+    def show_cell(self, conn, table, column, key_columns, key):
+        self.clear()
+        if not key_columns or key is None:
+            self.lbl_info.setText(f"{column}: full values can only be read from tables (not views).")
+            return
+        try:
+            self.reader = ValueReader(conn, table, column, key_columns, key)
+        except (sqlite3.Error, LookupError) as e:
+            self.lbl_info.setText(f"{column}: {e}")
+            return
+        self.lbl_info.setText(f"{column} | {self.reader.type.upper()} | {self.reader.size:,} bytes")
+        self.reload()
+
+    def clear(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        self.loaded = 0
+        self.txt.clear()
+        self.lbl_info.setText("Select a cell to see its full value.")
+        self.lbl_loaded.setText("")
+        self._update_buttons()
+
+    def _streams(self):
+        return self.reader is not None and self.reader.type in ("text", "blob")
+
+    def _update_buttons(self):
+        streaming = self._streams() and self.combo_view.currentText() != self.VIEW_JSON
+        self.btn_more.setEnabled(streaming and self.loaded < self.reader.size)
+        self.btn_save.setEnabled(self._streams())
+        self.txt.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap if self.combo_view.currentText() == self.VIEW_HEX
+                                 else QPlainTextEdit.LineWrapMode.WidgetWidth)
+
+    def reload(self):
+        self.txt.clear()
+        self.loaded = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        if self.reader is None:
+            self._update_buttons()
+            return
+        if not self._streams():
+            self.txt.setPlainText("NULL" if self.reader.type == "null" else str(self.reader.value()))
+        elif self.combo_view.currentText() == self.VIEW_JSON:
+            self.show_json()
+        else:
+            self.load_more()
+        self._update_buttons()
+
+    def load_more(self):
+        if not self._streams(): return
+        try:
+            data = self.reader.read(self.loaded, self.CHUNK_SIZE)
+        except sqlite3.Error as e:
+            self.lbl_loaded.setText(f"Read failed: {e}")
+            return
+        if self.combo_view.currentText() == self.VIEW_HEX:
+            text = hex_dump(data, self.loaded)
+        else:
+            text = self._decoder.decode(data, final=self.loaded + len(data) >= self.reader.size)
+        self.loaded += len(data)
+
+        # Append without a newline: chunks of text continue mid-line
+        cursor = self.txt.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        if self.combo_view.currentText() == self.VIEW_HEX and self.loaded > len(data): text = "\n" + text
+        cursor.insertText(text)
+        self.lbl_loaded.setText(f"Showing {self.loaded:,} of {self.reader.size:,} bytes")
+        self._update_buttons()
+
+    def show_json(self):
+        if self.reader.size > self.JSON_MAX_BYTES:
+            self.txt.setPlainText(f"Value is larger than {self.JSON_MAX_BYTES // 1024 // 1024} MiB; "
+                                  "use the Text view or save it to a file.")
+            return
+        raw = b"".join(self.reader.chunks())
+        try:
+            doc = json.loads(DBManager._decode_data(raw))
+        except (ValueError, UnicodeDecodeError) as e:
+            self.txt.setPlainText(f"Not JSON: {e}")
+            return
+        self.txt.setPlainText(json.dumps(doc, indent=2, ensure_ascii=False))
+        self.lbl_loaded.setText(f"Formatted {len(raw):,} bytes")
+
+    def save_to_file(self):
+        if not self._streams(): return
+        ext = "txt" if self.reader.type == "text" else "bin"
+        fname, _ = QFileDialog.getSaveFileName(self, "Save Value", f"{self.reader.column}.{ext}", "All Files (*)")
+        if not fname: return
+        try:
+            written = self.reader.save_to(fname)
+        except (OSError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Save Value", f"Could not save the value:\n{e}")
+            return
+        self.lbl_loaded.setText(f"Saved {written:,} bytes to {fname}")
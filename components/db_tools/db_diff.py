@@ -0,0 +1,352 @@
+import hashlib
+import math
+import sqlite3
+import time
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .sqlite_utils import open_connection, quote_ident
+
+OTHER_ALIAS = "other"
+
+def _objects(conn, schema):
+    """{(type, name): (tbl_name, sql)} of everything user-defined in schema."""
+    return {
+        (kind, name): (table, sql) for kind, name, table, sql in conn.execute(
+            f"SELECT type, name, tbl_name, sql FROM {quote_ident(schema)}.sqlite_master "
+            "WHERE name NOT LIKE 'sqlite_%'"
+        )
+    }
+
+def _columns(conn, schema, table):
+    """[(name, declared type, notnull, default, pk)]"""
+    return [tuple(r[1:]) for r in conn.execute(f"PRAGMA {quote_ident(schema)}.table_info({quote_ident(table)})")]
+
+def _key_columns(conn, schema, table, columns):
+    """Declared primary key, or rowid for tables without one."""
+    pk = [c[0] for c in sorted((c for c in columns if c[4]), key=lambda c: c[4])]
+    if pk: return pk
+    try:
+        conn.execute(f"SELECT rowid FROM {quote_ident(schema)}.{quote_ident(table)} LIMIT 0")
+        return ["rowid"]
+    except sqlite3.OperationalError:
+        return []
+
+def _norm_sql(sql):
+    return " ".join((sql or "").split())
+
+def schema_diff(conn, base="main", other=OTHER_ALIAS):
+    """
+    Compares sqlite_master of two databases open on conn. Returns
+    {"added": [(type, name, sql)], "removed": [(type, name, sql)],
+     "changed": [{"type", "name", "base_sql", "other_sql", "columns_added",
+                  "columns_removed", "columns_changed"}]}
+    added = only in other, removed = only in base; whitespace in the
+    CREATE statements is ignored.
+    """
+    a, b = _objects(conn, base), _objects(conn, other)
+    result = {"added": [], "removed": [], "changed": []}
+    for key in sorted(b.keys() - a.keys()):
+        result["added"].append((*key, b[key][1]))
+    for key in sorted(a.keys() - b.keys()):
+        result["removed"].append((*key, a[key][1]))
+    for key in sorted(a.keys() & b.keys()):
+        if _norm_sql(a[key][1]) == _norm_sql(b[key][1]): continue
+        change = {"type": key[0], "name": key[1], "base_sql": a[key][1], "other_sql": b[key][1],
+                  "columns_added": [], "columns_removed": [], "columns_changed": []}
+        if key[0] == "table":
+            cols_a = {c[0]: c for c in _columns(conn, base, key[1])}
+            cols_b = {c[0]: c for c in _columns(conn, other, key[1])}
+            change["columns_added"] = [c for c in cols_b if c not in cols_a]
+            change["columns_removed"] = [c for c in cols_a if c not in cols_b]
+            change["columns_changed"] = [c for c in cols_a if c in cols_b and cols_a[c] != cols_b[c]]
+        result["changed"].append(change)
+    return result
+
+class _TableSides:
+    """SQL for one table compared across two schemas by key ranges."""
+    def __init__(self, table, keys, columns, base, other):
+        self.table, self.keys, self.columns = table, keys, columns
+        self.base, self.other = base, other
+        key_sql = [k if k == "rowid" else quote_ident(k) for k in keys]
+        self.key_list = ", ".join(key_sql)
+        self.key_expr = f"({self.key_list})" if len(keys) > 1 else self.key_list
+        marks = ", ".join("?" * len(keys))
+        self.key_marks = f"({marks})" if len(keys) > 1 else marks
+        self.select_list = ", ".join(key_sql + [quote_ident(c) for c in columns])
+        self.quoted = " || ',' || ".join(f"quote({c})" for c in key_sql + [quote_ident(c) for c in columns])
+
+    def source(self, schema):
+        return f"{quote_ident(schema)}.{quote_ident(self.table)}"
+
+    def where(self, lo, hi):
+        parts, params = [], []
+        if lo is not None:
+            parts.append(f"{self.key_expr} > {self.key_marks}")
+            params.extend(lo)
+        if hi is not None:
+            parts.append(f"{self.key_expr} <= {self.key_marks}")
+            params.extend(hi)
+        return (" WHERE " + " AND ".join(parts)) if parts else "", params
+
+    def boundaries(self, conn, schema, chunk_rows, last=None):
+        """Every chunk_rows-th key of schema after last: the upper bounds of the chunks."""
+        bounds = []
+        while True:
+            where, params = self.where(last, None)
+            row = conn.execute(
+                f"SELECT {self.key_list} FROM {self.source(schema)}{where} "
+                f"ORDER BY {self.key_list} LIMIT 1 OFFSET ?", (*params, chunk_rows - 1)
+            ).fetchone()
+            if row is None: return bounds
+            bounds.append(tuple(row))
+            last = tuple(row)
+
+    def digest(self, conn, schema, lo, hi):
+        """Hash of the rows in (lo, hi], concatenated by SQLite in key order (one string per chunk)."""
+        where, params = self.where(lo, hi)
+        text, count = conn.execute(
+            f"SELECT group_concat(r, '|'), COUNT(*) FROM "
+            f"(SELECT {self.quoted} AS r FROM {self.source(schema)}{where} ORDER BY {self.key_list})", params
+        ).fetchone()
+        return hashlib.blake2b((text or "").encode("utf-8", "surrogatepass"), digest_size=16).digest(), count
+
+    def rows(self, conn, schema, lo=None, hi=None):
+        where, params = self.where(lo, hi)
+        return conn.execute(
+            f"SELECT {self.select_list} FROM {self.source(schema)}{where} ORDER BY {self.key_list}", params
+        )
+
+def _same(x, y):
+    return x == y and type(x) is type(y)  # 1 and 1.0 are different values to SQLite
+
+def _compare_rows(sides, rows_a, rows_b, out):
+    """
+    Adds one chunk's differences to out. Rows are matched through dicts
+    rather than merged in key order, so key collations and mixed key types
+    don't matter (a chunk is at most chunk_rows rows per side).
+    """
+    nk = len(sides.keys)
+    a = {tuple(r[:nk]): r for r in rows_a}
+    b = {tuple(r[:nk]): r for r in rows_b}
+    for key, row in a.items():
+        other = b.get(key)
+        if other is None:
+            out["removed"].append(key)
+            continue
+        changes = {sides.columns[i]: (row[nk + i], other[nk + i])
+                   for i in range(len(sides.columns)) if not _same(row[nk + i], other[nk + i])}
+        if changes: out["changed"].append((key, changes))
+    out["added"].extend(tuple(row) for key, row in b.items() if key not in a)
+
+def table_data_diff(conn, table, keys, columns, base="main", other=OTHER_ALIAS,
+                    chunk_rows=500, should_stop=None):
+    """
+    Row-level diff of one table by key. The key space is cut into chunks
+    of chunk_rows keys of the base side (continued with the other side's
+    keys past the base's last one); each chunk is hashed on both sides and
+    only chunks whose hashes differ are compared row by row. A hash collision on
+    unequal chunks would need a 128-bit BLAKE2 collision, so equal hashes
+    are trusted.
+
+    Returns {"keys", "columns", "added": [row (keys + columns)],
+    "removed": [key], "changed": [(key, {column: (base, other)})],
+    "chunks", "chunks_compared"}.
+    """
+    sides = _TableSides(table, keys, columns, base, other)
+    out = {"keys": keys, "columns": columns, "added": [], "removed": [], "changed": [],
+           "chunks": 0, "chunks_compared": 0}
+    bounds = sides.boundaries(conn, base, chunk_rows)
+    bounds += sides.boundaries(conn, other, chunk_rows, bounds[-1] if bounds else None)
+    ranges = list(zip([None] + bounds, bounds + [None]))
+    out["chunks"] = len(ranges)
+    for lo, hi in ranges:
+        if should_stop and should_stop(): raise InterruptedError("Diff cancelled.")
+        if sides.digest(conn, base, lo, hi) == sides.digest(conn, other, lo, hi): continue
+        out["chunks_compared"] += 1
+        _compare_rows(sides, sides.rows(conn, base, lo, hi), sides.rows(conn, other, lo, hi), out)
+    return out
+
+def diff_databases(conn, base="main", other=OTHER_ALIAS, chunk_rows=500, progress=None, should_stop=None):
+    """
+    Schema diff plus a data diff of every table: tables in both databases
+    are compared on their common columns (skipped if the keys differ),
+    tables only in other list all their rows as added.
+    Returns {"schema": schema_diff(), "tables": {name: table_data_diff() or {"skipped": reason}},
+    "elapsed"}. progress(table, done, total) is called per table.
+    """
+    start = time.perf_counter()
+    schema = schema_diff(conn, base, other)
+    tables_a = {n for (k, n) in _objects(conn, base) if k == "table"}
+    tables_b = {n for (k, n) in _objects(conn, other) if k == "table"}
+    names = sorted(tables_a | tables_b)
+
+    tables = {}
+    for done, table in enumerate(names):
+        if progress: progress(table, done, len(names))
+        if table not in tables_b: continue  # Dropped: already in the schema diff
+        cols_b = _columns(conn, other, table)
+        keys_b = _key_columns(conn, other, table, cols_b)
+        if table not in tables_a:
+            columns = [c[0] for c in cols_b if c[0] not in keys_b]
+            sides = _TableSides(table, keys_b, columns, base, other)
+            tables[table] = {"keys": keys_b, "columns": columns, "changed": [], "removed": [],
+                             "added": [tuple(r) for r in sides.rows(conn, other)], "chunks": 0,
+                             "chunks_compared": 0, "new_table": True}
+            continue
+        cols_a = _columns(conn, base, table)
+        keys_a = _key_columns(conn, base, table, cols_a)
+        if not keys_a or keys_a != keys_b:
+            tables[table] = {"skipped": "the primary keys differ" if keys_a else "no key to match rows by"}
+            continue
+        names_b = {c[0] for c in cols_b}
+        columns = [c[0] for c in cols_a if c[0] in names_b and c[0] not in keys_a]
+        tables[table] = table_data_diff(conn, table, keys_a, columns, base, other, chunk_rows, should_stop)
+    if progress: progress("", len(names), len(names))
+    return {"schema": schema, "tables": tables, "elapsed": time.perf_counter() - start}
+
+# --- Output ---
+
+def sql_literal(value):
+    if value is None: return "NULL"
+    if isinstance(value, bytes): return f"X'{value.hex()}'"
+    if isinstance(value, float) and math.isinf(value): return "9e999" if value > 0 else "-9e999"
+    if isinstance(value, (int, float)): return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def _preview(value, width=60):
+    text = f"<BLOB {len(value)} bytes>" if isinstance(value, bytes) else repr(value)
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+def _key_text(key):
+    return ", ".join(_preview(k, 30) for k in key)
+
+def format_report(result, base_name="base", other_name="other", rows_per_table=50):
+    """Readable text report: schema changes, then per-table row counts and examples."""
+    lines = [f"Diff: {base_name} -> {other_name}", ""]
+    schema = result["schema"]
+    lines.append("SCHEMA")
+    if not (schema["added"] or schema["removed"] or schema["changed"]):
+        lines.append("  No differences.")
+    for kind, name, _ in schema["added"]:
+        lines.append(f"  + {kind} {name}")
+    for kind, name, _ in schema["removed"]:
+        lines.append(f"  - {kind} {name}")
+    for change in schema["changed"]:
+        details = []
+        if change["columns_added"]: details.append("columns added: " + ", ".join(change["columns_added"]))
+        if change["columns_removed"]: details.append("columns removed: " + ", ".join(change["columns_removed"]))
+        if change["columns_changed"]: details.append("columns changed: " + ", ".join(change["columns_changed"]))
+        lines.append(f"  ~ {change['type']} {change['name']}: " + ("; ".join(details) or "definition changed"))
+
+    lines += ["", "DATA"]
+    for table, diff in result["tables"].items():
+        if "skipped" in diff:
+            lines.append(f"  {table}: not compared ({diff['skipped']})")
+            continue
+        counts = f"{len(diff['added']):,} added, {len(diff['removed']):,} removed, {len(diff['changed']):,} changed"
+        if diff.get("new_table"):
+            lines.append(f"  {table}: new table, {len(diff['added']):,} row(s)")
+            continue
+        lines.append(f"  {table}: {counts} "
+                     f"({diff['chunks_compared']:,} of {diff['chunks']:,} chunk(s) compared row by row)")
+        nk = len(diff["keys"])
+        shown = 0
+        for row in diff["added"]:
+            if shown >= rows_per_table: break
+            lines.append(f"      + ({_key_text(row[:nk])})")
+            shown += 1
+        for key in diff["removed"]:
+            if shown >= rows_per_table: break
+            lines.append(f"      - ({_key_text(key)})")
+            shown += 1
+        for key, changes in diff["changed"]:
+            if shown >= rows_per_table: break
+            cols = "; ".join(f"{c}: {_preview(old)} -> {_preview(new)}" for c, (old, new) in changes.items())
+            lines.append(f"      ~ ({_key_text(key)}) {cols}")
+            shown += 1
+        total = len(diff["added"]) + len(diff["removed"]) + len(diff["changed"])
+        if total > shown: lines.append(f"      ... and {total - shown:,} more")
+    lines += ["", f"Compared in {result['elapsed']:.2f} s."]
+    return "\n".join(lines)
+
+def write_patch(result, f, base_name="base", other_name="other"):
+    """
+    Writes an SQL script that turns base into other: dropped objects,
+    new objects, then row DELETE/UPDATE/INSERTs, in one transaction.
+    Tables whose definition changed are listed as comments; altering
+    them is left to the user.
+    """
+    schema = result["schema"]
+    order = {"trigger": 0, "view": 1, "index": 2, "table": 3}
+    f.write(f"-- Turns {base_name} into {other_name}\nBEGIN;\n")
+    for kind, name, _ in sorted(schema["removed"], key=lambda o: order.get(o[0], 4)):
+        f.write(f"DROP {kind.upper()} IF EXISTS {quote_ident(name)};\n")
+    later = []
+    for kind, name, sql in schema["added"]:
+        if not sql: continue  # Automatic indexes
+        if kind == "table": f.write(f"{sql};\n")
+        else: later.append(f"{sql};\n")
+    for change in schema["changed"]:
+        if change["type"] == "table":
+            f.write(f"-- Table {change['name']} has a different definition in {other_name}:\n")
+            f.write("".join(f"--   {line}\n" for line in (change["other_sql"] or "").splitlines()))
+        elif change["other_sql"]:
+            f.write(f"DROP {change['type'].upper()} IF EXISTS {quote_ident(change['name'])};\n")
+            later.append(f"{change['other_sql']};\n")
+
+    for table, diff in result["tables"].items():
+        if "skipped" in diff: continue
+        keys, columns = diff["keys"], diff["columns"]
+        nk = len(keys)
+        key_sql = [k if k == "rowid" else quote_ident(k) for k in keys]
+        match = lambda key: " AND ".join(f"{k} = {sql_literal(v)}" for k, v in zip(key_sql, key))
+        target = quote_ident(table)
+        for key in diff["removed"]:
+            f.write(f"DELETE FROM {target} WHERE {match(key)};\n")
+        for key, changes in diff["changed"]:
+            sets = ", ".join(f"{quote_ident(c)} = {sql_literal(new)}" for c, (_, new) in changes.items())
+            f.write(f"UPDATE {target} SET {sets} WHERE {match(key)};\n")
+        col_list = ", ".join(key_sql + [quote_ident(c) for c in columns])
+        for row in diff["added"]:
+            f.write(f"INSERT INTO {target} ({col_list}) VALUES ({', '.join(sql_literal(v) for v in row)});\n")
+
+    f.writelines(later)
+    f.write("COMMIT;\n")
+
+class DiffWorker(QThread):
+    """Runs diff_databases() on a read-only connection with the other file ATTACHed."""
+    progress = pyqtSignal(str, int, int)  # table, done, total
+    diffFinished = pyqtSignal(dict)       # {"result", "cancelled", "error"}
+
+    def __init__(self, base_path, other_path, chunk_rows=500, parent=None):
+        super().__init__(parent)
+        self.base_path = base_path
+        self.other_path = other_path
+        self.chunk_rows = chunk_rows
+        self._conn = None
+        self._cancelled = False
+
+    def run(self):
+        outcome = {"result": None, "cancelled": False, "error": None}
+        try:
+            self._conn = open_connection(self.base_path, check_same_thread=False, read_only=True,
+                                         attached={OTHER_ALIAS: self.other_path})
+            outcome["result"] = diff_databases(
+                self._conn, chunk_rows=self.chunk_rows, progress=self.progress.emit,
+                should_stop=lambda: self._cancelled
+            )
+        except (InterruptedError, sqlite3.OperationalError) as e:
+            if not self._cancelled: outcome["error"] = str(e)
+        except sqlite3.Error as e:
+            outcome["error"] = str(e)
+        finally:
+            outcome["cancelled"] = self._cancelled
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.diffFinished.emit(outcome)
+
+    def cancel(self):
+        self._cancelled = True
+        conn = self._conn
+        if conn is not None: conn.interrupt()
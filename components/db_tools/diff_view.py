@@ -0,0 +1,174 @@
+import os
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton,
+                             QLineEdit, QPlainTextEdit, QFileDialog, QMessageBox)
+from PyQt6.QtGui import QFont
+
+from components.styles import C_PRIMARY, C_DANGER, C_TEXT_MUTED
+from .db_diff import DiffWorker, format_report, write_patch
+
+class DiffPanel(QWidget):
+    """
+    Compares two database files: schema differences, then a row-level
+    data diff by primary key (hashed chunks, see table_data_diff). The
+    report can be saved, and so can an SQL script that turns the base
+    file into the other one.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        self.result = None
+
+        layout = QVBoxLayout(self)
+
+        files = QGridLayout()
+        self.txt_base = QLineEdit()
+        self.txt_base.setPlaceholderText("Database to compare from (the patch applies to this one)")
+        self.txt_other = QLineEdit()
+        self.txt_other.setPlaceholderText("Database to compare with")
+        for row, (label, edit) in enumerate((("Base:", self.txt_base), ("Other:", self.txt_other))):
+            btn = QPushButton("...")
+            btn.setFixedWidth(30)
+            btn.clicked.connect(lambda _, e=edit: self.browse(e))
+            files.addWidget(QLabel(label), row, 0)
+            files.addWidget(edit, row, 1)
+            files.addWidget(btn, row, 2)
+        layout.addLayout(files)
+
+        btn_row = QHBoxLayout()
+        self.btn_compare = QPushButton("COMPARE")
+        self.btn_compare.setStyleSheet(f"background-color: {C_PRIMARY}; color: black; font-weight: bold;")
+        self.btn_compare.clicked.connect(self.compare)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel)
+        self.btn_save_report = QPushButton("SAVE REPORT...")
+        self.btn_save_report.clicked.connect(self.save_report)
+        self.btn_save_patch = QPushButton("SAVE SQL PATCH...")
+        self.btn_save_patch.setToolTip("SQL script that turns the base database into the other one")
+        self.btn_save_patch.clicked.connect(self.save_patch)
+        btn_row.addWidget(self.btn_compare, 1)
+        btn_row.addWidget(self.btn_cancel)
+        btn_row.addWidget(self.btn_save_report)
+        btn_row.addWidget(self.btn_save_patch)
+        layout.addLayout(btn_row)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        layout.addWidget(self.lbl_status)
+
+        self.txt_report = QPlainTextEdit()
+        self.txt_report.setReadOnly(True)
+        self.txt_report.setFont(QFont("Consolas", 9))
+        self.txt_report.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.txt_report)
+
+        self._set_result(None)
+
+    def set_database(self, db_path):
+        """The current database becomes the default base."""
+        self.cancel()
+        self.txt_base.setText(db_path or "")
+
+    def browse(self, edit):
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Select Database", os.path.dirname(edit.text()), "SQLite Files (*.db);;All Files (*)"
+        )
+        if fname: edit.setText(fname)
+
+    def _names(self):
+        return os.path.basename(self.txt_base.text()), os.path.basename(self.txt_other.text())
+
+    def _set_result(self, result):
+        self.result = result
+        self.btn_save_report.setEnabled(result is not None)
+        self.btn_save_patch.setEnabled(result is not None)
+
+    # --- Background Diff ---
+
+    def compare(self):
+        base, other = self.txt_base.text().strip(), self.txt_other.text().strip()
+        if self.worker is not None or not base or not other: return
+        for path in (base, other):
+            if not os.path.isfile(path):
+                QMessageBox.warning(self, "Compare", f"'{path}' does not exist.")
+                return
+        if os.path.samefile(base, other):
+            QMessageBox.warning(self, "Compare", "Pick two different files.")
+            return
+
+        self._set_result(None)
+        self.txt_report.clear()
+        self.worker = DiffWorker(base, other)
+        self.worker.progress.connect(self._on_progress)
+        self.worker.diffFinished.connect(self._on_finished)
+        self.btn_compare.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.lbl_status.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        self.lbl_status.setText("Comparing schemas...")
+        self.worker.start()
+
+    def _on_progress(self, table, done, total):
+        if table: self.lbl_status.setText(f"Comparing {table} ({done + 1}/{total})...")
+
+    def _finish(self):
+        self.worker.wait()
+        self.worker = None
+        self.btn_compare.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+
+    def cancel(self):
+        """Interrupts a running diff and waits for it (also used on DB switch / tab close)."""
+        if self.worker is None: return
+        self.worker.diffFinished.disconnect(self._on_finished)
+        self.worker.cancel()
+        self._finish()
+        self.lbl_status.setText("Cancelled.")
+
+    def _on_finished(self, outcome):
+        self._finish()
+        if outcome["error"]:
+            self.lbl_status.setText("")
+            QMessageBox.critical(self, "Compare", f"Failed:\n{outcome['error']}")
+            return
+        if outcome["cancelled"]:
+            self.lbl_status.setText("Cancelled.")
+            return
+        result = outcome["result"]
+        self._set_result(result)
+        self.txt_report.setPlainText(format_report(result, *self._names()))
+
+        schema = result["schema"]
+        schema_changes = len(schema["added"]) + len(schema["removed"]) + len(schema["changed"])
+        tables = result["tables"].values()
+        rows = sum(len(t["added"]) + len(t["removed"]) + len(t["changed"]) for t in tables if "skipped" not in t)
+        chunks = sum(t["chunks"] for t in tables if "skipped" not in t)
+        compared = sum(t["chunks_compared"] for t in tables if "skipped" not in t)
+        self.lbl_status.setText(
+            f"{schema_changes} schema difference(s), {rows:,} row difference(s) | "
+            f"{chunks - compared:,} of {chunks:,} chunk(s) matched by hash | {result['elapsed']:.2f} s"
+        )
+        self.lbl_status.setStyleSheet(
+            f"color: {C_DANGER if schema_changes or rows else C_TEXT_MUTED}; font-size: 11px;"
+        )
+
+    # --- Output ---
+
+    def save_report(self):
+        if self.result is None: return
+        fname, _ = QFileDialog.getSaveFileName(self, "Save Report", "diff.txt", "Text Files (*.txt);;All Files (*)")
+        if not fname: return
+        try:
+            with open(fname, "w", encoding="utf-8") as f:
+                f.write(self.txt_report.toPlainText())
+        except OSError as e:
+            QMessageBox.critical(self, "Save Report", f"Could not save the report:\n{e}")
+
+    def save_patch(self):
+        if self.result is None: return
+        fname, _ = QFileDialog.getSaveFileName(self, "Save SQL Patch", "patch.sql", "SQL Files (*.sql);;All Files (*)")
+        if not fname: return
+        try:
+            with open(fname, "w", encoding="utf-8") as f:
+                write_patch(self.result, f, *self._names())
+        except OSError as e:
+            QMessageBox.critical(self, "Save SQL Patch", f"Could not save the patch:\n{e}")
@@ -0,0 +1,115 @@
+import csv
+import json
+import os
+import sqlite3
+import time
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .sqlite_utils import open_connection
+
+EXPORT_FORMATS = {"csv": "CSV (*.csv)", "jsonl": "JSON Lines (*.jsonl)"}
+
+def _blob_hex(value):
+    if isinstance(value, bytes): return value.hex()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+def export_cursor(cursor, f, fmt, batch_size=5000, progress=None, should_stop=None):
+    """
+    Writes every row of an executed cursor to the text file f, fetching
+    batch_size rows at a time so memory does not grow with the result.
+    fmt "csv" writes a header row (NULL becomes an empty field), "jsonl"
+    one {column: value} object per line. BLOBs are written as hex.
+    progress(rows) is called after each batch; should_stop() is checked
+    between batches. Returns the number of rows written.
+    """
+    columns = [d[0] for d in cursor.description]
+    rows = 0
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        def write(batch):
+            writer.writerows(tuple(v.hex() if isinstance(v, bytes) else v for v in row) for row in batch)
+    elif fmt == "jsonl":
+        encoder = json.JSONEncoder(ensure_ascii=False, default=_blob_hex)
+        def write(batch):
+            f.writelines(encoder.encode(dict(zip(columns, row))) + "\n" for row in batch)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    while not (should_stop and should_stop()):
+        batch = cursor.fetchmany(batch_size)
+        if not batch: break
+        write(batch)
+        rows += len(batch)
+        if progress: progress(rows)
+    return rows
+
+class ExportWorker(QThread):
+    """
+    Streams the result of one query to a CSV/JSONL file on its own
+    read-only connection. The file is written next to the target as
+    "<path>.part" and renamed when complete, so a cancelled or failed
+    export never leaves a truncated file behind.
+    """
+    progress = pyqtSignal(int, int)      # rows written, bytes written
+    exportFinished = pyqtSignal(dict)    # {rows, bytes, elapsed, cancelled, error, path}
+
+    BATCH_SIZE = 5000
+    PROGRESS_STEPS = 1000
+
+    def __init__(self, db_path, sql, path, fmt, params=(), attached=None, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.attached = dict(attached or {})
+        self.sql = sql
+        self.path = path
+        self.fmt = fmt
+        self.params = params
+        self._conn = None
+        self._cancelled = False
+
+    def run(self):
+        stats = {"rows": 0, "bytes": 0, "elapsed": 0.0, "cancelled": False, "error": None, "path": self.path}
+        part = self.path + ".part"
+        start = time.perf_counter()
+        try:
+            # Read-only: exporting a statement that writes must not change the database
+            self._conn = open_connection(self.db_path, check_same_thread=False, read_only=True,
+                                         attached=self.attached)
+            # Lets cancel() stop a statement that takes long before its first row
+            self._conn.set_progress_handler(lambda: 1 if self._cancelled else 0, self.PROGRESS_STEPS)
+            cursor = self._conn.execute(self.sql, self.params)
+            if not cursor.description:
+                raise ValueError("The statement does not return rows.")
+
+            with open(part, "w", encoding="utf-8", newline="") as f:
+                def on_progress(rows):
+                    stats["rows"] = rows
+                    self.progress.emit(rows, f.tell())
+                stats["rows"] = export_cursor(cursor, f, self.fmt, self.BATCH_SIZE,
+                                              on_progress, lambda: self._cancelled)
+                stats["bytes"] = f.tell()
+        except sqlite3.OperationalError as e:
+            if not self._cancelled: stats["error"] = str(e)
+        except (sqlite3.Error, OSError, ValueError, TypeError) as e:
+            stats["error"] = str(e)
+        finally:
+            stats["cancelled"] = self._cancelled
+            stats["elapsed"] = time.perf_counter() - start
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        try:
+            if stats["cancelled"] or stats["error"]:
+                if os.path.exists(part): os.remove(part)
+            else:
+                os.replace(part, self.path)
+        except OSError as e:
+            stats["error"] = stats["error"] or str(e)
+        self.exportFinished.emit(stats)
+
+    def cancel(self):
+        self._cancelled = True
+        conn = self._conn
+        if conn is not None: conn.interrupt()
@@ -0,0 +1,253 @@
+import os
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QInputDialog, QMessageBox)
+from PyQt6.QtCore import Qt, pyqtSignal, QStandardPaths
+from PyQt6.QtGui import QColor, QFont
+
+from components.db_worker import AsyncDB
+from components.styles import C_PRIMARY, C_DANGER, C_TEXT_MUTED
+from .query_history import QueryHistory
+
+def default_history_path():
+    """query_history.db in the user's data folder, shared by every editor tab."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return os.path.join(base or os.path.expanduser("~"), "PyTools", "query_history.db")
+
+class QueryHistoryPanel(QWidget):
+    """
+    Queries run in the SQL tab against the current database (set_database),
+    with run count, mean / p95 latency and row counts over the kept runs.
+    Named queries form that database's library. Everything is stored in a
+    QueryHistory file of the app's own, so the inspected database is never
+    written to.
+
+    A query whose last run took more than REGRESSION_FACTOR times its mean
+    (once it has REGRESSION_MIN_RUNS runs) is highlighted. RUN and
+    double-click hand the SQL back to the owner (runRequested /
+    loadRequested), which owns the editor and the query worker.
+    """
+    runRequested = pyqtSignal(str)
+    loadRequested = pyqtSignal(str)
+
+    VIEW_HISTORY = "History"
+    VIEW_LIBRARY = "Library"
+    REGRESSION_FACTOR = 2.0
+    REGRESSION_MIN_RUNS = 5
+    COLUMNS = ["Name", "Query", "Runs", "Mean ms", "P95 ms", "Last ms", "Rows"]
+    ROLE_ROW = Qt.ItemDataRole.UserRole
+
+    def __init__(self, history=None, parent=None):
+        super().__init__(parent)
+        self.db = AsyncDB.instance()
+        self.history = history or QueryHistory(default_history_path())
+        self.db_path = None
+        self.rows = []
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        filter_row = QHBoxLayout()
+        self.combo_view = QComboBox()
+        self.combo_view.addItems([self.VIEW_HISTORY, self.VIEW_LIBRARY])
+        self.combo_view.currentIndexChanged.connect(self.refresh)
+        self.txt_filter = QLineEdit()
+        self.txt_filter.setPlaceholderText("Filter by name or SQL...")
+        self.txt_filter.textChanged.connect(self._apply_filter)
+        filter_row.addWidget(self.combo_view)
+        filter_row.addWidget(self.txt_filter, 1)
+        layout.addLayout(filter_row)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.itemSelectionChanged.connect(self._update_buttons)
+        self.table.itemDoubleClicked.connect(lambda _: self._emit_selected(self.loadRequested))
+        layout.addWidget(self.table)
+
+        btn_row = QHBoxLayout()
+        self.btn_run = QPushButton("RUN")
+        self.btn_run.setStyleSheet(f"background-color: {C_PRIMARY}; color: black; font-weight: bold;")
+        self.btn_run.setToolTip("Load the query into the editor and execute it")
+        self.btn_run.clicked.connect(lambda: self._emit_selected(self.runRequested))
+        self.btn_save = QPushButton("SAVE TO LIBRARY...")
+        self.btn_save.clicked.connect(self.save_selected)
+        self.btn_unname = QPushButton("REMOVE FROM LIBRARY")
+        self.btn_unname.clicked.connect(self.unname_selected)
+        self.btn_delete = QPushButton("DELETE")
+        self.btn_delete.clicked.connect(self.delete_selected)
+        self.btn_clear = QPushButton("CLEAR HISTORY")
+        self.btn_clear.setToolTip("Forget every query that is not in the library")
+        self.btn_clear.clicked.connect(self.clear_history)
+        btn_row.addWidget(self.btn_run, 1)
+        btn_row.addWidget(self.btn_save)
+        btn_row.addWidget(self.btn_unname)
+        btn_row.addWidget(self.btn_delete)
+        btn_row.addStretch()
+        btn_row.addWidget(self.btn_clear)
+        layout.addLayout(btn_row)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        layout.addWidget(self.lbl_status)
+
+        self._update_buttons()
+
+    # --- Loading ---
+
+    def set_database(self, db_path):
+        """Shows the history of db_path (None clears the list)."""
+        self.db_path = db_path
+        self.refresh()
+
+    def refresh(self):
+        """Re-reads the list for the current database."""
+        if not self.db_path:
+            self.populate([])
+            return
+        named_only = self.combo_view.currentText() == self.VIEW_LIBRARY
+        self.db.submit(self.history.list_queries, self.db_path, named_only, key="query_history",
+                       on_done=self.populate, on_error=self.show_error)
+
+    def record(self, sql, elapsed_ms, rows, error=None):
+        """Stores one run of sql against the current database in the background, then refreshes."""
+        if not self.db_path: return
+        self.db.submit(self.history.record_run, self.db_path, sql, elapsed_ms, rows, error,
+                       on_done=lambda _: self.refresh(), on_error=self.show_error)
+
+    def show_error(self, error):
+        self.lbl_status.setText(f"Query history unavailable: {error}")
+
+    def _number_item(self, value, digits=1):
+        item = QTableWidgetItem()
+        if value is not None:
+            item.setData(Qt.ItemDataRole.DisplayRole, round(value, digits) if digits else int(value))
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return item
+
+    def is_regression(self, row):
+        return (row["last_error"] is None and row["runs"] >= self.REGRESSION_MIN_RUNS and
+                row["last_ms"] > self.REGRESSION_FACTOR * row["mean_ms"])
+
+    def populate(self, rows):
+        selected = self._selected_row()
+        self.rows = rows
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        mono = QFont("Consolas", 9)
+        regressions = 0
+        for i, row in enumerate(rows):
+            name_item = QTableWidgetItem(row["name"] or "")
+            name_item.setData(self.ROLE_ROW, i)
+            self.table.setItem(i, 0, name_item)
+
+            sql_item = QTableWidgetItem(" ".join(row["sql"].split())[:200])
+            sql_item.setFont(mono)
+            sql_item.setToolTip(row["sql"])
+            self.table.setItem(i, 1, sql_item)
+
+            runs_item = self._number_item(row["run_count"], digits=0)
+            if row["error_count"]:
+                runs_item.setToolTip(f"{row['error_count']:,} failed run(s)")
+            self.table.setItem(i, 2, runs_item)
+            self.table.setItem(i, 3, self._number_item(row["mean_ms"]))
+            self.table.setItem(i, 4, self._number_item(row["p95_ms"]))
+
+            last_item = self._number_item(row["last_ms"])
+            if row["last_error"] is not None:
+                last_item.setForeground(QColor(C_DANGER))
+                last_item.setToolTip(f"Last run failed: {row['last_error']}")
+            elif self.is_regression(row):
+                regressions += 1
+                last_item.setForeground(QColor(C_DANGER))
+                last_item.setFont(QFont(mono.family(), 9, QFont.Weight.Bold))
+                last_item.setToolTip(f"{row['last_ms'] / row['mean_ms']:.1f}x slower than the mean of "
+                                     f"{row['runs']} run(s)")
+            self.table.setItem(i, 5, last_item)
+
+            rows_item = self._number_item(row["last_rows"], digits=0)
+            if row["mean_rows"] is not None:
+                rows_item.setToolTip(f"Mean: {row['mean_rows']:,.1f} row(s)")
+            self.table.setItem(i, 6, rows_item)
+        self.table.setSortingEnabled(True)
+
+        status = f"{len(rows):,} quer{'y' if len(rows) == 1 else 'ies'}"
+        if regressions: status += f" | {regressions} slower than usual on the last run"
+        self.lbl_status.setText(status)
+        self._apply_filter()
+        if selected is not None:
+            for i in range(self.table.rowCount()):
+                if self.rows[self.table.item(i, 0).data(self.ROLE_ROW)]["id"] == selected["id"]:
+                    self.table.selectRow(i)
+                    break
+        self._update_buttons()
+
+    def _apply_filter(self):
+        needle = self.txt_filter.text().strip().lower()
+        for i in range(self.table.rowCount()):
+            row = self.rows[self.table.item(i, 0).data(self.ROLE_ROW)]
+            text = f"{row['name'] or ''}\n{row['sql']}".lower()
+            self.table.setRowHidden(i, bool(needle) and needle not in text)
+
+    # --- Actions ---
+
+    def _selected_row(self):
+        selected = self.table.selectedItems()
+        if not selected: return None
+        index = self.table.item(selected[0].row(), 0).data(self.ROLE_ROW)
+        return self.rows[index] if index is not None and index < len(self.rows) else None
+
+    def _update_buttons(self):
+        row = self._selected_row()
+        for btn in (self.btn_run, self.btn_save, self.btn_delete):
+            btn.setEnabled(row is not None)
+        self.btn_unname.setEnabled(row is not None and row["name"] is not None)
+
+    def _emit_selected(self, signal):
+        row = self._selected_row()
+        if row is not None: signal.emit(row["sql"])
+
+    def save_selected(self):
+        row = self._selected_row()
+        if row is None: return
+        name, ok = QInputDialog.getText(self, "Save to Library", "Name:", text=row["name"] or "")
+        name = name.strip()
+        if not ok or not name: return
+        taken = any(r["name"] == name and r["id"] != row["id"] for r in self.rows)
+        if taken and QMessageBox.question(
+            self, "Save to Library", f"'{name}' already names another query. Replace it?"
+        ) != QMessageBox.StandardButton.Yes:
+            return
+        self.db.submit(self.history.save_query, self.db_path, row["sql"], name,
+                       on_done=lambda _: self.refresh(), on_error=self.show_error)
+
+    def unname_selected(self):
+        row = self._selected_row()
+        if row is None or row["name"] is None: return
+        self.db.submit(self.history.unname_query, row["id"],
+                       on_done=lambda _: self.refresh(), on_error=self.show_error)
+
+    def delete_selected(self):
+        row = self._selected_row()
+        if row is None: return
+        if row["name"] is not None and QMessageBox.question(
+            self, "Delete Query", f"Delete '{row['name']}' from the library and its timing history?"
+        ) != QMessageBox.StandardButton.Yes:
+            return
+        self.db.submit(self.history.delete_query, row["id"],
+                       on_done=lambda _: self.refresh(), on_error=self.show_error)
+
+    def clear_history(self):
+        if QMessageBox.question(
+            self, "Clear History", "Forget every query that is not saved in the library?"
+        ) != QMessageBox.StandardButton.Yes:
+            return
+        if not self.db_path: return
+        self.db.submit(self.history.clear_history, self.db_path,
+                       on_done=lambda _: self.refresh(), on_error=self.show_error)
@@ -0,0 +1,147 @@
+import os
+import re
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QCheckBox,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QDialogButtonBox, QMessageBox)
+
+from components.styles import C_TEXT_MUTED
+from .importer import preview_file
+from .sqlite_utils import list_tables, quote_ident
+
+SKIP = "(skip)"
+COLUMN_TYPES = ["INTEGER", "REAL", "TEXT", "BLOB", "NUMERIC"]
+
+class ImportDialog(QDialog):
+    """
+    Chooses where a CSV/JSONL file goes: a new table (columns and types
+    inferred from a sample, both editable) or an existing one (source
+    columns mapped to table columns by name, editable). options() returns
+    the keyword arguments for ImportWorker.
+    """
+    PREVIEW_ROWS = 1000
+
+    def __init__(self, parent, conn, path):
+        super().__init__(parent)
+        self.conn = conn
+        self.path = path
+        self.preview = preview_file(path, sample_size=self.PREVIEW_ROWS)  # Raises on unreadable files
+        self.tables = {name for name, kind in list_tables(conn) if kind == "table"}
+
+        self.setWindowTitle(f"IMPORT: {os.path.basename(path)}")
+        self.resize(640, 520)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        target_row = QHBoxLayout()
+        target_row.addWidget(QLabel("TARGET TABLE:"))
+        self.combo_table = QComboBox()
+        self.combo_table.setEditable(True)
+        self.combo_table.addItems(sorted(self.tables))
+        stem = re.sub(r"\W+", "_", os.path.splitext(os.path.basename(path))[0]).strip("_") or "imported"
+        self.combo_table.setEditText(stem)
+        self.combo_table.currentTextChanged.connect(self.refresh_mapping)
+        target_row.addWidget(self.combo_table, 1)
+        layout.addLayout(target_row)
+
+        self.lbl_mode = QLabel("")
+        self.lbl_mode.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        layout.addWidget(self.lbl_mode)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Source Column", "Sample", "Target Column", "Type"])
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self.chk_defer = QCheckBox("Defer index updates (drop and rebuild the table's indexes)")
+        self.chk_defer.setToolTip("Faster when loading many rows into an empty or small indexed table")
+        layout.addWidget(self.chk_defer)
+
+        sample = len(self.preview["sample"])
+        lbl_info = QLabel(
+            f"{self.preview['format'].upper()}, {self.preview['size'] / 1024 / 1024:.1f} MiB. "
+            f"Types inferred from the first {sample:,} row(s). Rows are inserted in one transaction."
+        )
+        lbl_info.setWordWrap(True)
+        lbl_info.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        layout.addWidget(lbl_info)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.button(QDialogButtonBox.StandardButton.Ok).setText("IMPORT")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.refresh_mapping()
+
+    def target_table(self):
+        return self.combo_table.currentText().strip()
+
+    def creates_table(self):
+        return self.target_table() not in self.tables
+
+    def refresh_mapping(self):
+        table = self.target_table()
+        create = self.creates_table()
+        if create:
+            targets = None
+            self.lbl_mode.setText("A new table will be created.")
+        else:
+            targets = [r[1] for r in self.conn.execute(f"PRAGMA table_info({quote_ident(table)})")]
+            self.lbl_mode.setText(f"Rows will be appended to '{table}'. Unmatched columns are skipped.")
+        self.chk_defer.setEnabled(not create)
+
+        columns = self.preview["columns"]
+        first = self.preview["sample"][0] if self.preview["sample"] else ()
+        self.table.setRowCount(len(columns))
+        for row, (name, kind) in enumerate(zip(columns, self.preview["types"])):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            sample = first[row] if row < len(first) and first[row] is not None else "NULL"
+            self.table.setItem(row, 1, QTableWidgetItem(str(sample)))
+
+            combo_target = QComboBox()
+            if targets is None:
+                combo_target.setEditable(True)
+                combo_target.addItems([name, SKIP])
+            else:
+                combo_target.addItems([SKIP] + targets)
+                match = next((t for t in targets if t.lower() == name.lower()), SKIP)
+                combo_target.setCurrentText(match)
+            self.table.setCellWidget(row, 2, combo_target)
+
+            combo_type = QComboBox()
+            combo_type.addItems(COLUMN_TYPES)
+            combo_type.setCurrentText(kind)
+            combo_type.setEnabled(create)
+            self.table.setCellWidget(row, 3, combo_type)
+
+    def options(self):
+        mapping, types = {}, []
+        for row, name in enumerate(self.preview["columns"]):
+            target = self.table.cellWidget(row, 2).currentText().strip()
+            mapping[name] = None if target in ("", SKIP) else target
+            types.append(self.table.cellWidget(row, 3).currentText())
+        return {
+            "table": self.target_table(),
+            "mapping": mapping,
+            "types": types,
+            "fmt": self.preview["format"],
+            "create": self.creates_table(),
+            "defer_indexes": self.chk_defer.isChecked() and not self.creates_table(),
+        }
+
+    def accept(self):
+        opts = self.options()
+        if not opts["table"]:
+            QMessageBox.warning(self, "Import", "Enter a target table name.")
+            return
+        targets = [t for t in opts["mapping"].values() if t]
+        if not targets:
+            QMessageBox.warning(self, "Import", "Map at least one column.")
+            return
+        if len({t.lower() for t in targets}) != len(targets):
+            QMessageBox.warning(self, "Import", "Each table column can only be mapped once.")
+            return
+        super().accept()
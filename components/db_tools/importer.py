@@ -0,0 +1,266 @@
+import csv
+import io
+import itertools
+import json
+import os
+import re
+import sqlite3
+import time
+import traceback
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .sqlite_utils import open_connection, quote_ident
+
+IMPORT_FORMATS = {"csv": "CSV (*.csv *.tsv *.txt)", "jsonl": "JSON Lines (*.jsonl *.ndjson)"}
+
+def detect_format(path):
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+class _Source:
+    """
+    Streams records from a CSV or JSONL file. raw.tell() on the
+    underlying binary file gives the bytes consumed so far (for progress)
+    without holding more than the read buffer in memory.
+    """
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self.size = os.path.getsize(path)
+        self.raw = open(path, "rb")
+        self.text = io.TextIOWrapper(self.raw, encoding="utf-8-sig", newline="")
+        self.columns = []
+        self._first = None
+        self._line = 0  # JSONL line number of self._first
+
+        if fmt == "csv":
+            head = self.text.read(64 * 1024)
+            self.text.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(head.split("\n", 1)[0], delimiters=",;\t|").delimiter
+            except csv.Error:
+                delimiter = ","
+            self._reader = csv.reader(self.text, delimiter=delimiter)
+            self.columns = _clean_columns(next(self._reader, []))
+        elif fmt == "jsonl":
+            # Columns come from the first object; keys that only appear later are ignored
+            for self._line, line in enumerate(self.text, start=1):
+                if line.strip():
+                    self._first = json.loads(line)
+                    break
+            if not isinstance(self._first, dict):
+                raise ValueError("JSONL import expects one object per line.")
+            self._keys = list(self._first)
+            self.columns = _clean_columns(self._keys)
+        else:
+            raise ValueError(f"Unknown import format: {fmt}")
+
+    def rows(self):
+        """Yields one tuple per record, in self.columns order (missing values are None)."""
+        width = len(self.columns)
+        if self.fmt == "csv":
+            for row in self._reader:
+                if not row: continue
+                if len(row) != width:
+                    row = (row + [None] * width)[:width]
+                yield tuple(None if v == "" else v for v in row)
+        else:
+            keys = self._keys
+            def convert(value):
+                if isinstance(value, (dict, list)): return json.dumps(value, ensure_ascii=False)
+                return int(value) if isinstance(value, bool) else value
+            yield tuple(convert(self._first.get(k)) for k in keys)
+            for n, line in enumerate(self.text, start=self._line + 1):
+                if not line.strip(): continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"line {n}: expected a JSON object")
+                yield tuple(convert(record.get(k)) for k in keys)
+
+    def position(self):
+        return self.raw.tell()
+
+    def close(self):
+        self.text.close()
+
+def _clean_columns(names):
+    """Non-empty, unique column names from a header row."""
+    columns, seen = [], set()
+    for i, name in enumerate(names):
+        name = str(name).strip() or f"column_{i + 1}"
+        base, n = name, 2
+        while name.lower() in seen:
+            name = f"{base}_{n}"
+            n += 1
+        seen.add(name.lower())
+        columns.append(name)
+    return columns
+
+# Numbers as SQLite's type affinity will store them; "007" stays TEXT so leading zeros survive
+_RE_INTEGER = re.compile(r"^[+-]?(?:0|[1-9][0-9]*)$")
+_RE_REAL = re.compile(r"^[+-]?(?:(?:0|[1-9][0-9]*)(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?$")
+
+def _value_type(value):
+    if value is None: return None
+    if isinstance(value, int): return "INTEGER"
+    if isinstance(value, float): return "REAL"
+    if _RE_INTEGER.match(value): return "INTEGER"
+    if _RE_REAL.match(value): return "REAL"
+    return "TEXT"
+
+def infer_types(rows, width):
+    """
+    Column types for CREATE TABLE from sample rows: INTEGER if every
+    non-NULL value is an integer, REAL if every value is a number, else
+    TEXT (also for columns that are NULL throughout the sample).
+    """
+    rank = {None: 0, "INTEGER": 1, "REAL": 2, "TEXT": 3}
+    types = [None] * width
+    for row in rows:
+        for i, value in enumerate(row):
+            if types[i] == "TEXT": continue
+            kind = _value_type(value)
+            if rank[kind] > rank[types[i]]: types[i] = kind
+    return [t or "TEXT" for t in types]
+
+def preview_file(path, fmt=None, sample_size=1000):
+    """Reads the header and up to sample_size rows: {"format", "columns", "types", "sample", "size"}."""
+    fmt = fmt or detect_format(path)
+    source = _Source(path, fmt)
+    try:
+        sample = list(itertools.islice(source.rows(), sample_size))
+    finally:
+        source.close()
+    return {
+        "format": fmt,
+        "columns": source.columns,
+        "types": infer_types(sample, len(source.columns)),
+        "sample": sample,
+        "size": source.size,
+    }
+
+def import_file(conn, path, table, mapping, types=None, fmt=None, create=False, defer_indexes=False,
+                batch_size=10000, progress=None, should_stop=None):
+    """
+    Streams a CSV/JSONL file into table in one transaction (a failure or
+    cancel leaves the table untouched).
+
+    mapping is {source column: table column}; unmapped source columns are
+    skipped. create=True creates the table from the mapped columns and
+    types (from preview_file). defer_indexes drops the table's own indexes
+    before loading and recreates them afterwards, which is faster than
+    updating them row by row. Rows are inserted with executemany in
+    batches of batch_size; progress(rows, bytes read, total bytes) is
+    called after each batch and should_stop() checked between batches.
+
+    Returns {"rows", "elapsed", "rows_per_sec", "indexes_rebuilt"}.
+    """
+    fmt = fmt or detect_format(path)
+    start = time.perf_counter()
+    source = _Source(path, fmt)
+    try:
+        picked = [i for i, name in enumerate(source.columns) if mapping.get(name)]
+        if not picked: raise ValueError("No source column is mapped to a table column.")
+        targets = [mapping[source.columns[i]] for i in picked]
+
+        col_sql = ", ".join(quote_ident(c) for c in targets)
+        marks = ", ".join("?" * len(targets))
+        insert_sql = f"INSERT INTO {quote_ident(table)} ({col_sql}) VALUES ({marks})"
+        if len(picked) == len(source.columns):
+            rows = source.rows()
+        else:
+            rows = (tuple(row[i] for i in picked) for row in source.rows())
+
+        count, rebuilt = 0, 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if create:
+                types = types or ["TEXT"] * len(source.columns)
+                defs = ", ".join(f"{quote_ident(mapping[source.columns[i]])} {types[i]}" for i in picked)
+                conn.execute(f"CREATE TABLE {quote_ident(table)} ({defs})")
+
+            indexes = []
+            if defer_indexes:
+                # Only explicit indexes; constraint indexes (sql IS NULL) can't be dropped
+                indexes = conn.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                    (table,)
+                ).fetchall()
+                for name, _ in indexes:
+                    conn.execute(f"DROP INDEX {quote_ident(name)}")
+
+            while not (should_stop and should_stop()):
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch: break
+                conn.executemany(insert_sql, batch)
+                count += len(batch)
+                if progress: progress(count, source.position(), source.size)
+
+            if should_stop and should_stop():
+                raise InterruptedError("Import cancelled.")
+            for _, sql in indexes:
+                conn.execute(sql)
+                rebuilt += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        source.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": count,
+        "elapsed": elapsed,
+        "rows_per_sec": count / elapsed if elapsed > 0 else 0,
+        "indexes_rebuilt": rebuilt,
+    }
+
+class ImportWorker(QThread):
+    """Runs import_file() on its own connection. cancel() stops between batches or mid-statement."""
+    progress = pyqtSignal(int, int, int)  # rows, bytes read, total bytes
+    importFinished = pyqtSignal(dict)     # import_file() stats + {cancelled, error}
+
+    def __init__(self, db_path, path, table, mapping, parent=None, **options):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.path = path
+        self.table = table
+        self.mapping = mapping
+        self.options = options
+        self._conn = None
+        self._cancelled = False
+
+    def run(self):
+        stats = {"rows": 0, "elapsed": 0.0, "rows_per_sec": 0, "indexes_rebuilt": 0,
+                 "cancelled": False, "error": None}
+        def on_progress(rows, done, total):
+            stats["rows"] = rows
+            self.progress.emit(rows, done, total)
+
+        start = time.perf_counter()
+        try:
+            self._conn = open_connection(self.db_path, check_same_thread=False)
+            stats.update(import_file(
+                self._conn, self.path, self.table, self.mapping,
+                progress=on_progress, should_stop=lambda: self._cancelled, **self.options
+            ))
+        except (InterruptedError, sqlite3.OperationalError) as e:
+            if not self._cancelled: stats["error"] = str(e)
+        except (sqlite3.Error, OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+            stats["error"] = str(e)
+        except Exception as e:
+            # Anything else must still reach importFinished, or the editor waits forever
+            traceback.print_exc()
+            stats["error"] = str(e)
+        finally:
+            stats["cancelled"] = self._cancelled
+            stats["elapsed"] = stats["elapsed"] or time.perf_counter() - start
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.importFinished.emit(stats)
+
+    def cancel(self):
+        self._cancelled = True
+        conn = self._conn
+        if conn is not None: conn.interrupt()
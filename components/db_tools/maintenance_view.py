@@ -0,0 +1,202 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from components.styles import C_DANGER, C_SUCCESS, C_TEXT_MUTED
+from .storage import analyze_storage, run_maintenance, MAINTENANCE_ACTIONS
+from .tasks import ConnectionTask
+
+def _mib(size):
+    return f"{size / 1024 / 1024:.2f} MiB"
+
+class _NumberItem(QTableWidgetItem):
+    """Table item that sorts by a number while showing formatted text."""
+    def __init__(self, text, value):
+        super().__init__(text)
+        self.value = value
+        self.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+    def __lt__(self, other):
+        return self.value < getattr(other, "value", 0)
+
+class MaintenancePanel(QWidget):
+    """
+    Storage analyzer (dbstat + PRAGMAs) and maintenance jobs (VACUUM,
+    incremental vacuum, ANALYZE, optimize) that run in the background and
+    report before/after numbers.
+
+    confirm_rewrite is called before jobs that rewrite the file (VACUUM
+    renumbers rowids); returning False cancels the job.
+    """
+    databaseChanged = pyqtSignal()
+
+    # Fragmentation above this share of out-of-order pages is highlighted
+    FRAGMENTATION_WARN = 0.3
+
+    def __init__(self, parent=None, confirm_rewrite=None):
+        super().__init__(parent)
+        self.db_path = None
+        self.task = None
+        self.confirm_rewrite = confirm_rewrite
+
+        layout = QVBoxLayout(self)
+
+        self.lbl_summary = QLabel("No database.")
+        self.lbl_summary.setWordWrap(True)
+        layout.addWidget(self.lbl_summary)
+
+        self.table = QTableWidget(0, 7)
+        self.table.setHorizontalHeaderLabels(["Name", "Type", "Table", "Pages", "Size", "Unused", "Fragmentation"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        btn_row = QHBoxLayout()
+        self.btn_refresh = QPushButton("REFRESH")
+        self.btn_refresh.clicked.connect(self.refresh)
+        btn_row.addWidget(self.btn_refresh)
+        btn_row.addStretch()
+
+        self.action_buttons = []
+        tips = {
+            "analyze": "Refresh the query planner statistics",
+            "optimize": "Re-analyze only the tables where it is likely to help (cheap)",
+            "incremental_vacuum": "Return free pages to the OS without rebuilding the file",
+            "vacuum": "Rebuild the whole file: drops free pages and defragments tables and indexes",
+        }
+        for action in ("analyze", "optimize", "incremental_vacuum", "vacuum"):
+            btn = QPushButton(MAINTENANCE_ACTIONS[action])
+            btn.setToolTip(tips[action])
+            btn.clicked.connect(lambda _, a=action: self.run_action(a))
+            btn_row.addWidget(btn)
+            self.action_buttons.append(btn)
+
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel)
+        btn_row.addWidget(self.btn_cancel)
+        layout.addLayout(btn_row)
+
+        self.lbl_result = QLabel("")
+        self.lbl_result.setWordWrap(True)
+        self.lbl_result.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        layout.addWidget(self.lbl_result)
+
+    def set_database(self, db_path):
+        self.cancel()
+        self.db_path = db_path
+        self.table.setRowCount(0)
+        self.lbl_summary.setText("Press REFRESH to analyze the database." if db_path else "No database.")
+        self.lbl_result.setText("")
+
+    # --- Background Jobs ---
+
+    def _start(self, fn, *args, on_done):
+        if self.task is not None or not self.db_path: return
+        self.task = ConnectionTask(self.db_path, fn, self.db_path, *args)
+        self.task.succeeded.connect(on_done)
+        self.task.failed.connect(self._on_failed)
+        self._set_busy(True)
+        self.task.start()
+
+    def _set_busy(self, busy):
+        self.btn_refresh.setEnabled(not busy)
+        for btn in self.action_buttons: btn.setEnabled(not busy)
+        self.btn_cancel.setEnabled(busy)
+
+    def _finish(self):
+        self.task.wait()
+        self.task = None
+        self._set_busy(False)
+
+    def cancel(self):
+        """Interrupts a running job and waits for it (also used on DB switch / tab close)."""
+        if self.task is None: return
+        self.task.succeeded.disconnect()
+        self.task.failed.disconnect()
+        self.task.cancel()
+        self._finish()
+        self._set_result("Cancelled.")
+
+    def _on_failed(self, error):
+        self._finish()
+        self._set_result(f"Failed: {error}", C_DANGER)
+
+    # --- Analysis ---
+
+    def _set_result(self, text, color=C_TEXT_MUTED):
+        self.lbl_result.setText(text)
+        self.lbl_result.setStyleSheet(f"color: {color}; font-size: 11px;")
+
+    def refresh(self):
+        self._set_result("Analyzing...")
+        self._start(analyze_storage, on_done=self._on_analyzed)
+
+    def _on_analyzed(self, result):
+        self._finish()
+        if self.lbl_result.text() == "Analyzing...": self._set_result("")
+        self.show_summary(result["summary"])
+        self.show_objects(result["objects"])
+
+    def show_summary(self, s):
+        free_pct = s["freelist_count"] / s["page_count"] * 100 if s["page_count"] else 0
+        self.lbl_summary.setText(
+            f"File: {_mib(s['file_size'])} (+ WAL {_mib(s['wal_size'])}) | "
+            f"{s['page_count']:,} pages of {s['page_size']:,} bytes | "
+            f"Free: {s['freelist_count']:,} pages ({_mib(s['free_bytes'])}, {free_pct:.1f}%) | "
+            f"Auto-vacuum: {s['auto_vacuum']} | Journal: {s['journal_mode'].upper()}"
+        )
+
+    def show_objects(self, objects):
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        if objects is None:
+            self.lbl_summary.setText(self.lbl_summary.text() +
+                                     "\nThis SQLite build has no dbstat table: per-table sizes are unavailable.")
+            self.table.setSortingEnabled(True)
+            return
+
+        self.table.setRowCount(len(objects))
+        for row, obj in enumerate(objects):
+            unused_pct = obj["unused"] / obj["size"] * 100 if obj["size"] else 0
+            items = [
+                QTableWidgetItem(obj["name"]),
+                QTableWidgetItem(obj["type"]),
+                QTableWidgetItem(obj["table"]),
+                _NumberItem(f"{obj['pages']:,}", obj["pages"]),
+                _NumberItem(_mib(obj["size"]), obj["size"]),
+                _NumberItem(f"{unused_pct:.1f}%", unused_pct),
+                _NumberItem(f"{obj['fragmentation'] * 100:.1f}%", obj["fragmentation"]),
+            ]
+            if obj["pages"] > 10 and obj["fragmentation"] > self.FRAGMENTATION_WARN:
+                items[6].setForeground(QColor(C_DANGER))
+            for col, item in enumerate(items):
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(4, Qt.SortOrder.DescendingOrder)
+
+    # --- Maintenance ---
+
+    def run_action(self, action):
+        if action in ("vacuum", "incremental_vacuum"):
+            if self.confirm_rewrite and not self.confirm_rewrite(): return
+        self._set_result(f"Running {MAINTENANCE_ACTIONS[action]}...")
+        self._start(run_maintenance, action, on_done=self._on_maintenance_done)
+
+    def _on_maintenance_done(self, result):
+        self._finish()
+        before, after = result["before"], result["after"]
+        saved = before["file_size"] - after["file_size"]
+        self._set_result(
+            f"{MAINTENANCE_ACTIONS[result['action']]} finished in {result['elapsed']:.2f} s | "
+            f"File: {_mib(before['file_size'])} -> {_mib(after['file_size'])} | "
+            f"Free pages: {before['freelist_count']:,} -> {after['freelist_count']:,}",
+            C_SUCCESS if saved > 0 else C_TEXT_MUTED
+        )
+        self.databaseChanged.emit()
+        # Re-read the per-table numbers; the result line stays
+        self._start(analyze_storage, on_done=self._on_analyzed)
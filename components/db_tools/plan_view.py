@@ -0,0 +1,162 @@
+import sqlite3
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTreeWidget, QTreeWidgetItem, QListWidget, QListWidgetItem,
+                             QSplitter, QMessageBox)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from components.styles import C_DANGER, C_SUCCESS, C_TEXT_MUTED
+from .query_plan import explain, build_plan_tree, suggest_indexes, index_experiment
+from .tasks import ConnectionTask
+
+class QueryPlanPanel(QWidget):
+    """
+    EXPLAIN QUERY PLAN as a tree, with costly steps (full scans, automatic
+    indexes, temp B-trees) highlighted, plus candidate indexes that can be
+    created and measured (before/after timing) in the background.
+    """
+    schemaChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.conn = None
+        self.db_path = None
+        self.attached = {}
+        self.sql = ""
+        self.task = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Plan Step", "Note"])
+        self.tree.setColumnWidth(0, 420)
+        splitter.addWidget(self.tree)
+
+        advisor = QWidget()
+        adv_layout = QVBoxLayout(advisor)
+        adv_layout.setContentsMargins(0, 0, 0, 0)
+        adv_layout.addWidget(QLabel("SUGGESTED INDEXES:"))
+        self.list_suggestions = QListWidget()
+        self.list_suggestions.currentRowChanged.connect(lambda row: self.btn_create.setEnabled(row >= 0 and self.task is None))
+        adv_layout.addWidget(self.list_suggestions)
+
+        btn_row = QHBoxLayout()
+        self.btn_create = QPushButton("CREATE INDEX & RE-TIME")
+        self.btn_create.setEnabled(False)
+        self.btn_create.clicked.connect(self.create_selected_index)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel)
+        btn_row.addWidget(self.btn_create, 1)
+        btn_row.addWidget(self.btn_cancel)
+        adv_layout.addLayout(btn_row)
+
+        self.lbl_timing = QLabel("")
+        self.lbl_timing.setWordWrap(True)
+        self.lbl_timing.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        adv_layout.addWidget(self.lbl_timing)
+        splitter.addWidget(advisor)
+        splitter.setSizes([600, 400])
+
+        layout.addWidget(splitter)
+
+    def set_connection(self, conn, db_path, attached=None):
+        self.cancel()
+        self.conn = conn
+        self.db_path = db_path
+        self.attached = attached if attached is not None else {}
+        self.tree.clear()
+        self.list_suggestions.clear()
+        self.lbl_timing.setText("")
+
+    def explain_query(self, sql):
+        """Shows the plan for sql. Returns False (after warning) if SQLite rejects the statement."""
+        self.sql = sql
+        self.tree.clear()
+        self.list_suggestions.clear()
+        self.lbl_timing.setText("")
+        self.lbl_timing.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        if self.conn is None or not sql: return False
+
+        try:
+            rows = explain(self.conn, sql)
+            suggestions = suggest_indexes(self.conn, sql, rows)
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Explain", f"Could not explain query:\n{e}")
+            return False
+
+        self._fill_tree(build_plan_tree(rows))
+        for suggestion in suggestions:
+            item = QListWidgetItem(f"{suggestion['sql']}\n   ({suggestion['reason']})")
+            item.setData(Qt.ItemDataRole.UserRole, suggestion["sql"])
+            self.list_suggestions.addItem(item)
+        if not suggestions:
+            self.lbl_timing.setText("No index suggestions for this query.")
+        return True
+
+    def _fill_tree(self, nodes, parent=None):
+        for node in nodes:
+            item = QTreeWidgetItem([node["detail"], node["warning"] or ""])
+            if node["warning"]:
+                item.setForeground(0, QColor(C_DANGER))
+                item.setForeground(1, QColor(C_DANGER))
+            if parent is None: self.tree.addTopLevelItem(item)
+            else: parent.addChild(item)
+            self._fill_tree(node["children"], item)
+        if parent is None: self.tree.expandAll()
+
+    def create_selected_index(self):
+        item = self.list_suggestions.currentItem()
+        if item is None or self.task is not None: return
+        create_sql = item.data(Qt.ItemDataRole.UserRole)
+
+        reply = QMessageBox.question(
+            self, "Create Index",
+            f"This will create an index in the database and run the query a few times "
+            f"(inside a rolled-back transaction) to compare timings:\n\n{create_sql}\n\nContinue?"
+        )
+        if reply != QMessageBox.StandardButton.Yes: return
+
+        self.task = ConnectionTask(self.db_path, index_experiment, self.sql, create_sql,
+                                   attached=self.attached)
+        self.task.succeeded.connect(self._on_experiment_done)
+        self.task.failed.connect(self._on_experiment_failed)
+        self.btn_create.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.lbl_timing.setText("Timing query, creating index...")
+        self.task.start()
+
+    def _finish_task(self):
+        self.task.wait()
+        self.task = None
+        self.btn_cancel.setEnabled(False)
+        self.btn_create.setEnabled(self.list_suggestions.currentRow() >= 0)
+
+    def _on_experiment_done(self, result):
+        self._finish_task()
+        self.schemaChanged.emit()
+        # Show the new plan and the suggestions that are still open
+        self.explain_query(self.sql)
+
+        before, after = result["before_ms"], result["after_ms"]
+        speedup = before / after if after > 0 else float("inf")
+        self.lbl_timing.setText(f"Before: {before:.2f} ms -> After: {after:.2f} ms ({speedup:.1f}x)")
+        self.lbl_timing.setStyleSheet(f"color: {C_SUCCESS if after < before else C_DANGER}; font-size: 11px;")
+
+    def _on_experiment_failed(self, error):
+        self._finish_task()
+        self.lbl_timing.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        self.lbl_timing.setText(f"Index experiment failed: {error}")
+
+    def cancel(self):
+        """Interrupts a running experiment and waits for it (also used on DB switch / tab close)."""
+        if self.task is None: return
+        self.task.succeeded.disconnect(self._on_experiment_done)
+        self.task.failed.disconnect(self._on_experiment_failed)
+        self.task.cancel()
+        self._finish_task()
+        self.lbl_timing.setText("Cancelled.")
+        self.schemaChanged.emit()  # The index may already exist
@@ -0,0 +1,185 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+class QueryHistory:
+    """
+    The DB editor's query history and library, kept in the app's own SQLite
+    file (never in the database being inspected) and keyed by the absolute
+    path of the edited database.
+
+    Layout:
+        queries:     one row per (database, SQL text); named rows form that database's library
+        query_runs:  timing and row count of the latest RUNS_KEEP runs of each query
+
+    Unnamed queries beyond HISTORY_KEEP per database (least recently run
+    first) are dropped. Connections are opened per thread on first use, so
+    an instance can be driven from AsyncDB's worker.
+    """
+    HISTORY_KEEP = 500
+    RUNS_KEEP = 100
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            folder = os.path.dirname(self.path)
+            if folder: os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                with self._transaction(conn):
+                    self._create_schema(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # SQLite may already have rolled back (e.g. SQLITE_FULL): don't mask the error
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            raise
+
+    def _create_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS queries (
+                id INTEGER PRIMARY KEY,
+                db_path TEXT NOT NULL,       -- Absolute path of the edited database
+                sql TEXT NOT NULL,
+                name TEXT,                   -- Set for queries saved to the library
+                run_count INTEGER NOT NULL DEFAULT 0,
+                error_count INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_run_at TIMESTAMP,
+                UNIQUE (db_path, sql),
+                UNIQUE (db_path, name)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_runs (
+                id INTEGER PRIMARY KEY,
+                query_id INTEGER NOT NULL REFERENCES queries(id) ON DELETE CASCADE,
+                ran_at TIMESTAMP NOT NULL,
+                elapsed_ms REAL NOT NULL,
+                rows INTEGER NOT NULL DEFAULT 0,   -- Rows returned, or rows changed by DML
+                error TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_query_runs_query ON query_runs(query_id, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_queries_last_run ON queries(db_path, last_run_at)")
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def close(self):
+        """Closes the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None: conn.close()
+
+    @staticmethod
+    def _key(db_path):
+        return os.path.abspath(db_path)
+
+    def record_run(self, db_path, sql, elapsed_ms, rows, error=None):
+        """
+        Adds one run of sql against db_path (creating its history entry on the
+        first run) and prunes old runs and old unnamed queries. Returns the query id.
+        """
+        conn = self._connection()
+        db_path = self._key(db_path)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        failed = 1 if error else 0
+        with self._transaction(conn):
+            conn.execute("""
+                INSERT INTO queries (db_path, sql, run_count, error_count, last_run_at) VALUES (?1, ?2, 1, ?3, ?4)
+                ON CONFLICT(db_path, sql) DO UPDATE SET run_count = run_count + 1,
+                    error_count = error_count + ?3, last_run_at = ?4
+            """, (db_path, sql, failed, now))
+            query_id = conn.execute("SELECT id FROM queries WHERE db_path = ? AND sql = ?",
+                                    (db_path, sql)).fetchone()[0]
+            conn.execute("""
+                INSERT INTO query_runs (query_id, ran_at, elapsed_ms, rows, error) VALUES (?, ?, ?, ?, ?)
+            """, (query_id, now, elapsed_ms, rows, error))
+            conn.execute("""
+                DELETE FROM query_runs WHERE query_id = ?1 AND id <= (
+                    SELECT id FROM query_runs WHERE query_id = ?1 ORDER BY id DESC LIMIT 1 OFFSET ?2
+                )
+            """, (query_id, self.RUNS_KEEP))
+            conn.execute("""
+                DELETE FROM queries WHERE db_path = ?1 AND name IS NULL AND id NOT IN (
+                    SELECT id FROM queries WHERE db_path = ?1 AND name IS NULL
+                    ORDER BY last_run_at DESC, id DESC LIMIT ?2
+                )
+            """, (db_path, self.HISTORY_KEEP))
+        return query_id
+
+    def list_queries(self, db_path, named_only=False, limit=None):
+        """
+        History (or only the library) of db_path with timing stats, most recently
+        run first. Rows: id, sql, name, run_count, error_count, last_run_at, and
+        over the kept successful runs: runs, mean_ms, p95_ms (nearest rank),
+        mean_rows; plus last_ms, last_rows, last_error of the newest run.
+        """
+        return self._connection().execute(f"""
+            WITH mine AS (
+                SELECT * FROM queries WHERE db_path = ?1 {"AND name IS NOT NULL" if named_only else ""}
+            ), ranked AS (
+                SELECT r.query_id, r.elapsed_ms, r.rows,
+                       ROW_NUMBER() OVER (PARTITION BY r.query_id ORDER BY r.elapsed_ms) AS rk,
+                       COUNT(*) OVER (PARTITION BY r.query_id) AS n
+                FROM query_runs r JOIN mine q ON q.id = r.query_id
+                WHERE r.error IS NULL
+            ), stats AS (
+                SELECT query_id, COUNT(*) AS runs, AVG(elapsed_ms) AS mean_ms, AVG(rows) AS mean_rows,
+                       MIN(CASE WHEN rk * 100 >= 95 * n THEN elapsed_ms END) AS p95_ms
+                FROM ranked GROUP BY query_id
+            )
+            SELECT q.id, q.sql, q.name, q.run_count, q.error_count, q.last_run_at,
+                   COALESCE(s.runs, 0) AS runs, s.mean_ms, s.p95_ms, s.mean_rows,
+                   r.elapsed_ms AS last_ms, r.rows AS last_rows, r.error AS last_error
+            FROM mine q
+            LEFT JOIN stats s ON s.query_id = q.id
+            LEFT JOIN query_runs r ON r.id = (SELECT MAX(id) FROM query_runs WHERE query_id = q.id)
+            ORDER BY q.last_run_at IS NULL, q.last_run_at DESC, q.id DESC
+            LIMIT ?2
+        """, (self._key(db_path), limit if limit is not None else -1)).fetchall()
+
+    def save_query(self, db_path, sql, name):
+        """
+        Adds sql to db_path's library under name (a query that already had
+        that name goes back to plain history). Returns the query id.
+        """
+        conn = self._connection()
+        db_path = self._key(db_path)
+        with self._transaction(conn):
+            conn.execute("UPDATE queries SET name = NULL WHERE db_path = ? AND name = ? AND sql != ?",
+                         (db_path, name, sql))
+            conn.execute("""
+                INSERT INTO queries (db_path, sql, name) VALUES (?, ?, ?)
+                ON CONFLICT(db_path, sql) DO UPDATE SET name = excluded.name
+            """, (db_path, sql, name))
+            return conn.execute("SELECT id FROM queries WHERE db_path = ? AND sql = ?",
+                                (db_path, sql)).fetchone()[0]
+
+    def unname_query(self, query_id):
+        """Removes a query from the library; it stays in the history."""
+        self._connection().execute("UPDATE queries SET name = NULL WHERE id = ?", (query_id,))
+
+    def delete_query(self, query_id):
+        self._connection().execute("DELETE FROM queries WHERE id = ?", (query_id,))
+
+    def clear_history(self, db_path):
+        """Deletes db_path's queries that are not in its library (library entries keep their stats)."""
+        self._connection().execute("DELETE FROM queries WHERE db_path = ? AND name IS NULL", (self._key(db_path),))
@@ -0,0 +1,175 @@
+import re
+import time
+
+from .sqlite_utils import quote_ident
+
+# EXPLAIN QUERY PLAN detail patterns (SQLite >= 3.36 drops the TABLE keyword; older builds keep it)
+_RE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\S+)(?: AS (\S+))?(.*)$")
+_RE_AUTO_INDEX = re.compile(r"^SEARCH (?:TABLE )?(\S+)(?: AS (\S+))? USING AUTOMATIC (?:COVERING |PARTIAL )*INDEX")
+_RE_TEMP_BTREE = re.compile(r"USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT|RIGHT PART OF ORDER BY)")
+
+_RE_COMPARE = re.compile(
+    r'(?:(\w+)\.)?("(?:[^"]|"")+"|\w+)\s*(==|=|<>|!=|<=|>=|<|>|\bIN\b|\bIS\b|\bBETWEEN\b)', re.IGNORECASE
+)
+_RE_COMPARE_RIGHT = re.compile(r'(?:==|=)\s*(?:(\w+)\.)?("(?:[^"]|"")+"|\w+)', re.IGNORECASE)
+_RE_ORDER = re.compile(r'\b(ORDER|GROUP)\s+BY\s+(.+?)(?=\bLIMIT\b|\bHAVING\b|\bORDER\b|\)|;|$)',
+                       re.IGNORECASE | re.DOTALL)
+
+_NOT_ALIASES = {"where", "join", "on", "left", "right", "inner", "outer", "cross", "natural", "full",
+                "order", "group", "limit", "using", "set", "union", "except", "intersect", "having", "window"}
+# The lookahead keeps a following keyword (FROM t JOIN u) from being read as t's alias,
+# so the JOIN stays available for the next match
+_RE_SOURCE = re.compile(
+    r'\b(?:FROM|JOIN)\s+("(?:[^"]|"")+"|\w+)'
+    rf'(?:\s+(?:AS\s+)?(?!(?:{"|".join(sorted(_NOT_ALIASES))})\b)(\w+))?',
+    re.IGNORECASE
+)
+_EQUALITY_OPS = {"=", "==", "in", "is"}
+
+def explain(conn, sql):
+    """Returns the EXPLAIN QUERY PLAN rows as [(id, parent, detail)]."""
+    return [(row[0], row[1], row[3]) for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+def plan_warning(detail):
+    """A short reason if this plan step is a likely cost (full scan, temp B-tree...), else None."""
+    scan = _RE_SCAN.match(detail)
+    if scan and "USING" not in scan.group(3) and not scan.group(1).startswith(("CONSTANT", "(")):
+        return "Full table scan"
+    if _RE_AUTO_INDEX.match(detail):
+        return "Automatic index rebuilt on every run"
+    temp = _RE_TEMP_BTREE.search(detail)
+    if temp:
+        return f"Temporary B-tree for {temp.group(1)}"
+    return None
+
+def build_plan_tree(rows):
+    """Nests plan rows by parent id: [{"id", "detail", "warning", "children"}]."""
+    nodes = {row_id: {"id": row_id, "detail": detail, "warning": plan_warning(detail), "children": []}
+             for row_id, _, detail in rows}
+    roots = []
+    for row_id, parent, _ in rows:
+        (nodes[parent]["children"] if parent in nodes else roots).append(nodes[row_id])
+    return roots
+
+def _unquote(name):
+    return name[1:-1].replace('""', '"') if name.startswith('"') else name
+
+def _table_sources(conn, sql):
+    """{alias (or table name if unaliased): table} for the tables referenced by FROM/JOIN."""
+    known = {row[0].lower(): row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    sources = {}
+    for table, alias in _RE_SOURCE.findall(sql):
+        table = known.get(_unquote(table).lower())
+        if not table: continue
+        sources[(alias or table).lower()] = table
+    return sources
+
+def _columns(conn, table):
+    return {row[1].lower(): row[1] for row in conn.execute(f"PRAGMA table_info({quote_ident(table)})")}
+
+def _indexed_prefixes(conn, table):
+    """Leading-column tuples of the table's existing indexes (lower case)."""
+    prefixes = []
+    for index in conn.execute(f"PRAGMA index_list({quote_ident(table)})").fetchall():
+        cols = [row[2] for row in conn.execute(f"PRAGMA index_info({quote_ident(index[1])})") if row[2]]
+        prefixes.append(tuple(c.lower() for c in cols))
+    return prefixes
+
+def suggest_indexes(conn, sql, plan_rows):
+    """
+    Heuristic index advisor: for every table the plan scans (or builds an
+    automatic index for), proposes an index on the columns the query
+    compares with equality, then one range column; for temp B-trees on a
+    single table, on the ORDER/GROUP BY columns. Existing indexes with the
+    same leading columns are skipped.
+    Returns [{"table", "columns", "reason", "sql"}].
+    """
+    sources = _table_sources(conn, sql)
+    flagged = {}  # source (alias or table) -> reason
+    for _, _, detail in plan_rows:
+        warning = plan_warning(detail)
+        if not warning: continue
+        match = _RE_SCAN.match(detail) or _RE_AUTO_INDEX.match(detail)
+        if match:
+            name = (match.group(2) or match.group(1)).lower()
+            if name in sources: flagged.setdefault(name, warning)
+        elif len(sources) == 1:
+            flagged.setdefault(next(iter(sources)), warning)
+    if not flagged: return []
+
+    columns = {source: _columns(conn, table) for source, table in sources.items()}
+
+    def resolve(qualifier, column):
+        """(source, column name) that a possibly unqualified column reference points at."""
+        column = _unquote(column).lower()
+        if qualifier:
+            source = qualifier.lower()
+            return (source, columns[source][column]) if column in columns.get(source, {}) else (None, None)
+        owners = [source for source, cols in columns.items() if column in cols]
+        return (owners[0], columns[owners[0]][column]) if len(owners) == 1 else (None, None)
+
+    equality, ranges, ordering = {}, {}, {}
+    def add(bucket, source, name):
+        if source and name not in bucket.setdefault(source, []): bucket[source].append(name)
+
+    for qualifier, column, op in _RE_COMPARE.findall(sql):
+        add(equality if op.lower() in _EQUALITY_OPS else ranges, *resolve(qualifier, column))
+    for qualifier, column in _RE_COMPARE_RIGHT.findall(sql):
+        add(equality, *resolve(qualifier, column))
+    for _, clause in _RE_ORDER.findall(sql):
+        for term in clause.split(","):
+            parts = term.strip().split()
+            if not parts: continue
+            qualifier, _, column = parts[0].rpartition(".")
+            add(ordering, *resolve(qualifier, column))
+
+    suggestions, seen = [], set()
+    for source, reason in flagged.items():
+        table = sources[source]
+        cols = list(equality.get(source, []))
+        cols += [c for c in ranges.get(source, []) if c not in cols][:1]
+        if not cols:
+            cols = ordering.get(source, [])  # Lets SQLite read in index order instead of sorting
+        if not cols: continue
+
+        lowered = tuple(c.lower() for c in cols)
+        if (table, lowered) in seen: continue
+        seen.add((table, lowered))
+        if any(prefix[:len(lowered)] == lowered for prefix in _indexed_prefixes(conn, table)): continue
+
+        index_name = "idx_" + "_".join([table] + cols)
+        col_sql = ", ".join(quote_ident(c) for c in cols)
+        suggestions.append({
+            "table": table,
+            "columns": cols,
+            "reason": reason,
+            "sql": f"CREATE INDEX IF NOT EXISTS {quote_ident(index_name)} ON {quote_ident(table)} ({col_sql})",
+        })
+    return suggestions
+
+def time_query(conn, sql, runs=3):
+    """
+    Best-of-N wall time (ms) to run sql and read every row. Runs inside a
+    transaction that is rolled back, so a statement that writes changes nothing.
+    """
+    best = None
+    for _ in range(runs):
+        conn.execute("BEGIN")
+        try:
+            start = time.perf_counter()
+            cursor = conn.execute(sql)
+            while cursor.fetchmany(1000): pass
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            conn.execute("ROLLBACK")
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def index_experiment(conn, sql, create_sql, runs=3):
+    """Times sql, creates the index, times again. Returns before/after timings and plans."""
+    before_plan = explain(conn, sql)
+    before = time_query(conn, sql, runs)
+    conn.execute(create_sql)
+    after_plan = explain(conn, sql)
+    after = time_query(conn, sql, runs)
+    return {"before_ms": before, "after_ms": after, "before_plan": before_plan, "after_plan": after_plan}
@@ -0,0 +1,128 @@
+import sqlite3
+import time
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from components.styles import C_TEXT_MUTED
+from .sqlite_utils import open_connection
+from .table_model import format_cell
+
+class QueryWorker(QThread):
+    """
+    Runs one SQL query on its own connection and streams the result rows
+    back in batches. cancel() interrupts SQLite mid-statement.
+
+    Work is measured with a progress handler called every PROGRESS_STEPS
+    SQLite VM instructions; Python's sqlite3 does not expose per-statement
+    scan counters, so "VM steps" stands in for rows scanned.
+    """
+    columnsReady = pyqtSignal(list)
+    rowsReady = pyqtSignal(list)
+    queryFinished = pyqtSignal(dict)  # {elapsed, rows, vm_steps, affected, cancelled, error, script}
+
+    BATCH_SIZE = 500
+    MAX_ROWS = 100_000      # Rows handed to the view; later rows are counted only
+    PROGRESS_STEPS = 1000
+
+    def __init__(self, db_path, sql, params=(), attached=None, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.attached = dict(attached or {})  # {alias: path}, ATTACHed so queries can span files
+        self.sql = sql
+        self.params = params
+        self._conn = None
+        self._cancelled = False
+        self._vm_calls = 0
+
+    def _on_progress(self):
+        self._vm_calls += 1
+        return 1 if self._cancelled else 0  # Non-zero aborts the statement
+
+    def run(self):
+        stats = {"elapsed": 0.0, "rows": 0, "vm_steps": 0, "affected": -1,
+                 "cancelled": False, "error": None, "script": False}
+        start = time.perf_counter()
+        try:
+            self._conn = open_connection(self.db_path, check_same_thread=False, attached=self.attached)
+            self._conn.set_progress_handler(self._on_progress, self.PROGRESS_STEPS)
+            try:
+                cursor = self._conn.execute(self.sql, self.params)
+            except sqlite3.ProgrammingError as e:
+                # Several statements: run them as a script (no result rows)
+                if "one statement" not in str(e): raise
+                self._conn.executescript(self.sql)
+                stats["script"] = True
+                cursor = None
+
+            if cursor is not None and cursor.description:
+                self.columnsReady.emit([d[0] for d in cursor.description])
+                while not self._cancelled:
+                    batch = cursor.fetchmany(self.BATCH_SIZE)
+                    if not batch: break
+                    if stats["rows"] < self.MAX_ROWS:
+                        self.rowsReady.emit(batch[:self.MAX_ROWS - stats["rows"]])
+                    stats["rows"] += len(batch)
+            elif cursor is not None:
+                stats["affected"] = cursor.rowcount
+        except sqlite3.OperationalError as e:
+            if self._cancelled or "interrupted" in str(e):
+                stats["cancelled"] = True
+            else:
+                stats["error"] = str(e)
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        finally:
+            stats["cancelled"] = stats["cancelled"] or self._cancelled
+            stats["elapsed"] = time.perf_counter() - start
+            stats["vm_steps"] = self._vm_calls * self.PROGRESS_STEPS
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.queryFinished.emit(stats)
+
+    def cancel(self):
+        self._cancelled = True
+        conn = self._conn
+        if conn is not None: conn.interrupt()
+
+
+class QueryResultModel(QAbstractTableModel):
+    """Read-only model that grows as QueryWorker batches arrive."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = []
+        self.rows = []
+
+    def set_columns(self, columns):
+        self.beginResetModel()
+        self.columns = columns
+        self.rows = []
+        self.endResetModel()
+
+    def append_rows(self, batch):
+        if not batch: return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(batch) - 1)
+        self.rows.extend(batch)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole: return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section]
+        return section + 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        value = self.rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_cell(value)
+        if role == Qt.ItemDataRole.ForegroundRole and value is None:
+            return QColor(C_TEXT_MUTED)
+        return None
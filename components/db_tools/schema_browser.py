@@ -0,0 +1,160 @@
+import os
+import sqlite3
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTreeWidget, QTreeWidgetItem)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from components.styles import C_TEXT_MUTED
+from .sqlite_utils import sql_name
+
+class SchemaBrowser(QWidget):
+    """
+    Tree of every database open on the editor connection (main plus the
+    ATTACHed ones) with their tables, views and columns, read through a
+    SchemaCache: row estimates from sqlite_stat1 next to the tables, and
+    columns and indexes when a table is expanded.
+
+    Double-clicking an item emits nameActivated with the name to insert in
+    a query (attached tables are qualified: alias.table). Attaching and
+    detaching are left to the owner through attachRequested /
+    detachRequested(alias), since the owner holds the connection.
+    """
+    nameActivated = pyqtSignal(str)
+    attachRequested = pyqtSignal()
+    detachRequested = pyqtSignal(str)
+
+    ROLE_SCHEMA = Qt.ItemDataRole.UserRole
+    ROLE_TABLE = Qt.ItemDataRole.UserRole + 1
+    ROLE_COLUMN = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("DATABASES:"))
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderHidden(True)
+        self.tree.itemExpanded.connect(self._on_expanded)
+        self.tree.itemDoubleClicked.connect(self._on_double_clicked)
+        self.tree.currentItemChanged.connect(lambda *_: self._update_buttons())
+        layout.addWidget(self.tree)
+
+        btn_row = QHBoxLayout()
+        btn_attach = QPushButton("ATTACH...")
+        btn_attach.setToolTip("Open another database file on the same connection so queries can join across files")
+        btn_attach.clicked.connect(self.attachRequested.emit)
+        self.btn_detach = QPushButton("DETACH")
+        self.btn_detach.clicked.connect(self._detach_selected)
+        btn_refresh = QPushButton("Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_row.addWidget(btn_attach)
+        btn_row.addWidget(self.btn_detach)
+        btn_row.addStretch()
+        btn_row.addWidget(btn_refresh)
+        layout.addLayout(btn_row)
+
+        self._update_buttons()
+
+    def set_cache(self, cache):
+        self.cache = cache
+        self.refresh()
+
+    def _selected_schema(self):
+        item = self.tree.currentItem()
+        return item.data(0, self.ROLE_SCHEMA) if item is not None else None
+
+    def _update_buttons(self):
+        self.btn_detach.setEnabled(self._selected_schema() not in (None, "main"))
+
+    def _detach_selected(self):
+        schema = self._selected_schema()
+        if schema not in (None, "main"): self.detachRequested.emit(schema)
+
+    def refresh(self):
+        """Rebuilds the tree, keeping expanded databases and tables open."""
+        expanded, known = set(), set()
+        for i in range(self.tree.topLevelItemCount()):
+            db_item = self.tree.topLevelItem(i)
+            known.add(db_item.data(0, self.ROLE_SCHEMA))
+            if db_item.isExpanded(): expanded.add((db_item.data(0, self.ROLE_SCHEMA), None))
+            for j in range(db_item.childCount()):
+                child = db_item.child(j)
+                if child.isExpanded():
+                    expanded.add((child.data(0, self.ROLE_SCHEMA), child.data(0, self.ROLE_TABLE)))
+
+        self.tree.clear()
+        if self.cache is None:
+            self._update_buttons()
+            return
+        try:
+            databases = self.cache.databases()
+        except sqlite3.Error as e:
+            self.tree.addTopLevelItem(QTreeWidgetItem([f"Error: {e}"]))
+            return
+
+        for schema, file in databases:
+            label = f"{schema} ({os.path.basename(file)})" if file else f"{schema} (in memory)"
+            db_item = QTreeWidgetItem([label])
+            db_item.setToolTip(0, file)
+            db_item.setData(0, self.ROLE_SCHEMA, schema)
+            self.tree.addTopLevelItem(db_item)
+            try:
+                objects = self.cache.tables(schema)
+                estimates = self.cache.row_estimates(schema)
+            except sqlite3.Error as e:
+                db_item.addChild(QTreeWidgetItem([f"Error: {e}"]))
+                continue
+            for name, kind in objects:
+                label = name if kind == "table" else f"{name} (view)"
+                if name in estimates: label += f"  ~{estimates[name]:,} rows"
+                item = QTreeWidgetItem([label])
+                item.setData(0, self.ROLE_SCHEMA, schema)
+                item.setData(0, self.ROLE_TABLE, name)
+                # Columns are read on expand; the indicator shows before that
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+                db_item.addChild(item)
+                if (schema, name) in expanded: item.setExpanded(True)
+            # Newly attached databases open expanded
+            if (schema, None) in expanded or schema not in known: db_item.setExpanded(True)
+        self._update_buttons()
+
+    def _on_expanded(self, item):
+        table = item.data(0, self.ROLE_TABLE)
+        if table is None or item.childCount() or self.cache is None: return
+        schema = item.data(0, self.ROLE_SCHEMA)
+        try:
+            columns = self.cache.columns(schema, table)
+            indexes = self.cache.indexes(schema, table)
+        except sqlite3.Error as e:
+            item.addChild(QTreeWidgetItem([f"Error: {e}"]))
+            return
+        for name, decl_type, notnull, pk in columns:
+            extra = " PK" if pk else (" NOT NULL" if notnull else "")
+            child = QTreeWidgetItem([f"{name}  {decl_type}{extra}".rstrip()])
+            child.setForeground(0, QColor(C_TEXT_MUTED))
+            child.setData(0, self.ROLE_SCHEMA, schema)
+            child.setData(0, self.ROLE_COLUMN, name)
+            item.addChild(child)
+        for name, unique, cols in indexes:
+            child = QTreeWidgetItem([f"{'unique index' if unique else 'index'} {name} "
+                                     f"({', '.join(c or '<expr>' for c in cols)})"])
+            child.setForeground(0, QColor(C_TEXT_MUTED))
+            item.addChild(child)
+        if not columns:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator)
+
+    def _on_double_clicked(self, item, _column=0):
+        schema = item.data(0, self.ROLE_SCHEMA)
+        column = item.data(0, self.ROLE_COLUMN)
+        table = item.data(0, self.ROLE_TABLE)
+        if column is not None:
+            self.nameActivated.emit(sql_name(column))
+        elif table is not None:
+            name = sql_name(table)
+            self.nameActivated.emit(name if schema == "main" else f"{sql_name(schema)}.{name}")
+        elif schema is not None:
+            self.nameActivated.emit(sql_name(schema))
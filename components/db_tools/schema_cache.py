@@ -0,0 +1,100 @@
+import sqlite3
+
+from .sqlite_utils import quote_ident, list_databases
+
+class SchemaCache:
+    """
+    Schema metadata of one connection (main and every ATTACHed database),
+    read once and reused while the database's PRAGMA schema_version is
+    unchanged. Any DDL, from this connection or another process, bumps the
+    version, so a stale entry is re-read on the next lookup.
+
+    Columns and indexes are read per table on first use, so browsing a
+    schema with hundreds of tables costs one sqlite_master query. Row
+    estimates come from sqlite_stat1 (written by ANALYZE); a repeated
+    ANALYZE does not bump schema_version, so whoever runs it should call
+    invalidate().
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self._entries = {}  # {schema: {"version", "objects", "columns", "indexes", "estimates"}}
+        self._generation = 0
+
+    def databases(self):
+        """[(alias, file)], main first."""
+        return list_databases(self.conn)
+
+    def _entry(self, schema):
+        version = self.conn.execute(f"PRAGMA {quote_ident(schema)}.schema_version").fetchone()[0]
+        entry = self._entries.get(schema)
+        if entry is None or entry["version"] != version:
+            objects = self.conn.execute(f"""
+                SELECT name, type FROM {quote_ident(schema)}.sqlite_master
+                WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'
+                ORDER BY type, name
+            """).fetchall()
+            entry = {"version": version, "objects": objects, "columns": {}, "indexes": {}, "estimates": None}
+            self._entries[schema] = entry
+            self._generation += 1
+        return entry
+
+    def generation(self):
+        """
+        A number that changes whenever any cached schema was re-read or
+        dropped; checks every open database first. Lets derived data (the
+        completion index) rebuild only after DDL.
+        """
+        open_schemas = [name for name, _ in self.databases()]
+        for schema in list(self._entries):
+            if schema not in open_schemas: self.invalidate(schema)
+        for schema in open_schemas: self._entry(schema)
+        return self._generation
+
+    def tables(self, schema="main"):
+        """[(name, type)] of the tables and views in schema, tables first."""
+        return self._entry(schema)["objects"]
+
+    def columns(self, schema, table):
+        """[(name, declared type, notnull, pk)] of one table or view."""
+        entry = self._entry(schema)
+        cols = entry["columns"].get(table)
+        if cols is None:
+            cols = [(r[1], r[2], bool(r[3]), r[5]) for r in
+                    self.conn.execute(f"PRAGMA {quote_ident(schema)}.table_info({quote_ident(table)})")]
+            entry["columns"][table] = cols
+        return cols
+
+    def indexes(self, schema, table):
+        """[(name, unique, [columns])] of one table (expression columns show as None)."""
+        entry = self._entry(schema)
+        indexes = entry["indexes"].get(table)
+        if indexes is None:
+            q = quote_ident(schema)
+            indexes = []
+            for r in self.conn.execute(f"PRAGMA {q}.index_list({quote_ident(table)})"):
+                cols = [c[2] for c in self.conn.execute(f"PRAGMA {q}.index_info({quote_ident(r[1])})")]
+                indexes.append((r[1], bool(r[2]), cols))
+            entry["indexes"][table] = indexes
+        return indexes
+
+    def row_estimates(self, schema="main"):
+        """{table: approximate rows} from sqlite_stat1; empty until ANALYZE has run."""
+        entry = self._entry(schema)
+        if entry["estimates"] is None:
+            estimates = {}
+            try:
+                rows = self.conn.execute(f"SELECT tbl, stat FROM {quote_ident(schema)}.sqlite_stat1").fetchall()
+            except sqlite3.OperationalError:
+                rows = []  # No sqlite_stat1 yet
+            for table, stat in rows:
+                # The first number of every entry (table or index) is the row count
+                head = (stat or "").split(" ", 1)[0]
+                if head.isdigit(): estimates[table] = max(estimates.get(table, 0), int(head))
+            entry["estimates"] = estimates
+        return entry["estimates"]
+
+    def invalidate(self, schema=None):
+        """Drops one schema (e.g. after DETACH or ANALYZE) or everything."""
+        if schema is None: self._entries.clear()
+        else: self._entries.pop(schema, None)
+        self._generation += 1
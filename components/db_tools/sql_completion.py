@@ -0,0 +1,175 @@
+import bisect
+import re
+
+SQL_KEYWORDS = (
+    "ABORT", "ADD", "ALL", "ALTER", "ANALYZE", "AND", "AS", "ASC", "ATTACH", "AUTOINCREMENT",
+    "BEGIN", "BETWEEN", "BY", "CASE", "CAST", "CHECK", "COLLATE", "COLUMN", "COMMIT", "CONFLICT",
+    "CONSTRAINT", "CREATE", "CROSS", "CURRENT_DATE", "CURRENT_TIME", "CURRENT_TIMESTAMP", "DEFAULT",
+    "DEFERRED", "DELETE", "DESC", "DETACH", "DISTINCT", "DO", "DROP", "ELSE", "END", "ESCAPE",
+    "EXCEPT", "EXCLUSIVE", "EXISTS", "EXPLAIN", "FILTER", "FOREIGN", "FROM", "FULL", "GLOB",
+    "GROUP", "HAVING", "IF", "IGNORE", "IMMEDIATE", "IN", "INDEX", "INNER", "INSERT", "INSTEAD",
+    "INTERSECT", "INTO", "IS", "ISNULL", "JOIN", "KEY", "LEFT", "LIKE", "LIMIT", "MATCH",
+    "MATERIALIZED", "NATURAL", "NOT", "NOTHING", "NOTNULL", "NULL", "OFFSET", "ON", "OR", "ORDER",
+    "OUTER", "OVER", "PARTITION", "PRAGMA", "PRIMARY", "QUERY", "RECURSIVE", "REFERENCES",
+    "REINDEX", "RELEASE", "RENAME", "REPLACE", "RETURNING", "RIGHT", "ROLLBACK", "ROWID",
+    "SAVEPOINT", "SELECT", "SET", "STRICT", "TABLE", "TEMP", "THEN", "TO", "TRANSACTION",
+    "TRIGGER", "UNION", "UNIQUE", "UPDATE", "UPSERT", "USING", "VACUUM", "VALUES", "VIEW",
+    "VIRTUAL", "WHEN", "WHERE", "WINDOW", "WITH", "WITHOUT",
+)
+SQL_FUNCTIONS = (
+    "abs", "avg", "coalesce", "count", "date", "datetime", "group_concat", "hex", "ifnull", "instr",
+    "json", "json_extract", "json_each", "julianday", "length", "lower", "ltrim", "max", "min",
+    "nullif", "printf", "quote", "random", "replace", "round", "rtrim", "strftime", "substr",
+    "sum", "time", "total", "trim", "typeof", "unixepoch", "upper", "zeroblob",
+)
+_KEYWORD_SET = frozenset(SQL_KEYWORDS)
+
+_IDENT = r'(?:[A-Za-z_][A-Za-z0-9_$]*|"(?:[^"]|"")+")'
+_WORD_BEFORE = re.compile(r"[A-Za-z0-9_$]*$")
+_QUALIFIER = re.compile(rf"(?:({_IDENT})\s*\.\s*)?({_IDENT})\s*\.\s*$")
+_TABLE_CONTEXT = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO|TABLE)\s+$", re.IGNORECASE)
+_TABLE_REF = re.compile(
+    rf"\b(?:FROM|JOIN|UPDATE|INTO)\s+(?:({_IDENT})\s*\.\s*)?({_IDENT})(?:\s+(?:AS\s+)?({_IDENT}))?",
+    re.IGNORECASE
+)
+
+def _unquote(name):
+    if name and name.startswith('"'): return name[1:-1].replace('""', '"')
+    return name
+
+def _statement_at(text, pos):
+    """The statement around pos (split on ';', good enough for completion)."""
+    start = text.rfind(";", 0, pos) + 1
+    end = text.find(";", pos)
+    return text[start:end if end >= 0 else len(text)], pos - start
+
+class _SortedNames:
+    """Names sorted case-insensitively; prefix lookups are a bisect plus a short scan."""
+    def __init__(self, items):
+        items = sorted(((name.lower(), name, kind) for name, kind in items), key=lambda e: e[0])
+        self.keys = [e[0] for e in items]
+        self.items = [(e[1], e[2]) for e in items]
+
+    def matching(self, prefix, limit):
+        prefix = prefix.lower()
+        result = []
+        for i in range(bisect.bisect_left(self.keys, prefix), len(self.keys)):
+            if len(result) >= limit or not self.keys[i].startswith(prefix): break
+            result.append(self.items[i])
+        return result
+
+class CompletionIndex:
+    """
+    Completion candidates for the SQL editor, built from a SchemaCache.
+
+    Keywords, functions, databases, tables and views live in one sorted
+    list that is rebuilt only when the cache's generation changes (after
+    DDL); column lists are built per table on first use. A lookup is a
+    bisect into those lists, so it stays well under a millisecond on
+    schemas with hundreds of tables.
+
+    Context from the current statement: after FROM/JOIN/INTO/UPDATE only
+    tables are offered; after "x." the columns of table or alias x (or the
+    tables of attached database x); otherwise the columns of the tables the
+    statement references come first.
+    """
+    def __init__(self, cache):
+        self.cache = cache
+        self.table_names = frozenset()  # Lower-case, for the highlighter
+        self._generation = None
+        self._names = None
+        self._relations = None  # Tables, views and databases only (after FROM etc.)
+        self._tables = {}    # {lower name: (schema, name)}, main wins over attached
+        self._schemas = {}   # {lower alias: schema}
+        self._columns = {}   # {(schema, table): _SortedNames}
+
+    def refresh(self):
+        """Rebuilds the name list if the schema changed. Returns True if it did."""
+        generation = self.cache.generation()
+        if generation == self._generation: return False
+        items = [(kw, "keyword") for kw in SQL_KEYWORDS] + [(fn, "function") for fn in SQL_FUNCTIONS]
+        tables, schemas = {}, {}
+        for schema, _ in self.cache.databases():
+            schemas[schema.lower()] = schema
+            if schema != "main": items.append((schema, "database"))
+            for name, kind in self.cache.tables(schema):
+                items.append((name, kind))
+                tables.setdefault(name.lower(), (schema, name))
+        items = list(dict.fromkeys(items))  # Same table name in several databases: offer it once
+        self._names = _SortedNames(items)
+        self._relations = _SortedNames(i for i in items if i[1] in ("table", "view", "database"))
+        self._tables, self._schemas, self._columns = tables, schemas, {}
+        self.table_names = frozenset(tables)
+        self._generation = generation
+        return True
+
+    def _column_names(self, schema, table):
+        key = (schema, table)
+        names = self._columns.get(key)
+        if names is None:
+            names = _SortedNames((c[0], "column") for c in self.cache.columns(schema, table))
+            self._columns[key] = names
+        return names
+
+    def _resolve_table(self, schema, name):
+        """(schema, table) for a possibly qualified name, or None."""
+        if schema is not None:
+            schema = self._schemas.get(schema.lower())
+            if schema is None: return None
+            for table, _ in self.cache.tables(schema):
+                if table.lower() == name.lower(): return schema, table
+            return None
+        return self._tables.get(name.lower())
+
+    def _references(self, statement):
+        """{lower alias or table name: (schema, table)} for the tables a statement reads or writes."""
+        refs = {}
+        for schema, name, alias in _TABLE_REF.findall(statement):
+            target = self._resolve_table(_unquote(schema) or None, _unquote(name))
+            if target is None: continue
+            refs[_unquote(name).lower()] = target
+            if alias and alias.upper() not in _KEYWORD_SET: refs[_unquote(alias).lower()] = target
+        return refs
+
+    def complete(self, text, pos=None, limit=50):
+        """
+        Candidates for the word ending at pos: (prefix, qualified, [(name, kind)]).
+        qualified is True after "x." (an empty prefix then lists everything).
+        """
+        if pos is None: pos = len(text)
+        self.refresh()
+        statement, pos = _statement_at(text, pos)
+        before = statement[:pos]
+        prefix = _WORD_BEFORE.search(before).group()
+        head = before[:len(before) - len(prefix)]
+
+        qualifier = _QUALIFIER.search(head)
+        if qualifier:
+            outer, inner = _unquote(qualifier.group(1)), _unquote(qualifier.group(2))
+            if outer is None:
+                target = self._references(statement).get(inner.lower())
+                if target is None and inner.lower() in self._schemas:
+                    # attached_db. -> its tables
+                    schema = self._schemas[inner.lower()]
+                    return prefix, True, _SortedNames(self.cache.tables(schema)).matching(prefix, limit)
+                target = target or self._resolve_table(None, inner)
+            else:
+                target = self._resolve_table(outer, inner)
+            if target is None: return prefix, True, []
+            return prefix, True, self._column_names(*target).matching(prefix, limit)
+
+        if not prefix: return prefix, False, []
+        if _TABLE_CONTEXT.search(head):
+            return prefix, False, self._relations.matching(prefix, limit)
+
+        result, seen = [], set()
+        for target in set(self._references(statement).values()):
+            for item in self._column_names(*target).matching(prefix, limit):
+                if item[0] not in seen:
+                    seen.add(item[0])
+                    result.append(item)
+        for item in self._names.matching(prefix, limit):
+            if item[0] not in seen:
+                seen.add(item[0])
+                result.append(item)
+        return prefix, False, result[:limit]
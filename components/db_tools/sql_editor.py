@@ -0,0 +1,141 @@
+import re
+from PyQt6.QtWidgets import QTextEdit, QCompleter
+from PyQt6.QtCore import Qt, QStringListModel
+from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QTextCursor
+
+from components.styles import C_SECONDARY, C_SUCCESS, C_PRIMARY, C_TEXT_MUTED, C_TEXT_ACTIVE
+from .sql_completion import CompletionIndex, SQL_KEYWORDS, SQL_FUNCTIONS
+from .sqlite_utils import sql_name
+
+def _format(color, bold=False, italic=False):
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    if bold: fmt.setFontWeight(QFont.Weight.Bold)
+    if italic: fmt.setFontItalic(True)
+    return fmt
+
+class SqlHighlighter(QSyntaxHighlighter):
+    """Keywords, functions, known tables, numbers, strings and comments."""
+    _WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*")
+    _NUMBER = re.compile(r"\b\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+    _STRING = re.compile(r"'(?:[^']|'')*'?")
+    _LINE_COMMENT = re.compile(r"--[^\n]*")
+    IN_COMMENT = 1  # Block state: inside /* ... */
+
+    def __init__(self, document, index=None):
+        super().__init__(document)
+        self.index = index
+        self.keywords = frozenset(SQL_KEYWORDS)
+        self.functions = frozenset(SQL_FUNCTIONS)
+        self.fmt_keyword = _format(C_SECONDARY, bold=True)
+        self.fmt_function = _format(C_PRIMARY)
+        self.fmt_table = _format(C_TEXT_ACTIVE)
+        self.fmt_number = _format(C_PRIMARY)
+        self.fmt_string = _format(C_SUCCESS)
+        self.fmt_comment = _format(C_TEXT_MUTED, italic=True)
+
+    def highlightBlock(self, text):
+        tables = self.index.table_names if self.index is not None else ()
+        for m in self._WORD.finditer(text):
+            word = m.group()
+            if word.upper() in self.keywords: fmt = self.fmt_keyword
+            elif word.lower() in self.functions: fmt = self.fmt_function
+            elif word.lower() in tables: fmt = self.fmt_table
+            else: continue
+            self.setFormat(m.start(), m.end() - m.start(), fmt)
+        for m in self._NUMBER.finditer(text):
+            self.setFormat(m.start(), m.end() - m.start(), self.fmt_number)
+        # Strings and comments last: they win over anything inside them
+        for m in self._STRING.finditer(text):
+            self.setFormat(m.start(), m.end() - m.start(), self.fmt_string)
+        for m in self._LINE_COMMENT.finditer(text):
+            self.setFormat(m.start(), len(text) - m.start(), self.fmt_comment)
+
+        # Block comments can span lines
+        self.setCurrentBlockState(0)
+        in_comment = self.previousBlockState() == self.IN_COMMENT
+        start = 0 if in_comment else text.find("/*")
+        skip = 0 if in_comment else 2  # Past the opening "/*"
+        while start >= 0:
+            end = text.find("*/", start + skip)
+            if end < 0:
+                self.setCurrentBlockState(self.IN_COMMENT)
+                self.setFormat(start, len(text) - start, self.fmt_comment)
+                break
+            self.setFormat(start, end + 2 - start, self.fmt_comment)
+            start, skip = text.find("/*", end + 2), 2
+
+class SqlEditor(QTextEdit):
+    """
+    Plain-text SQL input with syntax highlighting and a completion popup
+    fed by CompletionIndex. The popup opens while typing a word (or after
+    "x.") and on Ctrl+Space; Enter/Tab accept, Escape closes it.
+    """
+    MIN_PREFIX = 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAcceptRichText(False)
+        self.setFont(QFont("Consolas", 10))
+        self.index = None
+        self._prefix = ""
+
+        self.highlighter = SqlHighlighter(self.document())
+
+        self.completer_model = QStringListModel(self)
+        self.completer = QCompleter(self.completer_model, self)
+        self.completer.setWidget(self)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.activated.connect(self.insert_completion)
+
+    def set_schema(self, cache):
+        """Completes against cache (a SchemaCache), or only keywords when None."""
+        self.index = CompletionIndex(cache) if cache is not None else None
+        self.highlighter.index = self.index
+        self.refresh_schema()
+
+    def refresh_schema(self):
+        """Re-reads names after DDL; re-highlights if the known tables changed."""
+        if self.index is None or self.index.refresh():
+            self.highlighter.rehighlight()
+
+    def insert_completion(self, text):
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.Left, QTextCursor.MoveMode.KeepAnchor, len(self._prefix))
+        cursor.insertText(text)
+        self.setTextCursor(cursor)
+
+    def keyPressEvent(self, event):
+        popup = self.completer.popup()
+        if popup.isVisible() and event.key() in (Qt.Key.Key_Enter, Qt.Key.Key_Return, Qt.Key.Key_Tab,
+                                                 Qt.Key.Key_Backtab, Qt.Key.Key_Escape):
+            event.ignore()  # The completer handles these
+            return
+
+        forced = (event.key() == Qt.Key.Key_Space and
+                  event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        if not forced: super().keyPressEvent(event)
+
+        typed = event.text()
+        if forced or (typed and (typed.isalnum() or typed in "_.$")) or \
+                (popup.isVisible() and event.key() == Qt.Key.Key_Backspace):
+            self.update_completions(forced)
+        elif popup.isVisible():
+            popup.hide()
+
+    def update_completions(self, forced=False):
+        if self.index is None:
+            self.completer.popup().hide()
+            return
+        prefix, qualified, items = self.index.complete(self.toPlainText(), self.textCursor().position())
+        if not items or (len(prefix) < self.MIN_PREFIX and not qualified and not forced):
+            self.completer.popup().hide()
+            return
+        self._prefix = prefix
+        self.completer_model.setStringList([sql_name(name) if kind != "keyword" else name for name, kind in items])
+        popup = self.completer.popup()
+        popup.setCurrentIndex(self.completer_model.index(0, 0))
+        rect = self.cursorRect()
+        rect.setWidth(popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width())
+        self.completer.complete(rect)
@@ -0,0 +1,87 @@
+import re
+import sqlite3
+from pathlib import Path
+
+from components.db_manager import DBManager
+
+def _ro_uri(path):
+    return Path(path).absolute().as_uri() + "?mode=ro"
+
+def open_connection(path, check_same_thread=True, read_only=False, attached=None):
+    """
+    Connection for editor/tool use: autocommit (transactions are explicit),
+    same busy timeout as DBManager so it waits politely for prompt saves.
+    read_only opens the file with mode=ro, so any write statement fails.
+    attached ({alias: path}) re-creates the editor's ATTACHed databases,
+    so background workers see the same schemas as the editor connection.
+    """
+    conn = sqlite3.connect(
+        _ro_uri(path) if read_only else path,
+        isolation_level=None,
+        timeout=DBManager.BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=check_same_thread,
+        uri=read_only,
+    )
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        for alias, other in (attached or {}).items():
+            attach_database(conn, other, alias, read_only)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+def attach_database(conn, path, alias, read_only=False):
+    """ATTACHes another database file under alias (its tables become alias.name)."""
+    # A read-only connection was opened with URI filenames enabled
+    conn.execute(f"ATTACH DATABASE ? AS {quote_ident(alias)}", (_ro_uri(path) if read_only else path,))
+
+def detach_database(conn, alias):
+    conn.execute(f"DETACH DATABASE {quote_ident(alias)}")
+
+def list_databases(conn):
+    """Returns [(alias, file)] for main and every ATTACHed database (temp is left out)."""
+    return [(name, file) for _, name, file in conn.execute("PRAGMA database_list") if name != "temp"]
+
+def suggest_alias(path, taken):
+    """A plain identifier from the file name that is not in taken (so queries need no quotes)."""
+    base = re.sub(r"\W+", "_", Path(path).stem).strip("_").lower() or "db"
+    if base[0].isdigit(): base = "db_" + base
+    taken = {t.lower() for t in taken} | {"main", "temp"}  # Schema names ignore case
+    alias, n = base, 2
+    while alias in taken:
+        alias, n = f"{base}_{n}", n + 1
+    return alias
+
+def quote_ident(name):
+    """Quotes an identifier (table/column name) for use in SQL text."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+_PLAIN_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+def sql_name(name):
+    """name as typed in a query: bare if it is a plain identifier, quoted otherwise."""
+    return name if _PLAIN_NAME.fullmatch(name) else quote_ident(name)
+
+def list_tables(conn):
+    """Returns [(name, type)] for user tables and views, tables first."""
+    return conn.execute("""
+        SELECT name, type FROM sqlite_master
+        WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'
+        ORDER BY type, name
+    """).fetchall()
+
+def table_key_columns(conn, table):
+    """
+    Columns that identify a row, for keyset paging and UPDATE/DELETE:
+    ["rowid"] for ordinary tables, the primary key for WITHOUT ROWID
+    tables, [] for views (read-only, paged by OFFSET).
+    """
+    kind = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (table,)).fetchone()
+    if not kind or kind[0] != "table": return []
+    try:
+        conn.execute(f"SELECT rowid FROM {quote_ident(table)} LIMIT 0")
+        return ["rowid"]
+    except sqlite3.OperationalError:
+        pk = sorted((r[5], r[1]) for r in conn.execute(f"PRAGMA table_info({quote_ident(table)})") if r[5])
+        return [name for _, name in pk]
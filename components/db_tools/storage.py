@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import time
+
+AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+
+def has_dbstat(conn):
+    try:
+        conn.execute("SELECT 1 FROM dbstat LIMIT 1").fetchall()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def database_summary(conn, db_path):
+    """File-level numbers from PRAGMAs: sizes, free pages, vacuum/journal mode."""
+    pragma = lambda name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+    page_size = pragma("page_size")
+    page_count = pragma("page_count")
+    freelist = pragma("freelist_count")
+    wal = db_path + "-wal"
+    return {
+        "file_size": os.path.getsize(db_path) if os.path.exists(db_path) else 0,
+        "wal_size": os.path.getsize(wal) if os.path.exists(wal) else 0,
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "free_bytes": freelist * page_size,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(pragma("auto_vacuum"), "?"),
+        "journal_mode": pragma("journal_mode"),
+    }
+
+def object_sizes(conn):
+    """
+    Per table/index storage from the dbstat virtual table:
+    [{"name", "type", "table", "pages", "size", "payload", "unused", "fragmentation"}],
+    largest first. fragmentation is the share of pages that do not follow
+    the previous page of the same b-tree on disk (0 = stored contiguously).
+    Returns None if this SQLite build has no dbstat.
+    """
+    if not has_dbstat(conn): return None
+    kinds = {row[0]: (row[1], row[2]) for row in conn.execute("SELECT name, type, tbl_name FROM sqlite_master")}
+    rows = conn.execute("""
+        SELECT name, COUNT(*), SUM(pgsize), SUM(payload), SUM(unused),
+               SUM(prev IS NOT NULL AND pageno != prev + 1)
+        FROM (SELECT name, pageno, pgsize, payload, unused,
+                     LAG(pageno) OVER (PARTITION BY name ORDER BY path) AS prev
+              FROM dbstat)
+        GROUP BY name
+        ORDER BY SUM(pgsize) DESC
+    """).fetchall()
+    result = []
+    for name, pages, size, payload, unused, gaps in rows:
+        kind, table = kinds.get(name, ("schema" if name.startswith("sqlite_") else "?", name))
+        result.append({
+            "name": name,
+            "type": kind,
+            "table": table,
+            "pages": pages,
+            "size": size,
+            "payload": payload,
+            "unused": unused,
+            "fragmentation": gaps / (pages - 1) if pages > 1 else 0.0,
+        })
+    return result
+
+def analyze_storage(conn, db_path):
+    """Everything the maintenance panel shows: {"summary", "objects"} (objects None without dbstat)."""
+    return {"summary": database_summary(conn, db_path), "objects": object_sizes(conn)}
+
+MAINTENANCE_ACTIONS = {
+    "vacuum": "VACUUM",
+    "incremental_vacuum": "INCREMENTAL VACUUM",
+    "analyze": "ANALYZE",
+    "optimize": "OPTIMIZE",
+}
+
+def run_maintenance(conn, db_path, action):
+    """
+    Runs one maintenance action and measures the database around it.
+
+    vacuum             rebuilds the file: drops free pages, defragments b-trees
+    incremental_vacuum returns free pages to the OS without a rebuild; on a
+                       database without auto_vacuum=INCREMENTAL it switches the
+                       mode first, which takes one full VACUUM
+    analyze            refreshes the planner statistics (sqlite_stat1)
+    optimize           PRAGMA optimize: re-analyzes only where it is likely useful
+
+    Returns {"action", "before", "after", "elapsed"} with database_summary() snapshots.
+    """
+    before = database_summary(conn, db_path)
+    start = time.perf_counter()
+    if action == "vacuum":
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    elif action == "incremental_vacuum":
+        if before["auto_vacuum"] != "INCREMENTAL":
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    elif action == "analyze":
+        conn.execute("ANALYZE")
+    elif action == "optimize":
+        conn.execute("PRAGMA optimize").fetchall()
+    else:
+        raise ValueError(f"Unknown maintenance action: {action}")
+    elapsed = time.perf_counter() - start
+    return {"action": action, "before": before, "after": database_summary(conn, db_path), "elapsed": elapsed}
@@ -0,0 +1,491 @@
+import sqlite3
+from collections import OrderedDict, deque
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+
+from components.styles import C_TEXT_MUTED, C_PRIMARY, C_DANGER, C_SUCCESS
+from .sqlite_utils import open_connection, quote_ident, table_key_columns
+
+_MISSING = object()  # "No staged value" marker in undo records
+
+def _tint(color, alpha=60):
+    c = QColor(color)
+    c.setAlpha(alpha)
+    return c
+
+def format_cell(value):
+    """Display text for a SQLite value in the editor grids."""
+    if value is None: return "NULL"
+    if isinstance(value, bytes): return f"<BLOB {len(value)} bytes>"
+    return value
+
+class RowCountWorker(QThread):
+    """Counts the rows of a table on its own connection so opening a table never waits for COUNT(*)."""
+    counted = pyqtSignal(int)
+
+    def __init__(self, db_path, table, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.table = table
+        self._conn = None
+
+    def run(self):
+        try:
+            self._conn = open_connection(self.db_path, check_same_thread=False)
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {quote_ident(self.table)}").fetchone()[0]
+            self.counted.emit(count)
+        except sqlite3.Error as e:
+            print(f"[RowCountWorker] {self.table}: {e}")
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def cancel(self):
+        conn = self._conn
+        if conn is not None: conn.interrupt()
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Table model that reads a SQLite table in pages of PAGE_SIZE rows.
+
+    Pages are located by keyset (WHERE key > last key of the previous page
+    ORDER BY key), so scrolling costs one index seek per page regardless of
+    table size; jumping far ahead OFFSETs from the nearest known page. Only
+    MAX_CACHED_PAGES pages are kept in memory. Until the background count
+    arrives the view grows page by page through fetchMore().
+
+    Changes are staged, not written: cell edits, deleted rows and new rows
+    (shown above the table rows) are highlighted until submit_all() writes
+    them in one transaction with executemany, or revert_all() drops them.
+    Every staging call is one undo() step.
+
+    TEXT and BLOB cells are read as previews of at most PREVIEW_CHARS
+    characters/bytes (one more to tell that the value was cut); truncated
+    cells are shown with an ellipsis, can't be edited in the grid and are
+    read in full through ValueReader.
+    """
+    PAGE_SIZE = 200
+    PREVIEW_CHARS = 200
+    MAX_CACHED_PAGES = 50
+    UNDO_LIMIT = 100
+    pendingChanged = pyqtSignal(int)  # Number of staged changes
+    totalChanged = pyqtSignal(int)    # Exact row count (from the background count)
+
+    def __init__(self, conn, db_path, table, parent=None):
+        super().__init__(parent)
+        self.conn = conn
+        self.db_path = db_path
+        self.table = table
+
+        self.columns = [r[1] for r in conn.execute(f"PRAGMA table_info({quote_ident(table)})")]
+        self.key_columns = table_key_columns(conn, table)
+        self.read_only = not self.key_columns
+
+        self._pages = OrderedDict()   # {page: [row tuple (keys..., values...)]}
+        self._anchors = {-1: None}    # {page: key of its last row}; -1 is "before the first row"
+        self._edits = {}              # {(key, column): value}
+        self._deleted = set()         # Keys of rows staged for deletion
+        self._inserts = []            # Staged new rows, newest first: [{column: value}]
+        self._undo = deque(maxlen=self.UNDO_LIMIT)  # [[(kind, ...)]], one entry per staging call
+        self._total = None
+        self._row_count = 0
+
+        self._build_sql()
+        self._row_count = len(self._page(0))
+        self._counter = None
+        self.start_count()
+
+    # --- SQL ---
+
+    def _build_sql(self):
+        table = quote_ident(self.table)
+        cols = ", ".join(self._preview_expr(c) for c in self.columns)
+        if not self.key_columns:
+            self._sql_first = f"SELECT {cols} FROM {table} LIMIT ? OFFSET ?"
+            self._sql_after = None
+            return
+
+        keys = ", ".join(quote_ident(k) if k != "rowid" else "rowid" for k in self.key_columns)
+        key_tuple = f"({keys})" if len(self.key_columns) > 1 else keys
+        marks = ", ".join("?" * len(self.key_columns))
+        key_params = f"({marks})" if len(self.key_columns) > 1 else marks
+        self._key_expr = key_tuple
+        self._key_params = key_params
+
+        select = f"SELECT {keys}, {cols} FROM {table}"
+        self._sql_first = f"{select} ORDER BY {keys} LIMIT ? OFFSET ?"
+        self._sql_after = f"{select} WHERE {key_tuple} > {key_params} ORDER BY {keys} LIMIT ? OFFSET ?"
+
+    def _preview_expr(self, column):
+        col = quote_ident(column)
+        return (f"CASE WHEN typeof({col}) IN ('text', 'blob') "
+                f"THEN substr({col}, 1, {self.PREVIEW_CHARS + 1}) ELSE {col} END AS {col}")
+
+    def _cut(self, value):
+        return isinstance(value, (str, bytes)) and len(value) > self.PREVIEW_CHARS
+
+    def is_truncated(self, row, column):
+        """True if the grid only holds a preview of the stored value (staged values are always whole)."""
+        if row < len(self._inserts): return False
+        data = self._row(row)
+        if data is None: return False
+        key = tuple(data[:len(self.key_columns)])
+        if (key, self.columns[column]) in self._edits: return False
+        return self._cut(data[len(self.key_columns) + column])
+
+    def _page(self, page):
+        rows = self._pages.get(page)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+
+        # Start from the closest page whose last key is known (usually page - 1)
+        base = max(p for p in self._anchors if p < page)
+        skip = (page - base - 1) * self.PAGE_SIZE
+        anchor = self._anchors[base]
+        if anchor is None or not self._sql_after:
+            offset = skip if self._sql_after else page * self.PAGE_SIZE
+            rows = self.conn.execute(self._sql_first, (self.PAGE_SIZE, offset)).fetchall()
+        else:
+            rows = self.conn.execute(self._sql_after, (*anchor, self.PAGE_SIZE, skip)).fetchall()
+
+        nk = len(self.key_columns)
+        if rows and nk:
+            self._anchors[page] = rows[-1][:nk]
+        self._pages[page] = rows
+        while len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return rows
+
+    def _row(self, row):
+        row -= len(self._inserts)
+        if row < 0: return None
+        rows = self._page(row // self.PAGE_SIZE)
+        offset = row % self.PAGE_SIZE
+        return rows[offset] if offset < len(rows) else None
+
+    def row_key(self, row):
+        data = self._row(row)
+        return tuple(data[:len(self.key_columns)]) if data and self.key_columns else None
+
+    # --- Counting ---
+
+    def start_count(self):
+        self.stop_count()
+        self._counter = RowCountWorker(self.db_path, self.table)
+        self._counter.counted.connect(self._on_counted)
+        self._counter.start()
+
+    def stop_count(self):
+        if self._counter is not None:
+            self._counter.counted.disconnect(self._on_counted)
+            self._counter.cancel()
+            self._counter.wait()
+            self._counter = None
+
+    def _on_counted(self, total):
+        self._total = total
+        n = len(self._inserts)
+        if total > self._row_count:
+            self.beginInsertRows(QModelIndex(), n + self._row_count, n + total - 1)
+            self._row_count = total
+            self.endInsertRows()
+        elif total < self._row_count:
+            self.beginRemoveRows(QModelIndex(), n + total, n + self._row_count - 1)
+            self._row_count = total
+            self.endRemoveRows()
+        self.totalChanged.emit(total)
+
+    def total_rows(self):
+        return self._total
+
+    def canFetchMore(self, parent=QModelIndex()):
+        # Before the count arrives: grow while the last loaded page is full
+        return self._total is None and self._row_count > 0 and self._row_count % self.PAGE_SIZE == 0
+
+    def fetchMore(self, parent=QModelIndex()):
+        rows = self._page(self._row_count // self.PAGE_SIZE)
+        if rows and self._total is None:
+            n = len(self._inserts) + self._row_count
+            self.beginInsertRows(QModelIndex(), n, n + len(rows) - 1)
+            self._row_count += len(rows)
+            self.endInsertRows()
+
+    def reload(self):
+        """Drops every cached page (e.g. after a write) and recounts."""
+        self.beginResetModel()
+        self._pages.clear()
+        self._anchors = {-1: None}
+        self._total = None
+        self._row_count = len(self._page(0))
+        self.endResetModel()
+        self.start_count()
+
+    def close(self):
+        self.stop_count()
+
+    # --- Qt Model API ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._inserts) + self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole: return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section]
+        return section + 1
+
+    def is_new_row(self, row):
+        return row < len(self._inserts)
+
+    def is_deleted_row(self, row):
+        key = self.row_key(row)
+        return key is not None and key in self._deleted
+
+    def _value(self, row, column):
+        if row < len(self._inserts):
+            return self._inserts[row].get(self.columns[column])
+        data = self._row(row)
+        if data is None: return None
+        key = tuple(data[:len(self.key_columns)])
+        edit_key = (key, self.columns[column])
+        if edit_key in self._edits:
+            return self._edits[edit_key]
+        return data[len(self.key_columns) + column]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        row, column = index.row(), index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            value = self._value(row, column)
+            if role == Qt.ItemDataRole.DisplayRole and self._cut(value) and self.is_truncated(row, column):
+                if isinstance(value, bytes): return f"<BLOB {self.PREVIEW_CHARS}+ bytes>"
+                return value[:self.PREVIEW_CHARS] + "…"
+            return value if role == Qt.ItemDataRole.EditRole else format_cell(value)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if self._value(row, column) is None:
+                return QColor(C_TEXT_MUTED)
+        elif role == Qt.ItemDataRole.BackgroundRole:
+            if row < len(self._inserts): return _tint(C_SUCCESS)
+            key = self.row_key(row)
+            if key is None: return None
+            if key in self._deleted: return _tint(C_DANGER)
+            if (key, self.columns[column]) in self._edits: return _tint(C_PRIMARY)
+        elif role == Qt.ItemDataRole.FontRole and self._deleted:
+            if self.is_deleted_row(row):
+                font = QFont()
+                font.setStrikeOut(True)
+                return font
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.read_only or not index.isValid(): return flags
+        if index.row() < len(self._inserts): return flags | Qt.ItemFlag.ItemIsEditable
+        if self.is_deleted_row(index.row()): return flags
+        if isinstance(self._value(index.row(), index.column()), bytes): return flags
+        if self.is_truncated(index.row(), index.column()): return flags
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def _stage_value(self, row, column, value, steps):
+        """Stages one cell value and records how to undo it. False if the cell can't be edited."""
+        name = self.columns[column]
+        if row < len(self._inserts):
+            values = self._inserts[row]
+            steps.append(("new_cell", values, name, values.get(name, _MISSING)))
+            values[name] = value
+            return True
+
+        data = self._row(row)
+        if data is None: return False
+        key = tuple(data[:len(self.key_columns)])
+        stored = data[len(self.key_columns) + column]
+        if key in self._deleted or isinstance(stored, bytes) or self._cut(stored): return False
+        edit_key = (key, name)
+        steps.append(("cell", edit_key, self._edits.get(edit_key, _MISSING)))
+        if value == stored:
+            self._edits.pop(edit_key, None)  # Back to the stored value
+        else:
+            self._edits[edit_key] = value
+        return True
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or self.read_only or not index.isValid(): return False
+        steps = []
+        if not self._stage_value(index.row(), index.column(), value, steps): return False
+        self._push_undo(steps)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def paste(self, top, left, grid):
+        """
+        Stages a block of values (rows of cells, e.g. parsed from the
+        clipboard) starting at (top, left) as one undo step. Cells past the
+        last row/column or that can't be edited are skipped. Returns the
+        number of cells staged.
+        """
+        if self.read_only: return 0
+        steps = []
+        last_row = min(top + len(grid), self.rowCount()) - 1
+        for r in range(top, last_row + 1):
+            for offset, value in enumerate(grid[r - top]):
+                c = left + offset
+                if c >= len(self.columns): break
+                self._stage_value(r, c, value, steps)
+        if not steps: return 0
+        self._push_undo(steps)
+        self.dataChanged.emit(self.index(top, left), self.index(last_row, len(self.columns) - 1))
+        return len(steps)
+
+    # --- Staging ---
+
+    def pending_count(self):
+        return len(self._edits) + len(self._deleted) + len(self._inserts)
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def _push_undo(self, steps):
+        self._undo.append(steps)
+        self.pendingChanged.emit(self.pending_count())
+
+    def _refresh(self):
+        if self.rowCount() and self.columns:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, len(self.columns) - 1))
+        self.pendingChanged.emit(self.pending_count())
+
+    def stage_insert_row(self):
+        """Adds an empty new row at the top (columns left unset get their defaults)."""
+        if self.read_only: return
+        values = {}
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._inserts.insert(0, values)
+        self.endInsertRows()
+        self._push_undo([("insert", values)])
+
+    def stage_delete_rows(self, rows):
+        """Marks table rows for deletion and drops new rows outright. Returns the number of rows affected."""
+        if self.read_only: return 0
+        steps = []
+        # New rows go first, bottom-up so the recorded positions stay valid
+        for row in sorted((r for r in set(rows) if r < len(self._inserts)), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            steps.append(("uninsert", row, self._inserts.pop(row)))
+            self.endRemoveRows()
+
+        offset = len(steps)
+        keys = []
+        for row in rows:
+            if row < len(self._inserts) + offset: continue
+            key = self.row_key(row - offset)
+            if key is not None and key not in self._deleted:
+                keys.append(key)
+        self._deleted.update(keys)
+        if keys: steps.append(("delete", keys))
+        if not steps: return 0
+        self._undo.append(steps)
+        self._refresh()
+        return len(keys) + offset
+
+    def undo(self):
+        """Reverts the most recent staging step (an edit, a paste, a delete or a new row)."""
+        if not self._undo: return False
+        for step in reversed(self._undo.pop()):
+            kind = step[0]
+            if kind == "cell":
+                _, edit_key, old = step
+                if old is _MISSING: self._edits.pop(edit_key, None)
+                else: self._edits[edit_key] = old
+            elif kind == "new_cell":
+                _, values, name, old = step
+                if old is _MISSING: values.pop(name, None)
+                else: values[name] = old
+            elif kind == "delete":
+                self._deleted.difference_update(step[1])
+            elif kind == "insert":
+                row = next((i for i, v in enumerate(self._inserts) if v is step[1]), None)
+                if row is not None:
+                    self.beginRemoveRows(QModelIndex(), row, row)
+                    del self._inserts[row]
+                    self.endRemoveRows()
+            elif kind == "uninsert":
+                _, row, values = step
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._inserts.insert(row, values)
+                self.endInsertRows()
+        self._refresh()
+        return True
+
+    def _clear_staged(self):
+        had_inserts = bool(self._inserts)
+        if had_inserts:
+            self.beginRemoveRows(QModelIndex(), 0, len(self._inserts) - 1)
+        self._inserts = []
+        if had_inserts:
+            self.endRemoveRows()
+        self._edits.clear()
+        self._deleted.clear()
+        self._undo.clear()
+
+    def revert_all(self):
+        """Rollback: drops every staged change."""
+        self._clear_staged()
+        self._refresh()
+
+    # --- Writes ---
+
+    def _where_key(self):
+        return f"WHERE {self._key_expr} = {self._key_params}"
+
+    def submit_all(self):
+        """
+        Writes every staged change in one transaction: one executemany for
+        the deletes, one per set of edited columns, one per set of columns
+        given for new rows. Nothing is written if any statement fails.
+        """
+        if not self.pending_count(): return 0
+        table = quote_ident(self.table)
+
+        # Group edits per row so a row whose key column is edited is updated in one statement
+        row_edits = {}
+        for (key, column), value in self._edits.items():
+            if key not in self._deleted:
+                row_edits.setdefault(key, {})[column] = value
+        updates = {}
+        for key, values in row_edits.items():
+            columns = tuple(sorted(values))
+            updates.setdefault(columns, []).append((*(values[c] for c in columns), *key))
+        inserts = {}
+        for values in reversed(self._inserts):  # Oldest first
+            columns = tuple(c for c in self.columns if c in values)
+            inserts.setdefault(columns, []).append(tuple(values[c] for c in columns))
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._deleted:
+                self.conn.executemany(f"DELETE FROM {table} {self._where_key()}", list(self._deleted))
+            for columns, params in updates.items():
+                assignments = ", ".join(f"{quote_ident(c)} = ?" for c in columns)
+                self.conn.executemany(f"UPDATE {table} SET {assignments} {self._where_key()}", params)
+            for columns, params in inserts.items():
+                if columns:
+                    col_sql = ", ".join(quote_ident(c) for c in columns)
+                    marks = ", ".join("?" * len(columns))
+                    self.conn.executemany(f"INSERT INTO {table} ({col_sql}) VALUES ({marks})", params)
+                else:
+                    self.conn.executemany(f"INSERT INTO {table} DEFAULT VALUES", params)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        written = self.pending_count()
+        self._clear_staged()
+        self.pendingChanged.emit(0)
+        self.reload()
+        return written
@@ -0,0 +1,45 @@
+import sqlite3
+import traceback
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .sqlite_utils import open_connection
+
+class ConnectionTask(QThread):
+    """
+    Runs fn(conn, *args) on a fresh connection to db_path (with the
+    attached databases, {alias: path}) in a background thread. cancel()
+    interrupts the running statement.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_path, fn, *args, attached=None, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.attached = dict(attached or {})
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+        self._conn = None
+
+    def run(self):
+        try:
+            self._conn = open_connection(self.db_path, check_same_thread=False, attached=self.attached)
+            result = self.fn(self._conn, *self.args)
+        except sqlite3.OperationalError as e:
+            self.failed.emit("Cancelled." if self.cancelled else str(e))
+            return
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+            return
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.succeeded.emit(result)
+
+    def cancel(self):
+        self.cancelled = True
+        conn = self._conn
+        if conn is not None: conn.interrupt()
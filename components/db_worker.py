@@ -0,0 +1,190 @@
+import queue
+import threading
+import traceback
+from concurrent.futures import Future
+from PyQt6.QtCore import QObject, QThread, QEventLoop, QCoreApplication, pyqtSignal
+
+from components.db_manager import DBManager
+
+class DBWorker(QThread):
+    """
+    Runs DBManager calls one at a time on a dedicated thread.
+    The thread owns its own pooled SQLite connection (see DBManager._get_connection).
+    """
+    jobFinished = pyqtSignal(int)  # ticket
+
+    def __init__(self, is_superseded, parent=None):
+        super().__init__(parent)
+        self.jobs = queue.Queue()
+        self.is_superseded = is_superseded
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None: break
+            ticket, key, future, fn, args, kwargs = job
+
+            # A newer request with the same key is queued: skip this one entirely
+            if key and self.is_superseded(key, ticket):
+                future.cancel()
+                self.jobFinished.emit(ticket)
+                continue
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            self.jobFinished.emit(ticket)
+
+        DBManager.close_connection()
+
+    def stop(self):
+        self.jobs.put(None)
+
+
+class BackupWorker(QThread):
+    """
+    Runs DBManager.backup_db() (then rotate_backups()) or, given restore_from,
+    DBManager.restore_backup() on its own thread. Both copy through private
+    connections, so the AsyncDB worker keeps serving saves meanwhile.
+    cancel() aborts at the next page step; nothing partial is kept.
+    """
+    progress = pyqtSignal(int, int)  # pages copied, total pages
+    succeeded = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, restore_from=None, rotate=True, parent=None):
+        super().__init__(parent)
+        self.restore_from = restore_from
+        self.rotate = rotate
+        self.cancelled = False
+
+    def _on_progress(self, done, total):
+        if self.cancelled: raise InterruptedError("Cancelled.")
+        self.progress.emit(done, total)
+
+    def run(self):
+        try:
+            if self.restore_from:
+                result = DBManager.restore_backup(self.restore_from, progress=self._on_progress)
+            else:
+                result = DBManager.backup_db(progress=self._on_progress)
+                result["removed"] = DBManager.rotate_backups() if self.rotate else []
+        except InterruptedError:
+            self.failed.emit("Cancelled.")
+            return
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+            return
+        self.succeeded.emit(result)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class AsyncDB(QObject):
+    """
+    Asynchronous facade over DBManager so dialogs never block on SQLite.
+
+    submit() returns a concurrent.futures.Future and optionally calls
+    on_done / on_error back on the GUI thread. Requests that share a `key`
+    are coalesced: only the most recent one runs, and callbacks of older
+    ones are dropped (e.g. scrolling quickly through the prompt list only
+    loads the last selected prompt).
+    """
+    jobSettled = pyqtSignal()
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = AsyncDB()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._next_ticket = 0
+        self._latest = {}     # {key: newest ticket}
+        self._callbacks = {}  # {ticket: (key, future, on_done, on_error)}
+
+        self.worker = DBWorker(self._is_superseded)
+        self.worker.jobFinished.connect(self._on_job_finished)
+        self.worker.start()
+
+        app = QCoreApplication.instance()
+        if app: app.aboutToQuit.connect(self.shutdown)
+
+    def _is_superseded(self, key, ticket):
+        with self._lock:
+            return self._latest.get(key, ticket) != ticket
+
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None, **kwargs):
+        future = Future()
+        with self._lock:
+            self._next_ticket += 1
+            ticket = self._next_ticket
+            if key: self._latest[key] = ticket
+        self._callbacks[ticket] = (key, future, on_done, on_error)
+        self.worker.jobs.put((ticket, key, future, fn, args, kwargs))
+        return future
+
+    def supersede(self, key):
+        """Drops pending requests for key: they are skipped if not started yet, and their callbacks never run."""
+        with self._lock:
+            if key not in self._latest: return
+            self._next_ticket += 1
+            self._latest[key] = self._next_ticket
+
+    def _on_job_finished(self, ticket):
+        key, future, on_done, on_error = self._callbacks.pop(ticket, (None, None, None, None))
+        if future is None: return
+
+        stale = key and self._is_superseded(key, ticket)
+        if key and not stale:
+            with self._lock: self._latest.pop(key, None)
+
+        if not stale and not future.cancelled():
+            error = future.exception()
+            if error is None:
+                if on_done: on_done(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                traceback.print_exception(error)
+        self.jobSettled.emit()
+
+    def wait(self, future):
+        """Blocks the caller (while still processing GUI events) until the future settles."""
+        if not future.done() or self._pending(future):
+            loop = QEventLoop()
+            self.jobSettled.connect(loop.quit)
+            while not future.done() or self._pending(future):
+                loop.exec()
+            self.jobSettled.disconnect(loop.quit)
+        if future.cancelled(): return None
+        return future.result()
+
+    def _pending(self, future):
+        # Callbacks still queued for delivery on the GUI thread
+        return any(entry[1] is future for entry in self._callbacks.values())
+
+    def shutdown(self):
+        if self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
+
+    # --- Convenience wrappers ---
+
+    def list_prompts(self, offset, limit, order, descending, on_done, on_error=None):
+        return self.submit(DBManager.list_prompts, offset, limit, order, descending,
+                           key="list_prompts", on_done=on_done, on_error=on_error)
+
+    def load_prompt(self, name, on_done, key="load_prompt", on_error=None):
+        return self.submit(DBManager.load_prompt, name, key=key, on_done=on_done, on_error=on_error)
+
+    def save_prompt(self, name, data, on_done=None, on_error=None):
+        # Writes are never coalesced: every save runs, in submission order
+        return self.submit(DBManager.save_prompt, name, data, on_done=on_done, on_error=on_error)
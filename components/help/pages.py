@@ -59,6 +59,7 @@ PAGES = {
         
         <h2>The Database</h2>
         <p>Prompts are stored in SQLite <code>.db</code> files. Use the selector at the top of the dialog to switch databases (e.g., specific to different projects).</p>
+        <p>Databases created by older versions are upgraded to the current layout automatically the first time they are opened.</p>
 
         <h2>Saving</h2>
         <ul>
@@ -69,9 +70,19 @@ PAGES = {
         <h2>Loading</h2>
         <ul>
             <li>Click <b>LOAD</b> to open the Manager.</li>
+            <li><b>Search:</b> The search bar matches prompt names, block text and file/folder paths (e.g. <code>auth/session.py</code>), best matches first.</li>
             <li><b>Single Click:</b> Previews the prompt structure on the right side.</li>
             <li><b>Double Click:</b> Immediately loads the prompt.</li>
         </ul>
+
+        <h2>History</h2>
+        <p>Every save keeps the previous version. Open <b>OPTIONS &gt; Revision History...</b> to see what changed between revisions, or select one and click <b>RESTORE</b> to load it into the editor. Saving a restored revision adds it as the newest version; nothing is overwritten.</p>
+
+        <h2>Moving a Library</h2>
+        <p><b>OPTIONS &gt; Export Library (JSONL)...</b> writes every prompt of the current database to one file (one prompt per line). <b>Import Library (JSONL)...</b> reads such a file into the current database in a single step, either overwriting prompts with the same name or keeping the existing ones. If the import fails, nothing is changed.</p>
+
+        <h2>Backups</h2>
+        <p>The database is backed up automatically every hour while the app is open (only if something changed) into a <code>backups</code> folder next to the <code>.db</code> file; the newest 10 automatic backups are kept. Use <b>BACKUP &gt; Back Up Now</b> in the database selector for an extra copy, or <b>Restore from Backup...</b> to replace the current contents with a backup. Before restoring, the current database is saved as a <code>pre-restore</code> copy in the same folder.</p>
     """),
 
     "4. Path Modes": wrap_page("Path Modes", """
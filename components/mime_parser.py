@@ -10,10 +10,47 @@ class DragAndDropParser:
     3. VS Code Tree View Dragging
     4. URL cleaning and validation
     5. System-dependent path separator normalization
+
+    Drag sessions:
+    Qt fires dragMoveEvent on every mouse move, and parsing means one
+    os.path.exists per path. Widgets call begin_session() on dragEnter,
+    parse_paths() on move/drop and end_session() on leave/drop, so a drag
+    of thousands of files is only parsed (and stat'ed) once.
+    The session is keyed on the identity of the QMimeData object of the drag.
     """
 
+    _session_mime = None   # QMimeData of the drag in progress
+    _session_paths = None  # Parsed paths for that drag
+
+    @classmethod
+    def begin_session(cls, mime_data: QMimeData) -> list[str]:
+        """Parses the drag payload once and caches it for the rest of the drag."""
+        if cls._session_mime is not mime_data:
+            paths = cls._parse(mime_data)
+            if not paths:
+                # A rejected drag gets no leave/drop to end its session, and Qt
+                # reuses the QMimeData of external drags: never cache a refusal
+                cls.end_session()
+                return []
+            cls._session_mime = mime_data
+            cls._session_paths = paths
+        return list(cls._session_paths)
+
+    @classmethod
+    def end_session(cls):
+        """Drops the cached drag payload (call on dragLeave / drop)."""
+        cls._session_mime = None
+        cls._session_paths = None
+
+    @classmethod
+    def parse_paths(cls, mime_data: QMimeData) -> list[str]:
+        # Reuse the session cache while the same drag is in progress
+        if cls._session_mime is not None and cls._session_mime is mime_data:
+            return list(cls._session_paths)
+        return cls._parse(mime_data)
+
     @staticmethod
-    def parse_paths(mime_data: QMimeData) -> list[str]:
+    def _parse(mime_data: QMimeData) -> list[str]:
         paths = []
 
         # 1. Try Standard URLs (Qt handles most OS file managers here)
@@ -1,4 +1,9 @@
 import os
+import ast
+import sys
+import builtins
+import json
+import importlib
 import importlib.util
 import inspect
 from PyQt6.QtWidgets import QWidget
@@ -72,70 +77,315 @@ class BlockPluginInterface(QObject):
         return 100
 
 
+class PluginManifest:
+    """
+    What the UI needs to list a plugin without importing it: name, id,
+    description and drag_types, plus where its class lives (module is a
+    dotted name, or None to load path as a standalone file).
+    """
+    def __init__(self, id, name, description="", drag_types=(), module=None, path=None, class_name=None):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.drag_types = list(drag_types)
+        self.module = module
+        self.path = path
+        self.class_name = class_name
+
+    @classmethod
+    def from_instance(cls, plugin):
+        return cls(plugin.id, plugin.name, plugin.description, plugin.drag_types,
+                   module=type(plugin).__module__, class_name=type(plugin).__name__)
+
+# Properties read from the source by read_manifests(), with the BlockPluginInterface defaults
+_MANIFEST_PROPERTIES = {"name": None, "id": None, "description": "", "drag_types": []}
+
+def _literal_property(node):
+    """The value of a property whose body is a single `return <literal>`; raises ValueError otherwise."""
+    body = [stmt for stmt in node.body
+            if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant))]  # Docstring
+    if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+        raise ValueError(f"{node.name} is not a constant")
+    return ast.literal_eval(body[0].value)
+
+def _base_name(node):
+    """Dotted name of a base class expression (Name / Attribute chain); None for anything else."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name): return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+def _is_foreign_module(module):
+    """Modules that cannot define block plugins: Qt and the standard library."""
+    root = (module or "").split(".")[0]
+    return root == "PyQt6" or root in sys.stdlib_module_names
+
+def read_manifests(path):
+    """
+    [{class_name, name, id, description, drag_types}] of the plugin classes
+    in a source file, read with ast (nothing is executed). A class counts if
+    it derives from BlockPluginInterface (also under an alias), directly or
+    through another class of the same file (whose properties it inherits); a
+    base class without name/id is skipped when the file subclasses it.
+    Raises ValueError if a value is computed rather than written out, if a
+    base class comes from anywhere but this file, Qt or the standard library
+    (e.g. an imported plugin class), or if the file declares classes but no
+    plugin, so the caller can fall back to importing the file.
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    aliases = {}   # {local name: "BlockPluginInterface" or None for Qt / stdlib names}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            for a in node.names:
+                if a.name == "BlockPluginInterface": aliases[a.asname or a.name] = a.name
+                elif node.level == 0 and _is_foreign_module(node.module): aliases[a.asname or a.name] = None
+        elif isinstance(node, ast.Import):
+            for a in node.names:
+                if _is_foreign_module(a.name): aliases[(a.asname or a.name).split(".")[0]] = None
+
+    classes = {"BlockPluginInterface": dict(_MANIFEST_PROPERTIES)}  # {class name: properties}
+    subclassed = set()
+    declared = False
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            target = _base_name(node.value)
+            if target in classes or target in aliases:  # Base = BlockPluginInterface
+                aliases[node.targets[0].id] = aliases.get(target, target)
+            continue
+        if not isinstance(node, ast.ClassDef): continue
+        declared = True
+        bases = []
+        for b in node.bases:
+            dotted = _base_name(b)
+            if dotted is None:
+                raise ValueError(f"{node.name} has a computed base class")
+            local = aliases.get(dotted, dotted)
+            if local in classes:
+                bases.append(local)
+            elif dotted.rsplit(".", 1)[-1] == "BlockPluginInterface":  # plugin_system.BlockPluginInterface
+                bases.append("BlockPluginInterface")
+            elif dotted.split(".")[0] in aliases and aliases[dotted.split(".")[0]] is None:
+                continue  # Qt / stdlib class
+            elif dotted in vars(builtins):
+                continue
+            else:
+                raise ValueError(f"{node.name} derives from {dotted}, which is not defined in this file")
+        if not bases: continue
+        subclassed.update(bases)
+
+        entry = dict(classes[bases[0]])
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name in _MANIFEST_PROPERTIES:
+                entry[item.name] = _literal_property(item)
+            elif isinstance(item, ast.Assign) and len(item.targets) == 1 and \
+                    isinstance(item.targets[0], ast.Name) and item.targets[0].id in _MANIFEST_PROPERTIES:
+                entry[item.targets[0].id] = ast.literal_eval(item.value)  # name = "..." class attribute
+        classes[node.name] = entry
+
+    found = []
+    for class_name, entry in classes.items():
+        if class_name == "BlockPluginInterface": continue
+        if entry["name"] is None or entry["id"] is None:
+            if class_name in subclassed: continue  # Shared base class
+            raise ValueError(f"{class_name} does not define name and id as literals")
+        found.append(dict(entry, class_name=class_name))
+    if declared and not found:
+        raise ValueError("no plugin class found by reading the source")
+    return found
+
 class PluginManager:
+    """
+    Registry of block plugins.
+
+    Plugins are registered by manifest (see discover_folder): listing them in
+    the block type combo or the drop dialog costs no import, and a plugin's
+    module is imported and its class instantiated the first time get_plugin()
+    asks for it, i.e. when one of its blocks is created (and later compiled).
+    Manifests come from the plugin source via ast and are cached per folder
+    in __pycache__/plugin_index.json, keyed by file mtime and size.
+
+    Files whose plugin name or id is not a plain literal, or whose plugin
+    classes derive from a class defined elsewhere, are imported right away
+    and registered as before.
+    """
     _instance = None
-    _plugins = {}  # {id: plugin_instance}
-    _order = []    # [id, id, ...]
+    _plugins = {}    # {id: plugin_instance}, filled on first use
+    _manifests = {}  # {id: PluginManifest}
+    _order = []      # [id, id, ...]
+    _modules = {}    # {module name or file path: imported module}
+
+    INDEX_VERSION = 2  # 2: files that read as no plugins are no longer cached as empty
+    INDEX_FILE = os.path.join("__pycache__", "plugin_index.json")
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(PluginManager, cls).__new__(cls)
         return cls._instance
 
+    def _add_manifest(self, manifest):
+        if manifest.id in self._manifests:
+            print(f"[PluginManager] Warning: Overwriting plugin {manifest.id}")
+            self._plugins.pop(manifest.id, None)
+        self._manifests[manifest.id] = manifest
+        if manifest.id not in self._order:
+            self._order.append(manifest.id)
+
     def register(self, plugin_cls):
-        """Register a new plugin class."""
+        """Register a new plugin class (imported and instantiated now)."""
         try:
             instance = plugin_cls()
-            if instance.id in self._plugins:
-                print(f"[PluginManager] Warning: Overwriting plugin {instance.id}")
-            
+            self._add_manifest(PluginManifest.from_instance(instance))
             self._plugins[instance.id] = instance
-            if instance.id not in self._order:
-                self._order.append(instance.id)
             print(f"[PluginManager] Registered: {instance.name} ({instance.id})")
         except Exception as e:
             print(f"[PluginManager] Failed to register plugin: {e}")
 
+    def register_manifest(self, manifest):
+        """Register a plugin by manifest; its module is imported by get_plugin() on first use."""
+        self._add_manifest(manifest)
+        print(f"[PluginManager] Registered: {manifest.name} ({manifest.id})")
+
+    def _import(self, manifest):
+        key = manifest.module or manifest.path
+        module = self._modules.get(key)
+        if module is None:
+            if manifest.module:
+                module = importlib.import_module(manifest.module)
+            else:
+                name = os.path.splitext(os.path.basename(manifest.path))[0]
+                spec = importlib.util.spec_from_file_location(name, manifest.path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            self._modules[key] = module
+        return module
+
     def get_plugin(self, plugin_id):
-        return self._plugins.get(plugin_id)
+        """The plugin instance, importing its module on first use; None if unknown or broken."""
+        plugin = self._plugins.get(plugin_id)
+        if plugin is not None: return plugin
+
+        manifest = self._manifests.get(plugin_id)
+        if manifest is None: return None
+        try:
+            plugin = getattr(self._import(manifest), manifest.class_name)()
+            if plugin.id != plugin_id:
+                raise ValueError(f"{manifest.class_name}.id is '{plugin.id}', the manifest says '{plugin_id}'")
+        except Exception as e:
+            print(f"[PluginManager] Failed to load plugin {plugin_id}: {e}")
+            return None
+        self._plugins[plugin_id] = plugin
+        return plugin
+
+    def get_manifest(self, plugin_id):
+        return self._manifests.get(plugin_id)
+
+    def get_all_manifests(self):
+        return [self._manifests[pid] for pid in self._order]
 
     def get_all_plugins(self):
-        return [self._plugins[pid] for pid in self._order]
+        """Every plugin instance. Imports all plugin modules: prefer get_all_manifests() for listing."""
+        plugins = (self.get_plugin(pid) for pid in self._order)
+        return [p for p in plugins if p is not None]
 
     def get_plugin_names(self):
-        return [(p.name, p.id) for p in self.get_all_plugins()]
+        return [(m.name, m.id) for m in self.get_all_manifests()]
     
     def get_default_plugin_id(self):
         return self._order[0] if self._order else None
-    
+
+    # --- Discovery ---
+
+    def _read_index(self, folder_path):
+        try:
+            with open(os.path.join(folder_path, self.INDEX_FILE), encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != self.INDEX_VERSION: return {}
+        files = index.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _write_index(self, folder_path, files):
+        path = os.path.join(folder_path, self.INDEX_FILE)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.INDEX_VERSION, "files": files}, f, indent=1)
+        except OSError:
+            pass  # Read-only install: the index is rebuilt on every start instead
+
+    def discover_folder(self, folder_path, package=None, modules=None):
+        """
+        Registers the plugins in folder_path by manifest, without importing them.
+
+        package: dotted package name of the folder; modules are then imported
+                 as package.<name> (relative imports work). Without it each
+                 file is loaded on its own, like any user plugin.
+        modules: module names to register, in this order (default: every .py
+                 file in the folder, sorted by name).
+        """
+        if not os.path.isdir(folder_path): return
+        if modules is None:
+            modules = sorted(f[:-3] for f in os.listdir(folder_path)
+                             if f.endswith(".py") and not f.startswith("__"))
+
+        cached = self._read_index(folder_path)
+        files = {}
+        for name in modules:
+            path = os.path.join(folder_path, name + ".py")
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                print(f"[PluginManager] Missing plugin module {path}: {e}")
+                continue
+            entry = cached.get(name)
+            if not entry or entry.get("mtime") != st.st_mtime_ns or entry.get("size") != st.st_size:
+                try:
+                    entry = {"plugins": read_manifests(path)}
+                except (OSError, SyntaxError, ValueError) as e:
+                    # Computed name/id (or unreadable source): this module is imported up front
+                    entry = {"plugins": None, "reason": str(e)}
+                entry.update(mtime=st.st_mtime_ns, size=st.st_size)
+            files[name] = entry
+
+            module = f"{package}.{name}" if package else None
+            if entry["plugins"] is None:
+                self._register_module(module, path)
+                continue
+            for info in entry["plugins"]:
+                self.register_manifest(PluginManifest(
+                    info["id"], info["name"], info["description"], info["drag_types"],
+                    module=module, path=None if module else path, class_name=info["class_name"]
+                ))
+
+        if files != cached: self._write_index(folder_path, files)
+
+    def _register_module(self, module, path):
+        """Eager fallback: imports a plugin module and registers every plugin class in it."""
+        try:
+            mod = self._import(PluginManifest(None, None, module=module, path=path))
+        except Exception as e:
+            print(f"[PluginManager] Failed to import {module or path}: {e}")
+            return
+        self._scan_module(mod)
+
+    def _scan_module(self, module):
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if (issubclass(obj, BlockPluginInterface) and obj is not BlockPluginInterface
+                    and obj.__module__ == module.__name__):
+                self.register(obj)
+
     def load_from_folder(self, folder_path):
-        """Dynamic loader for user plugins"""
-        if not os.path.exists(folder_path): return
-        for f in os.listdir(folder_path):
-            if f.endswith(".py") and not f.startswith("__"):
-                path = os.path.join(folder_path, f)
-                spec = importlib.util.spec_from_file_location(f[:-3], path)
-                if spec and spec.loader:
-                    mod = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(mod)
-                    self._scan_module(mod)
+        """Dynamic loader for user plugins (registered by manifest, imported on first use)."""
+        self.discover_folder(folder_path)
 
     def auto_load_plugins(self, plugins_dir):
-        """Scans the plugins folder and imports .py files."""
+        """Creates the plugins folder if needed and registers the plugins in it."""
         if not os.path.exists(plugins_dir):
             os.makedirs(plugins_dir)
-
-        for filename in os.listdir(plugins_dir):
-            if filename.endswith(".py") and not filename.startswith("__"):
-                path = os.path.join(plugins_dir, filename)
-                spec = importlib.util.spec_from_file_location(filename[:-3], path)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    # Inspect module for subclasses of BlockPluginInterface
-                    for name, obj in inspect.getmembers(module):
-                        if (inspect.isclass(obj) 
-                            and issubclass(obj, BlockPluginInterface) 
-                            and obj is not BlockPluginInterface):
-                            self.register(obj)
\ No newline at end of file
+        self.discover_folder(plugins_dir)
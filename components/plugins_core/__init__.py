@@ -1,20 +1,15 @@
+import os
 from components.plugin_system import PluginManager
 
-# Import existing blocks
-from .message import MessageBlock
-from .file import FileBlock
-from .tree import TreeBlock
-
-# Import the new block
-from .hello_world import HelloWorldBlock
+# Core block modules, in combo order (the first one is the default block type).
+# They are registered by manifest and imported when a block of theirs is created.
+CORE_PLUGIN_MODULES = [
+    "message",
+    "file",
+    "tree",
+    # "hello_world",  # Example block
+]
 
 def register_core_plugins():
     pm = PluginManager()
-    
-    # Register existing
-    pm.register(MessageBlock)
-    pm.register(FileBlock)
-    pm.register(TreeBlock)
-    
-    # Register the new Hello World block
-    # pm.register(HelloWorldBlock)
\ No newline at end of file
+    pm.discover_folder(os.path.dirname(os.path.abspath(__file__)), package=__name__, modules=CORE_PLUGIN_MODULES)
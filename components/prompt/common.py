@@ -20,7 +20,7 @@ class DroppableLineEdit(QLineEdit):
         self._original_style = ""
 
     def dragEnterEvent(self, e):
-        paths = DragAndDropParser.parse_paths(e.mimeData())
+        paths = DragAndDropParser.begin_session(e.mimeData())
         if paths:
             e.accept()
             self._original_style = self.styleSheet()
@@ -36,11 +36,13 @@ class DroppableLineEdit(QLineEdit):
 
     def dragLeaveEvent(self, e):
         self.setStyleSheet(self._original_style)
+        DragAndDropParser.end_session()
         super().dragLeaveEvent(e)
 
     def dropEvent(self, e):
         self.setStyleSheet(self._original_style)
         paths = DragAndDropParser.parse_paths(e.mimeData())
+        DragAndDropParser.end_session()
         if paths:
             self.fileDropped.emit(paths[0])
         else:
@@ -8,6 +8,39 @@ from PyQt6.QtGui import QCursor, QIcon, QPainter, QColor
 from components.styles import C_BG_MAIN, C_BG_INPUT, C_DANGER, C_SUCCESS, C_TEXT_MUTED, C_BORDER, C_PRIMARY, C_TEXT_MAIN
 from components.plugin_system import PluginManager
 
+def resolve_block_state(state):
+    """Returns (plugin_id, data) for a saved block, converting pre-plugin saves."""
+    pid = state.get("plugin_id")
+    data_payload = state.get("data")
+
+    if not pid and "type" in state:
+        legacy_type = state["type"]
+        if legacy_type == "File":
+            pid = "core.file"
+            data_payload = {
+                "path": state.get("target_path", ""),
+                "mode": state.get("path_mode", "Relative Path"),
+                "text": state.get("text", "")
+            }
+        elif legacy_type == "Folder Tree":
+            pid = "core.tree"
+            data_payload = {
+                "path": state.get("target_path", ""),
+                "mode": state.get("path_mode", "Relative Path"),
+                "text": state.get("text", ""),
+                "ignore": state.get("ignore_patterns", ""),
+                "inject": state.get("tree_inject_files", [])
+            }
+        else: 
+            pid = "core.message"
+            data_payload = {
+                "text": state.get("text", "")
+            }
+
+    if not pid: pid = "core.message"
+    if data_payload is None: data_payload = state
+    return pid, data_payload
+
 class PromptItemWidget(QWidget):
     contentChanged = pyqtSignal()
 
@@ -291,35 +324,7 @@ class PromptItemWidget(QWidget):
         return {}
 
     def set_state(self, state):
-        pid = state.get("plugin_id")
-        data_payload = state.get("data")
-
-        if not pid and "type" in state:
-            legacy_type = state["type"]
-            if legacy_type == "File":
-                pid = "core.file"
-                data_payload = {
-                    "path": state.get("target_path", ""),
-                    "mode": state.get("path_mode", "Relative Path"),
-                    "text": state.get("text", "")
-                }
-            elif legacy_type == "Folder Tree":
-                pid = "core.tree"
-                data_payload = {
-                    "path": state.get("target_path", ""),
-                    "mode": state.get("path_mode", "Relative Path"),
-                    "text": state.get("text", ""),
-                    "ignore": state.get("ignore_patterns", ""),
-                    "inject": state.get("tree_inject_files", [])
-                }
-            else: 
-                pid = "core.message"
-                data_payload = {
-                    "text": state.get("text", "")
-                }
-
-        if not pid: pid = "core.message"
-        if data_payload is None: data_payload = state
+        pid, data_payload = resolve_block_state(state)
 
         # Load plugin (this creates the UI)
         self._load_plugin_by_id(pid, preserve_state=False)
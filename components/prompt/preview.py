@@ -0,0 +1,143 @@
+import os
+from PyQt6.QtWidgets import QStyledItemDelegate
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QColor, QPen
+
+from components.styles import C_BG_INPUT, C_BORDER, C_PRIMARY, C_TEXT_MAIN, C_TEXT_MUTED
+from components.plugin_system import PluginManager
+from .item import resolve_block_state
+
+SUMMARY_ROLE = Qt.ItemDataRole.UserRole + 1
+PREVIEW_LINES = 3
+
+def _file_size(path, root=""):
+    """Size on disk; relative paths are resolved against the project root, like the builder does."""
+    try:
+        if root and not os.path.isabs(path): path = os.path.join(root, path)
+        return os.path.getsize(path)
+    except (OSError, TypeError): return 0
+
+def _preview_lines(payload):
+    text = payload.get("text")
+    if isinstance(text, str) and text.strip():
+        return [line for line in text.splitlines() if line.strip()][:PREVIEW_LINES]
+    # Plugins without a "text" field: show their plain string values instead (path has its own line)
+    return [f"{k}: {v}" for k, v in payload.items()
+            if k != "path" and isinstance(v, str) and v.strip()][:PREVIEW_LINES]
+
+def summarize_prompt(data):
+    """
+    Flattens a loaded prompt into plain dicts for PromptPreviewDelegate.
+    No widgets are involved, so this can run on the DB worker thread.
+    The token estimate uses the same chars / 4 rule as the builder, counting
+    referenced files by their size on disk.
+    """
+    if not data: return []
+    pm = PluginManager()
+    rows = []
+
+    root = data.get("project_root", "")
+    if root:
+        rows.append({"kind": "root", "title": "PROJECT ROOT", "path": root, "lines": [], "tokens": 0, "active": True})
+
+    for state in data.get("items", []):
+        pid, payload = resolve_block_state(state)
+        if not isinstance(payload, dict): payload = {}
+        plugin = pm.get_manifest(pid)  # Only the name is needed: no plugin import on this thread
+
+        path = payload.get("path", "") if isinstance(payload.get("path"), str) else ""
+        inject = payload.get("inject", []) if isinstance(payload.get("inject"), list) else []
+        files = ([path] if pid == "core.file" and path else []) + inject
+
+        lines = _preview_lines(payload)
+        if plugin is None:
+            lines = ["Block type is not registered. Data is preserved."] + lines[:PREVIEW_LINES - 1]
+        if inject:
+            lines = lines[:PREVIEW_LINES - 1] + [f"+ {len(inject)} injected file(s)"]
+
+        text = payload.get("text", "") if isinstance(payload.get("text"), str) else ""
+        rows.append({
+            "kind": "block",
+            "title": plugin.name if plugin else f"? {pid}",
+            "path": path,
+            "lines": lines,
+            "tokens": (len(text) + sum(_file_size(f, root) for f in files)) // 4,
+            "active": state.get("is_active", True),
+        })
+    return rows
+
+
+class PromptPreviewDelegate(QStyledItemDelegate):
+    """Paints a block summary (type, path, first lines, token estimate) instead of building widgets."""
+    PADDING = 8
+    MARGIN = 3
+
+    def _line_count(self, summary):
+        if summary["kind"] == "root": return 1
+        return 1 + (1 if summary["path"] else 0) + len(summary["lines"])
+
+    def sizeHint(self, option, index):
+        summary = index.data(SUMMARY_ROLE)
+        if not summary: return super().sizeHint(option, index)
+        padding = 0 if summary["kind"] == "root" else self.PADDING
+        height = self._line_count(summary) * option.fontMetrics.height() + 2 * (padding + self.MARGIN)
+        return QSize(option.rect.width(), height)
+
+    def paint(self, painter, option, index):
+        summary = index.data(SUMMARY_ROLE)
+        if not summary:
+            super().paint(painter, option, index)
+            return
+
+        painter.save()
+        fm = option.fontMetrics
+        line_height = fm.height()
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+        if summary["kind"] == "root":
+            font = painter.font()
+            font.setItalic(True)
+            painter.setFont(font)
+            painter.setPen(QColor(C_TEXT_MUTED))
+            text = fm.elidedText(f"PROJECT ROOT: {summary['path']}", Qt.TextElideMode.ElideMiddle, rect.width())
+            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+            painter.restore()
+            return
+
+        painter.setPen(QPen(QColor(C_BORDER)))
+        painter.setBrush(QColor(C_BG_INPUT))
+        painter.drawRect(rect)
+        if not summary["active"]: painter.setOpacity(0.45)
+
+        inner = rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        y = inner.top()
+
+        # Header: block type + token estimate
+        tokens = f"~{summary['tokens']} tok" + ("" if summary["active"] else " (off)")
+        painter.setPen(QColor(C_TEXT_MUTED))
+        painter.drawText(inner.left(), y, inner.width(), line_height, Qt.AlignmentFlag.AlignRight, tokens)
+
+        font = painter.font()
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor(C_PRIMARY))
+        title_width = inner.width() - fm.horizontalAdvance(tokens) - self.PADDING
+        painter.drawText(inner.left(), y, title_width, line_height, Qt.AlignmentFlag.AlignLeft,
+                         painter.fontMetrics().elidedText(summary["title"], Qt.TextElideMode.ElideRight, title_width))
+        font.setBold(False)
+        painter.setFont(font)
+        y += line_height
+
+        if summary["path"]:
+            painter.setPen(QColor(C_TEXT_MUTED))
+            painter.drawText(inner.left(), y, inner.width(), line_height, Qt.AlignmentFlag.AlignLeft,
+                             fm.elidedText(summary["path"], Qt.TextElideMode.ElideMiddle, inner.width()))
+            y += line_height
+
+        painter.setPen(QColor(C_TEXT_MAIN))
+        for line in summary["lines"]:
+            painter.drawText(inner.left(), y, inner.width(), line_height, Qt.AlignmentFlag.AlignLeft,
+                             fm.elidedText(line, Qt.TextElideMode.ElideRight, inner.width()))
+            y += line_height
+
+        painter.restore()
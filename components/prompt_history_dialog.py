@@ -0,0 +1,168 @@
+import html
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSplitter,
+                             QWidget, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QAbstractItemView, QTextEdit, QComboBox, QDialogButtonBox)
+from PyQt6.QtCore import Qt
+
+from components.db_manager import DBManager
+from components.db_worker import AsyncDB
+from components.styles import C_PRIMARY, C_TEXT_MUTED, C_SUCCESS, C_DANGER
+
+class PromptHistoryDialog(QDialog):
+    """
+    Browses the saved revisions of one prompt.
+    Selecting a revision shows its diff; RESTORE hands the revision back to the
+    caller (selected_data) to be loaded into the editor.
+    """
+    COMPARE_PREVIOUS = "Previous revision"
+    COMPARE_LATEST = "Latest revision"
+
+    def __init__(self, parent, name):
+        super().__init__(parent)
+        self.name = name
+        self.selected_rev = None
+        self.selected_data = None
+        self.db = AsyncDB.instance()
+        self._latest_rev = 0
+
+        self.setWindowTitle(f"HISTORY: {name}")
+        self.resize(1000, 650)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        # Left: Revisions
+        list_container = QWidget()
+        list_layout = QVBoxLayout(list_container)
+        list_layout.setContentsMargins(0, 0, 0, 0)
+        list_layout.addWidget(QLabel("REVISIONS:"))
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Rev", "Saved", "Size"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.itemSelectionChanged.connect(self.show_diff)
+        self.table.itemDoubleClicked.connect(lambda _: self.restore_selected())
+        list_layout.addWidget(self.table)
+
+        self.lbl_count = QLabel("")
+        self.lbl_count.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        list_layout.addWidget(self.lbl_count)
+
+        # Right: Diff
+        diff_container = QWidget()
+        diff_layout = QVBoxLayout(diff_container)
+        diff_layout.setContentsMargins(0, 0, 0, 0)
+
+        compare_row = QHBoxLayout()
+        compare_row.addWidget(QLabel("COMPARE WITH:"))
+        self.combo_compare = QComboBox()
+        self.combo_compare.addItems([self.COMPARE_PREVIOUS, self.COMPARE_LATEST])
+        self.combo_compare.currentIndexChanged.connect(self.show_diff)
+        compare_row.addWidget(self.combo_compare)
+        compare_row.addStretch()
+        diff_layout.addLayout(compare_row)
+
+        self.txt_diff = QTextEdit()
+        self.txt_diff.setReadOnly(True)
+        self.txt_diff.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        diff_layout.addWidget(self.txt_diff)
+
+        splitter.addWidget(list_container)
+        splitter.addWidget(diff_container)
+        splitter.setSizes([330, 670])
+        layout.addWidget(splitter)
+
+        # Footer
+        btns = QDialogButtonBox()
+        self.btn_restore = btns.addButton("RESTORE", QDialogButtonBox.ButtonRole.AcceptRole)
+        self.btn_restore.setToolTip("Load this revision into the editor. Save to make it the latest revision.")
+        self.btn_restore.setStyleSheet(f"background-color: {C_PRIMARY}; color: #120d03; font-weight: bold;")
+        self.btn_restore.setEnabled(False)
+        btns.addButton(QDialogButtonBox.StandardButton.Close)
+        btns.accepted.connect(self.restore_selected)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+
+        self.db.submit(DBManager.list_revisions, name, key="history_list",
+                       on_done=self.populate_revisions, on_error=self.show_error)
+
+    def populate_revisions(self, rows):
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            item_rev = QTableWidgetItem(str(row["rev"]))
+            item_rev.setData(Qt.ItemDataRole.UserRole, row["rev"])
+            self.table.setItem(i, 0, item_rev)
+            self.table.setItem(i, 1, QTableWidgetItem(str(row["created_at"])))
+            self.table.setItem(i, 2, QTableWidgetItem(f"{row['size'] / 1024:.1f} KiB"))
+
+        self._latest_rev = rows[0]["rev"] if rows else 0
+        if rows:
+            self.lbl_count.setText(f"{len(rows)} revision(s)")
+            self.table.selectRow(0)
+        else:
+            self.lbl_count.setText("No revisions yet. History starts with the next save.")
+
+    def _current_rev(self):
+        selected = self.table.selectedItems()
+        if not selected: return None
+        return self.table.item(selected[0].row(), 0).data(Qt.ItemDataRole.UserRole)
+
+    def show_diff(self):
+        rev = self._current_rev()
+        self.btn_restore.setEnabled(rev is not None)
+        if rev is None:
+            self.txt_diff.clear()
+            return
+
+        if self.combo_compare.currentText() == self.COMPARE_LATEST:
+            old_rev, new_rev = rev, self._latest_rev
+        else:
+            old_rev, new_rev = rev - 1, rev
+        self.db.submit(DBManager.diff_revisions, self.name, old_rev, new_rev, key="history_diff",
+                       on_done=self.populate_diff, on_error=self.show_error)
+
+    def populate_diff(self, lines):
+        if not lines:
+            self.txt_diff.setPlainText("No differences.")
+            return
+
+        colors = {"+": C_SUCCESS, "-": C_DANGER, "@": C_TEXT_MUTED}
+        out = []
+        for line in lines:
+            color = C_TEXT_MUTED if line.startswith(("---", "+++")) else colors.get(line[:1])
+            text = html.escape(line)
+            out.append(f'<span style="color: {color};">{text}</span>' if color else text)
+        self.txt_diff.setHtml(f"<pre style=\"font-family: 'Consolas', monospace;\">{chr(10).join(out)}</pre>")
+
+    def restore_selected(self):
+        rev = self._current_rev()
+        if rev is None: return
+        self.btn_restore.setEnabled(False)
+        self.db.submit(DBManager.load_revision, self.name, rev, key="history_restore",
+                       on_done=lambda data: self._on_revision_loaded(rev, data),
+                       on_error=self._on_restore_failed)
+
+    def _on_revision_loaded(self, rev, data):
+        self.btn_restore.setEnabled(self._current_rev() is not None)
+        if not self.isVisible(): return  # Closed while the revision was rebuilt
+        if data is None:
+            self.show_error(f"Revision {rev} could not be rebuilt.")
+            return
+        self.selected_rev = rev
+        self.selected_data = data
+        self.accept()
+
+    def _on_restore_failed(self, error):
+        self.btn_restore.setEnabled(self._current_rev() is not None)
+        self.show_error(error)
+
+    def show_error(self, error):
+        self.txt_diff.setPlainText(f"Error reading history: {error}")
@@ -1,22 +1,40 @@
 import os
 import json
+from collections import OrderedDict
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QListWidget, QLabel, QLineEdit, QListWidgetItem,
                              QSplitter, QDialogButtonBox, QMessageBox, QWidget,
                              QSizePolicy, QTableWidget, QTableWidgetItem, 
                              QHeaderView, QAbstractItemView)
-from PyQt6.QtCore import Qt, QSize, QSettings, QDateTime
+from PyQt6.QtCore import Qt, QSize, QSettings, QDateTime, QTimer
 
 from components.db_manager import DBManager
-from components.prompt import PromptItemWidget
+from components.db_worker import AsyncDB
+from components.prompt.preview import PromptPreviewDelegate, summarize_prompt, SUMMARY_ROLE
 from components.db_selector import DBSelector 
-from components.styles import apply_class, C_PRIMARY
+from components.styles import apply_class, C_PRIMARY, C_TEXT_MUTED
 
 class PromptStateDialog(QDialog):
+    PAGE_SIZE = 100
+    SORT_COLUMNS = {0: "name", 1: "activity"}  # Table column -> DBManager.list_prompts order
+    PREVIEW_CACHE_SIZE = 32
+
     def __init__(self, parent=None, mode="load", current_name=None):
         super().__init__(parent)
         self.mode = mode
         self.selected_name = None
+        self.db = AsyncDB.instance()
+        
+        # Paging state (rows are sorted and paged in SQL)
+        self._sort_order = "activity"
+        self._sort_desc = True
+        self._has_more = True
+        self._page_loading = False
+        self._total = 0
+        
+        # Recently previewed prompts (name -> summary rows), most recent last
+        self._preview_cache = OrderedDict()
+        self._preview_name = None
         
         title = "LOAD PROMPT" if mode == "load" else "SAVE PROMPT"
         self.setWindowTitle(f"{title}")
@@ -44,8 +62,14 @@ class PromptStateDialog(QDialog):
         
         # Search Bar
         self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText("Search prompts by name...")
+        self.search_bar.setPlaceholderText("Search names, text and file paths...")
         self.search_bar.textChanged.connect(self.filter_prompts)
+        
+        # Debounce typing so the full-text search runs once the user pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
         self.search_bar.setFixedHeight(30)
         list_layout.addWidget(self.search_bar)
         
@@ -58,18 +82,28 @@ class PromptStateDialog(QDialog):
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.itemSelectionChanged.connect(self.on_selection_change)
         self.table.itemDoubleClicked.connect(self.handle_double_click)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
+        self.table.horizontalHeader().setSortIndicator(1, Qt.SortOrder.DescendingOrder)
+        self.table.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
+        self.table.verticalScrollBar().valueChanged.connect(self.on_scroll)
         list_layout.addWidget(self.table)
         
+        self.lbl_count = QLabel("")
+        self.lbl_count.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        list_layout.addWidget(self.lbl_count)
+        
         # Right: Visual Preview (Using Read-Only Prompt Items)
         preview_container = QWidget()
         prev_layout = QVBoxLayout(preview_container)
         prev_layout.setContentsMargins(0,0,0,0)
         
-        lbl_preview = QLabel("VISUAL PREVIEW (READ ONLY):")
+        lbl_preview = QLabel("PREVIEW (READ ONLY):")
         prev_layout.addWidget(lbl_preview)
         
         self.preview_list = QListWidget()
         self.preview_list.setSelectionMode(QListWidget.SelectionMode.NoSelection)
+        self.preview_list.setItemDelegate(PromptPreviewDelegate(self.preview_list))
+        self.preview_list.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
         prev_layout.addWidget(self.preview_list)
 
         splitter.addWidget(list_container)
@@ -116,67 +150,119 @@ class PromptStateDialog(QDialog):
 
     def on_db_changed(self, new_path):
         """Called when DBSelector changes the database"""
-        self.refresh_list()
+        self._preview_cache.clear()
+        self.run_search()
         self.preview_list.clear()
 
     def filter_prompts(self, text):
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item:
-                match = text.lower() in item.text().lower()
-                self.table.setRowHidden(row, not match)
+        self.search_timer.start()
+
+    def run_search(self):
+        text = self.search_bar.text().strip()
+        if not text:
+            self.refresh_list()
+            return
+        # A list page still in flight must not land under the search results
+        self.db.supersede("list_prompts")
+        self._page_loading = False
+        self._has_more = False
+        self.db.submit(DBManager.search_prompts, text, key="search",
+                       on_done=lambda rows: self.populate_search_results(rows, text),
+                       on_error=self.show_list_error)
+
+    def populate_search_results(self, rows, text=None):
+        """Shows ranked FTS matches (best first); the tooltip shows where the prompt matched."""
+        if text is not None and text != self.search_bar.text().strip(): return  # Box changed since
+        self._has_more = False  # Search results are not paged
+        self.table.setRowCount(0)
+        self._append_rows(rows)
+        self.lbl_count.setText(f"{len(rows)} match(es)")
+
+    def on_header_clicked(self, column):
+        """Re-sorts in SQL: clicking the same column again flips the direction."""
+        order = self.SORT_COLUMNS[column]
+        if order == self._sort_order:
+            self._sort_desc = not self._sort_desc
+        else:
+            self._sort_order, self._sort_desc = order, column == 1
+        self.table.horizontalHeader().setSortIndicator(
+            column, Qt.SortOrder.DescendingOrder if self._sort_desc else Qt.SortOrder.AscendingOrder
+        )
+        if not self.search_bar.text().strip():
+            self.refresh_list()
 
     def refresh_list(self):
+        # The old QSettings registry is folded into the DB once; the worker runs jobs in order
         settings = QSettings("PyTools", "PromptBuilder")
         registry = settings.value("prompt_registry", {})
-        if not isinstance(registry, dict): registry = {}
-        
+        if isinstance(registry, dict) and registry:
+            self.db.submit(DBManager.import_legacy_registry, registry)
+
+        # A search still in flight must not replace the list being paged in
+        self.db.supersede("search")
+
         self.table.setRowCount(0)
-        self.table.setSortingEnabled(False) # Disable sorting while loading to prevent UI stutters
-        
-        try:
-            prompts = DBManager.get_all_prompts()
-            db_names = []
-            
-            # Extract names safely from sqlite3.Row or dictionaries
-            for row in prompts:
-                try:
-                    if hasattr(row, 'keys') or isinstance(row, dict):
-                        if 'name' in row.keys(): db_names.append(str(row['name']))
-                        else: db_names.append(str(row[1] if len(row) > 1 else row[0]))
-                    elif isinstance(row, (tuple, list)):
-                        db_names.append(str(row[1] if len(row) > 1 else row[0]))
-                    else:
-                        db_names.append(str(row))
-                except: pass
-
-            all_names = set(registry.keys()).union(set(db_names))
-            self.table.setRowCount(len(all_names))
-            
-            for row_idx, name in enumerate(all_names):
-                name_str = str(name)
-                date_str = str(registry.get(name_str, "Legacy Save (Unknown)"))
-                
-                item_name = QTableWidgetItem(name_str)
-                item_date = QTableWidgetItem(date_str)
-                
-                item_name.setFlags(item_name.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                item_date.setFlags(item_date.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                
-                self.table.setItem(row_idx, 0, item_name)
-                self.table.setItem(row_idx, 1, item_date)
-                
-            self.table.setSortingEnabled(True)
-            self.table.sortItems(1, Qt.SortOrder.DescendingOrder)
-            
-        except Exception as e:
-            self.table.setRowCount(1)
-            self.table.setItem(0, 0, QTableWidgetItem("Error reading DB"))
-            print(e)
+        self._has_more = True
+        self._page_loading = False  # Any in-flight page is superseded by the new first page
+        self.db.submit(DBManager.count_prompts, key="count_prompts",
+                       on_done=self._set_total)
+        self.fetch_next_page()
+
+    def fetch_next_page(self):
+        """Pages are fetched on the DB worker thread and appended when they arrive."""
+        if not self._has_more or self._page_loading: return
+        self._page_loading = True
+        self.db.list_prompts(self.table.rowCount(), self.PAGE_SIZE, self._sort_order, self._sort_desc,
+                             on_done=self.append_page, on_error=self.show_list_error)
+
+    def append_page(self, rows):
+        self._page_loading = False
+        if self.search_bar.text().strip(): return  # Search results are showing instead
+        self._has_more = len(rows) == self.PAGE_SIZE
+        self._append_rows(rows)
+        self._update_count_label()
+        # Keep going if the first page does not fill the view yet
+        self.on_scroll(self.table.verticalScrollBar().value())
+
+    def on_scroll(self, value):
+        bar = self.table.verticalScrollBar()
+        if self._has_more and value >= bar.maximum() - 5:
+            self.fetch_next_page()
+
+    def _set_total(self, total):
+        self._total = total
+        self._update_count_label()
+
+    def _update_count_label(self):
+        if self.search_bar.text().strip(): return
+        self.lbl_count.setText(f"Showing {self.table.rowCount()} of {self._total}")
+
+    def show_list_error(self, error):
+        self._page_loading = False
+        self._has_more = False
+        self.table.setRowCount(1)
+        self.table.setItem(0, 0, QTableWidgetItem("Error reading DB"))
+        print(error)
+
+    def _append_rows(self, rows):
+        start = self.table.rowCount()
+        self.table.setRowCount(start + len(rows))
+        for offset, row in enumerate(rows):
+            item_name = QTableWidgetItem(str(row["name"]))
+            item_date = QTableWidgetItem(str(row["last_activity_at"] or "Legacy Save (Unknown)"))
+            if "snippet" in row.keys() and row["snippet"]:
+                item_name.setToolTip(row["snippet"])
+
+            item_name.setFlags(item_name.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            item_date.setFlags(item_date.flags() & ~Qt.ItemFlag.ItemIsEditable)
+
+            self.table.setItem(start + offset, 0, item_name)
+            self.table.setItem(start + offset, 1, item_date)
 
     def on_selection_change(self):
         selected = self.table.selectedItems()
         if not selected:
+            self._preview_name = None
             self.preview_list.clear()
             return
             
@@ -188,40 +274,37 @@ class PromptStateDialog(QDialog):
         if self.mode == "save":
             self.ln_name.setText(name)
             
-        # Load data and populate the preview list
-        data = DBManager.load_prompt(name)
-        self.populate_preview(data)
+        self._preview_name = name
+        cached = self._preview_cache.get(name)
+        if cached is not None:
+            self._preview_cache.move_to_end(name)
+            self.populate_preview(cached)
+            return
+
+        # Load and summarize off the GUI thread; rapid selection changes only load the last one
+        self.db.submit(self._load_preview, name, key="preview",
+                       on_done=lambda rows: self._on_preview_loaded(name, rows))
+
+    @staticmethod
+    def _load_preview(name):
+        return summarize_prompt(DBManager.load_prompt(name))
 
-    def populate_preview(self, data):
+    def _on_preview_loaded(self, name, rows):
+        self._preview_cache[name] = rows
+        self._preview_cache.move_to_end(name)
+        while len(self._preview_cache) > self.PREVIEW_CACHE_SIZE:
+            self._preview_cache.popitem(last=False)
+        if name == self._preview_name:
+            self.populate_preview(rows)
+
+    def populate_preview(self, rows):
+        """Rows come from summarize_prompt and are painted by PromptPreviewDelegate."""
         self.preview_list.clear()
-        if not data: return
-        
-        root_path = data.get("project_root", "")
-        items = data.get("items", [])
-        
-        if root_path:
-            lbl = QLabel(f"PROJECT ROOT: {root_path}")
-            lbl.setStyleSheet("color: #7c5826; font-style: italic; padding: 5px;")
+        for row in rows:
             item = QListWidgetItem()
-            item.setSizeHint(QSize(100, 30))
+            item.setData(SUMMARY_ROLE, row)
+            item.setFlags(Qt.ItemFlag.ItemIsEnabled)
             self.preview_list.addItem(item)
-            self.preview_list.setItemWidget(item, lbl)
-
-        for item_data in items:
-            list_item = QListWidgetItem(self.preview_list)
-            # Default height is updated dynamically by set_state
-            list_item.setSizeHint(QSize(100, 105))
-            
-            widget = PromptItemWidget(
-                parent_item=list_item, 
-                list_widget=self.preview_list, 
-                root_getter=lambda: root_path,
-                read_only=True
-            )
-            widget.set_state(item_data)
-            
-            self.preview_list.addItem(list_item)
-            self.preview_list.setItemWidget(list_item, widget)
 
     def handle_double_click(self, item):
         row = item.row()
@@ -249,15 +332,30 @@ class PromptStateDialog(QDialog):
                 QMessageBox.warning(self, "Name Required", "Please enter a name for the prompt.")
                 return
             
-            existing_items = [self.table.item(i, 0).text() for i in range(self.table.rowCount())]
-            if name in existing_items:
-                reply = QMessageBox.question(
-                    self, "Confirm Overwrite", 
-                    f"'{name}' already exists.\nOverwrite it?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-                )
-                if reply == QMessageBox.StandardButton.No:
-                    return
+            if not self.btn_action.isEnabled(): return  # Already checking a name
 
-            self.selected_name = name
-            self.accept()
\ No newline at end of file
+            # The table only holds the loaded pages, so ask the DB
+            self.btn_action.setEnabled(False)
+            self.db.submit(DBManager.prompt_exists, name,
+                           on_done=lambda exists: self._confirm_save(name, exists),
+                           on_error=self._on_name_check_failed)
+
+    def _confirm_save(self, name, exists):
+        self.btn_action.setEnabled(True)
+        if not self.isVisible(): return  # Cancelled while the check ran
+        if exists:
+            reply = QMessageBox.question(
+                self, "Confirm Overwrite", 
+                f"'{name}' already exists.\nOverwrite it?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+
+        self.selected_name = name
+        self.accept()
+
+    def _on_name_check_failed(self, error):
+        self.btn_action.setEnabled(True)
+        if self.isVisible():
+            QMessageBox.critical(self, "Error", f"Could not check the prompt name:\n{error}")
\ No newline at end of file
@@ -72,10 +72,10 @@ class AppShell(QMainWindow):
         menubar = self.menuBar()
         file_menu = menubar.addMenu("FILE")
         
-        save_action = QAction("Save Tab", self)
-        save_action.setShortcut(QKeySequence.StandardKey.Save)
-        save_action.triggered.connect(self.trigger_save)
-        file_menu.addAction(save_action)
+        self.save_action = QAction("Save Tab", self)
+        self.save_action.setShortcut(QKeySequence.StandardKey.Save)
+        self.save_action.triggered.connect(self.trigger_save)
+        file_menu.addAction(self.save_action)
 
         load_action = QAction("Load to Tab", self)
         load_action.setShortcut(QKeySequence.StandardKey.Open)
@@ -129,6 +129,7 @@ class AppShell(QMainWindow):
         self.tabs.setTabsClosable(True)
         self.tabs.setMovable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.currentChanged.connect(lambda _: self.update_save_action())
         layout.addWidget(self.tabs)
         
         # --- AUTOSAVE TIMER ---
@@ -136,6 +137,12 @@ class AppShell(QMainWindow):
         self.autosave_timer.timeout.connect(self.autosave_session)
         self.autosave_timer.start(10000) # Save every 10 seconds
 
+        # --- BACKUP TIMER ---
+        self.backup_worker = None
+        self.backup_timer = QTimer(self)
+        self.backup_timer.timeout.connect(self.scheduled_backup)
+        self.backup_timer.start(DBManager.BACKUP_INTERVAL_MIN * 60 * 1000)
+
         # Check for crash recovery / restore previous session
         self.restore_session()
 
@@ -172,6 +179,34 @@ class AppShell(QMainWindow):
                 try: os.remove(AUTOSAVE_FILE)
                 except Exception: pass
 
+    def scheduled_backup(self):
+        """Backs up the prompt DB in the background if it changed since the newest backup."""
+        if self.backup_worker is not None: return
+        try:
+            path = DBManager.get_db_path()
+            changed = max(os.path.getmtime(p) for p in (path, path + "-wal") if os.path.exists(p))
+            backups = DBManager.list_backups()
+            if backups and backups[0][2] >= changed: return
+        except (OSError, ValueError) as e:
+            print("Scheduled backup skipped:", e)
+            return
+
+        from components.db_worker import BackupWorker
+        self.backup_worker = BackupWorker()
+        self.backup_worker.succeeded.connect(self._on_backup_done)
+        self.backup_worker.failed.connect(self._on_backup_failed)
+        self.backup_worker.start()
+
+    def _on_backup_done(self, result):
+        self.backup_worker.wait()
+        self.backup_worker = None
+        self.status_label.setText(f"Backup saved: {os.path.basename(result['path'])}")
+
+    def _on_backup_failed(self, error):
+        self.backup_worker.wait()
+        self.backup_worker = None
+        print("Scheduled backup failed:", error)
+
     def restore_session(self):
         if not os.path.exists(AUTOSAVE_FILE):
             self.add_home_tab()
@@ -252,6 +287,8 @@ class AppShell(QMainWindow):
                 widget.statusMessage.connect(self.status_label.setText)
             if hasattr(widget, 'modificationChanged'):
                 widget.modificationChanged.connect(lambda s, w=widget: self.update_tab_title(w, s))
+            if hasattr(widget, 'savingChanged'):
+                widget.savingChanged.connect(lambda _: self.update_save_action())
             if hasattr(widget, 'titleChanged'):
                 widget.titleChanged.connect(lambda t, w=widget: self.update_base_tab_title(w, t))
         except Exception as e:
@@ -277,6 +314,10 @@ class AppShell(QMainWindow):
             self.tabs.setTabText(index, f"{base_name} *" if is_modified else base_name)
         except Exception: pass 
 
+    def update_save_action(self):
+        # A tab that is still writing its last save can't start another one
+        self.save_action.setEnabled(not getattr(self.tabs.currentWidget(), 'is_saving', False))
+
     def trigger_save(self):
         try:
             current_widget = self.tabs.currentWidget()
@@ -315,7 +356,9 @@ class AppShell(QMainWindow):
             if not widget: return
 
             if hasattr(widget, 'handle_unsaved_changes'):
-                if not widget.handle_unsaved_changes(): return 
+                # Choosing Save closes the tab once the save has gone through
+                retry = lambda: self.close_tab(self.tabs.indexOf(widget))
+                if not widget.handle_unsaved_changes(on_saved=retry): return 
 
             conn_name_to_remove = None
             if hasattr(widget, 'cleanup'):
@@ -344,11 +387,14 @@ class AppShell(QMainWindow):
                 
                 # If cleanly closed, trigger standard Qt save alerts 
                 if hasattr(widget, 'handle_unsaved_changes'):
-                    if not widget.handle_unsaved_changes():
+                    if not widget.handle_unsaved_changes(on_saved=self.close):
                         event.ignore()
                         return
             
             event.accept()
+            if self.backup_worker is not None:
+                self.backup_worker.cancel()
+                self.backup_worker.wait()
             # Everything was closed beautifully and willingly -> remove autosave file
             if os.path.exists(AUTOSAVE_FILE):
                 try: os.remove(AUTOSAVE_FILE)
@@ -1,19 +1,35 @@
+import os
 import sys
+import sqlite3
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, 
                              QComboBox, QPushButton, QMessageBox, QHeaderView,
-                             QTabWidget, QTextEdit, QLabel, QSplitter)
-from PyQt6.QtSql import QSqlDatabase, QSqlTableModel, QSqlQueryModel, QSqlQuery
+                             QTabWidget, QLabel, QSplitter, QApplication,
+                             QFileDialog, QProgressDialog)
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QShortcut, QKeySequence
 from components.db_selector import DBSelector
 from components.db_manager import DBManager
-from components.styles import apply_class, C_PRIMARY, C_DANGER
+from components.db_worker import AsyncDB
+from components.db_tools import (PagedTableModel, QueryWorker, QueryResultModel, QueryPlanPanel,
+                                 ExportWorker, EXPORT_FORMATS, ImportWorker, ImportDialog, IMPORT_FORMATS,
+                                 MaintenancePanel, ValueDetailPanel, SchemaBrowser, SchemaCache, DiffPanel,
+                                 SqlEditor, QueryHistoryPanel, open_connection, quote_ident,
+                                 attach_database, detach_database, suggest_alias)
+from components.styles import apply_class, C_PRIMARY, C_DANGER, C_TEXT_MUTED
 
 class DatabaseEditorTool(QWidget):
     def __init__(self):
         super().__init__()
-        # Unique connection name to avoid conflicts if multiple tabs open
-        self.db_conn_name = f"editor_connection_{id(self)}"
         self.model = None 
+        self.conn = None  # sqlite3 connection used by the Table Editor
+        self.query_worker = None
+        self.query_model = None
+        self.export_worker = None
+        self.export_progress = None
+        self.import_worker = None
+        self.import_progress = None
+        self.attached = {}  # {alias: path} of the databases ATTACHed next to the current one
+        self.schema_cache = None
         self.setup_ui()
         self.connect_to_db()
 
@@ -39,13 +55,23 @@ class DatabaseEditorTool(QWidget):
         self.setup_query_tab()
         self.tabs.addTab(self.tab_query, "SQL Query")
 
+        # Tab 3: Storage analysis + VACUUM / ANALYZE jobs
+        self.maintenance_panel = MaintenancePanel(confirm_rewrite=self.confirm_rewrite)
+        self.maintenance_panel.databaseChanged.connect(self.on_maintenance_done)
+        self.tabs.addTab(self.maintenance_panel, "Maintenance")
+
+        # Tab 4: Schema + data diff against another database file
+        self.diff_panel = DiffPanel()
+        self.tabs.addTab(self.diff_panel, "Diff")
+
     def setup_editor_tab(self):
         layout = QVBoxLayout(self.tab_editor)
         
         # Controls
         h_layout = QHBoxLayout()
         self.combo_tables = QComboBox()
-        self.combo_tables.currentTextChanged.connect(self.load_table)
+        self.combo_tables.currentTextChanged.connect(self.on_table_selected)
+        self._current_table = ""
         
         btn_refresh = QPushButton("Refresh Tables")
         btn_refresh.clicked.connect(self.refresh_tables_list)
@@ -55,13 +81,38 @@ class DatabaseEditorTool(QWidget):
         h_layout.addWidget(btn_refresh)
         h_layout.addStretch()
         
-        # Edit Actions
+        # Edit Actions (staged by the model until committed)
         btn_add = QPushButton("+ Add Row")
         btn_add.clicked.connect(self.add_row)
         
         btn_del = QPushButton("- Delete Row")
         btn_del.clicked.connect(self.delete_row)
+
+        self.btn_undo = QPushButton("UNDO")
+        self.btn_undo.setToolTip("Undo the last staged change (Ctrl+Z)")
+        self.btn_undo.clicked.connect(self.undo_change)
+
+        self.btn_save = QPushButton("COMMIT")
+        self.btn_save.setToolTip("Write all staged changes in one transaction")
+        self.btn_save.setStyleSheet(f"background-color: {C_PRIMARY}; color: black; font-weight: bold;")
+        self.btn_save.clicked.connect(self.save_changes)
+        self.btn_revert = QPushButton("ROLLBACK")
+        self.btn_revert.setToolTip("Discard all staged changes")
+        self.btn_revert.clicked.connect(self.revert_changes)
         
+        btn_import = QPushButton("IMPORT...")
+        btn_import.setToolTip("Load a CSV or JSON Lines file into a new or existing table")
+        btn_import.clicked.connect(self.import_file)
+
+        btn_export = QPushButton("EXPORT...")
+        btn_export.setToolTip("Export the whole table to CSV or JSON Lines")
+        btn_export.clicked.connect(self.export_table)
+
+        # Re-encode stored prompts with the current compression policy + VACUUM
+        self.btn_compact = QPushButton("COMPACT DB")
+        self.btn_compact.setToolTip("Recompress stored prompt documents and VACUUM the database")
+        self.btn_compact.clicked.connect(self.compact_db)
+
         # Drop Table Button
         btn_drop = QPushButton("DROP TABLE")
         btn_drop.setStyleSheet(f"background-color: {C_DANGER}; color: #ffffff; font-weight: bold;")
@@ -69,7 +120,13 @@ class DatabaseEditorTool(QWidget):
 
         h_layout.addWidget(btn_add)
         h_layout.addWidget(btn_del)
+        h_layout.addWidget(self.btn_undo)
+        h_layout.addWidget(self.btn_save)
+        h_layout.addWidget(self.btn_revert)
         h_layout.addSpacing(20) # Spacer
+        h_layout.addWidget(btn_import)
+        h_layout.addWidget(btn_export)
+        h_layout.addWidget(self.btn_compact)
         h_layout.addWidget(btn_drop)
         
         layout.addLayout(h_layout)
@@ -78,10 +135,38 @@ class DatabaseEditorTool(QWidget):
         self.table_view = QTableView()
         self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table_view.setAlternatingRowColors(True)
-        layout.addWidget(self.table_view)
+
+        # The grid shows previews; the selected cell is read in full on the side
+        self.detail_panel = ValueDetailPanel()
+        table_splitter = QSplitter(Qt.Orientation.Horizontal)
+        table_splitter.addWidget(self.table_view)
+        table_splitter.addWidget(self.detail_panel)
+        table_splitter.setStretchFactor(0, 3)
+        table_splitter.setStretchFactor(1, 1)
+        layout.addWidget(table_splitter)
+
+        for keys, slot in ((QKeySequence.StandardKey.Undo, self.undo_change),
+                           (QKeySequence.StandardKey.Paste, self.paste_cells),
+                           (QKeySequence.StandardKey.Delete, self.delete_row)):
+            shortcut = QShortcut(QKeySequence(keys), self.table_view)
+            shortcut.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
+            shortcut.activated.connect(slot)
+
+        self.lbl_rows = QLabel("")
+        self.lbl_rows.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        layout.addWidget(self.lbl_rows)
+        self._update_pending(0)
 
     def setup_query_tab(self):
         layout = QVBoxLayout(self.tab_query)
+
+        # Schema browser of every open database, left of the editor
+        workspace = QSplitter(Qt.Orientation.Horizontal)
+        self.schema_browser = SchemaBrowser()
+        self.schema_browser.nameActivated.connect(self.insert_name)
+        self.schema_browser.attachRequested.connect(self.attach_db_file)
+        self.schema_browser.detachRequested.connect(self.detach_db)
+        workspace.addWidget(self.schema_browser)
         
         splitter = QSplitter(Qt.Orientation.Vertical)
         
@@ -91,29 +176,61 @@ class DatabaseEditorTool(QWidget):
         l_in.setContentsMargins(0,0,0,0)
         l_in.addWidget(QLabel("SQL Query:"))
         
-        self.txt_query = QTextEdit()
+        self.txt_query = SqlEditor()
         self.txt_query.setPlaceholderText("SELECT * FROM ...")
         l_in.addWidget(self.txt_query)
         
-        btn_exec = QPushButton("Execute")
-        btn_exec.setStyleSheet(f"background-color: {C_PRIMARY}; color: black; font-weight: bold;")
-        btn_exec.clicked.connect(self.execute_query)
-        l_in.addWidget(btn_exec)
+        exec_row = QHBoxLayout()
+        self.btn_exec = QPushButton("Execute")
+        self.btn_exec.setStyleSheet(f"background-color: {C_PRIMARY}; color: black; font-weight: bold;")
+        self.btn_exec.clicked.connect(self.execute_query)
+        self.btn_cancel_query = QPushButton("Cancel")
+        self.btn_cancel_query.setEnabled(False)
+        self.btn_cancel_query.clicked.connect(self.cancel_query)
+        self.btn_explain = QPushButton("Explain")
+        self.btn_explain.setToolTip("Show the query plan and index suggestions without running the query")
+        self.btn_explain.clicked.connect(self.explain_query)
+        exec_row.addWidget(self.btn_exec, 1)
+        self.btn_export_query = QPushButton("Export...")
+        self.btn_export_query.setToolTip("Run the query straight into a CSV or JSON Lines file")
+        self.btn_export_query.clicked.connect(self.export_query)
+        exec_row.addWidget(self.btn_explain)
+        exec_row.addWidget(self.btn_export_query)
+        exec_row.addWidget(self.btn_cancel_query)
+        l_in.addLayout(exec_row)
         
         splitter.addWidget(input_container)
         
         # Result Output
+        self.output_tabs = QTabWidget()
         output_container = QWidget()
         l_out = QVBoxLayout(output_container)
         l_out.setContentsMargins(0,0,0,0)
-        l_out.addWidget(QLabel("Results:"))
         
         self.query_view = QTableView()
         self.query_view.setAlternatingRowColors(True)
         l_out.addWidget(self.query_view)
+
+        self.lbl_query_stats = QLabel("")
+        self.lbl_query_stats.setStyleSheet(f"color: {C_TEXT_MUTED}; font-size: 11px;")
+        l_out.addWidget(self.lbl_query_stats)
+        self.output_tabs.addTab(output_container, "Results")
+
+        self.plan_panel = QueryPlanPanel()
+        self.plan_panel.schemaChanged.connect(self.refresh_tables_list)
+        self.output_tabs.addTab(self.plan_panel, "Query Plan")
+
+        # Every query run here, with timing stats, and the named query library
+        self.history_panel = QueryHistoryPanel()
+        self.history_panel.runRequested.connect(self.run_saved_query)
+        self.history_panel.loadRequested.connect(self.load_saved_query)
+        self.output_tabs.addTab(self.history_panel, "History")
         
-        splitter.addWidget(output_container)
-        layout.addWidget(splitter)
+        splitter.addWidget(self.output_tabs)
+        workspace.addWidget(splitter)
+        workspace.setStretchFactor(1, 1)
+        workspace.setSizes([220, 800])
+        layout.addWidget(workspace)
 
     # --- Logic ---
 
@@ -121,39 +238,57 @@ class DatabaseEditorTool(QWidget):
         path = DBManager.get_db_path()
         if not path: return
 
-        if QSqlDatabase.contains(self.db_conn_name):
-            db = QSqlDatabase.database(self.db_conn_name)
-        else:
-            db = QSqlDatabase.addDatabase("QSQLITE", self.db_conn_name)
-            
-        db.setDatabaseName(path)
-        
-        if not db.open():
-            QMessageBox.critical(self, "Error", f"Could not open database: {db.lastError().text()}")
+        try:
+            self.conn = open_connection(path)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", f"Could not open database: {e}")
             return
 
+        # Databases attached before a DB switch stay attached to the new one
+        for alias, other in list(self.attached.items()):
+            try:
+                if os.path.samefile(other, path): raise sqlite3.OperationalError("it is the current database")
+                attach_database(self.conn, other, alias)
+            except (OSError, sqlite3.Error) as e:
+                del self.attached[alias]
+                QMessageBox.warning(self, "Attach Database", f"'{other}' was detached: {e}")
+
+        self.schema_cache = SchemaCache(self.conn)
+        self.plan_panel.set_connection(self.conn, path, self.attached)
+        self.maintenance_panel.set_database(path)
+        self.diff_panel.set_database(path)
+        self.history_panel.set_database(path)
+        self.schema_browser.set_cache(self.schema_cache)
+        self.txt_query.set_schema(self.schema_cache)
         self.refresh_tables_list()
 
     def on_db_changed(self, new_path):
         # Clean up existing models before switching
-        self.table_view.setModel(None)
-        self.model = None
-        
-        db = QSqlDatabase.database(self.db_conn_name)
-        if db.isOpen():
-            db.close()
+        self.close_model()
+        self.stop_query()
+        self.stop_export()
+        self.stop_import()
+        self.plan_panel.set_connection(None, None)
+        self.maintenance_panel.set_database(None)
+        self.schema_browser.set_cache(None)
+        self.txt_query.set_schema(None)
+        self.schema_cache = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
         
         self.connect_to_db()
 
     def refresh_tables_list(self):
+        # Names come from the schema cache, which only re-reads sqlite_master after DDL
+        self.schema_browser.refresh()
+        self.txt_query.refresh_schema()
         current_table = self.combo_tables.currentText()
         self.combo_tables.blockSignals(True)
         self.combo_tables.clear()
         
-        db = QSqlDatabase.database(self.db_conn_name)
-        if db.isOpen():
-            tables = db.tables()
-            self.combo_tables.addItems(tables)
+        if self.schema_cache is not None:
+            self.combo_tables.addItems([name for name, _ in self.schema_cache.tables("main")])
         
         # Restore selection if it still exists
         index = self.combo_tables.findText(current_table)
@@ -166,37 +301,138 @@ class DatabaseEditorTool(QWidget):
         if self.combo_tables.count() > 0 and not current_table:
             self.load_table(self.combo_tables.currentText())
 
-    def load_table(self, table_name):
-        if not table_name: 
-            self.table_view.setModel(None)
+    def on_table_selected(self, table_name):
+        if table_name == self._current_table: return
+        if not self.confirm_discard_changes():
+            # Stay on the table with unsaved edits
+            self.combo_tables.blockSignals(True)
+            self.combo_tables.setCurrentText(self._current_table)
+            self.combo_tables.blockSignals(False)
             return
+        self.load_table(table_name)
+
+    def confirm_discard_changes(self):
+        """Asks what to do with staged changes. Returns False if the user cancelled."""
+        if self.model is None or not self.model.pending_count(): return True
+        reply = QMessageBox.question(
+            self, "Uncommitted Changes",
+            f"Table '{self.model.table}' has {self.model.pending_count()} uncommitted change(s). Commit them?",
+            QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel
+        )
+        if reply == QMessageBox.StandardButton.Save: return self.save_changes()
+        return reply == QMessageBox.StandardButton.Discard
+
+    def handle_unsaved_changes(self, on_saved=None):
+        """
+        Called by the main window before the tab (or the app) closes. Committing
+        finishes before this returns, so on_saved is never needed.
+        """
+        return self.confirm_discard_changes()
+
+    def confirm_rewrite(self):
+        """Before VACUUM: staged changes are keyed by rowid, which a rebuild may renumber."""
+        if not self.confirm_discard_changes(): return False
+        if self.model is not None: self.model.revert_all()
+        return True
+
+    def on_maintenance_done(self):
+        # ANALYZE rewrites sqlite_stat1 without a schema change: drop the cached row estimates
+        if self.schema_cache is not None: self.schema_cache.invalidate()
+        self.refresh_tables_list()
+        if self.model is not None: self.model.reload()
+
+    def close_model(self):
+        self.table_view.setModel(None)
+        self.detail_panel.clear()
+        if self.model is not None:
+            self.model.close()
+            self.model = None
+        self._current_table = ""
+        self._update_pending(0)
+        self.lbl_rows.setText("")
+
+    def load_table(self, table_name):
+        self.close_model()
+        if not table_name or self.conn is None: return
         
-        # Create new model
-        self.model = QSqlTableModel(self, QSqlDatabase.database(self.db_conn_name))
-        self.model.setTable(table_name)
-        self.model.setEditStrategy(QSqlTableModel.EditStrategy.OnFieldChange)
-        self.model.select()
+        # Pages are read on demand; the row count arrives from a background thread
+        try:
+            self.model = PagedTableModel(self.conn, DBManager.get_db_path(), table_name, self)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", f"Could not open table '{table_name}':\n{e}")
+            return
+        self._current_table = table_name
+        self.model.pendingChanged.connect(self._update_pending)
+        self.model.totalChanged.connect(self._update_row_label)
+        self._update_row_label()
         
         self.table_view.setModel(self.model)
-        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table_view.selectionModel().currentChanged.connect(self.show_cell_detail)
+
+    def show_cell_detail(self, current, _previous=None):
+        if self.model is None or not current.isValid() or self.model.is_new_row(current.row()):
+            self.detail_panel.clear()
+            return
+        self.detail_panel.show_cell(self.conn, self.model.table, self.model.columns[current.column()],
+                                    self.model.key_columns, self.model.row_key(current.row()))
+
+    def _update_row_label(self, *_):
+        if self.model is None: return
+        total = self.model.total_rows()
+        suffix = " (read only)" if self.model.read_only else ""
+        self.lbl_rows.setText(f"Rows: {total:,}{suffix}" if total is not None else f"Rows: counting...{suffix}")
+
+    def _update_pending(self, count):
+        self.btn_save.setEnabled(count > 0)
+        self.btn_revert.setEnabled(count > 0)
+        self.btn_undo.setEnabled(self.model is not None and self.model.can_undo())
+        self.btn_save.setText(f"COMMIT ({count})" if count else "COMMIT")
+
+    def save_changes(self):
+        if self.model is None: return True
+        try:
+            self.model.submit_all()
+            return True
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", f"Changes were not committed (nothing was written):\n{e}")
+            return False
+
+    def revert_changes(self):
+        if self.model is not None: self.model.revert_all()
+
+    def undo_change(self):
+        if self.model is not None: self.model.undo()
 
     def add_row(self):
-        if self.model:
-            self.model.insertRow(self.model.rowCount())
+        if self.model is None or self.model.read_only: return
+        # New rows are staged at the top of the grid
+        self.model.stage_insert_row()
+        self.table_view.scrollToTop()
+        self.table_view.edit(self.model.index(0, 0))
 
     def delete_row(self):
-        if not self.model: return
+        if self.model is None or self.model.read_only: return
         
         selection = self.table_view.selectionModel().selectedRows()
         if not selection: return
-        
-        for index in selection:
-            self.model.removeRow(index.row())
-        self.model.select()
+        self.model.stage_delete_rows([index.row() for index in selection])
+        self.table_view.clearSelection()
+
+    def paste_cells(self):
+        """Stages tab-separated clipboard text (e.g. copied from a spreadsheet) from the current cell."""
+        if self.model is None or self.model.read_only: return
+        current = self.table_view.currentIndex()
+        if not current.isValid(): return
+        text = QApplication.clipboard().text()
+        if not text: return
+        lines = text.replace("\r\n", "\n").split("\n")
+        if lines and lines[-1] == "": lines.pop()
+        self.model.paste(current.row(), current.column(), [line.split("\t") for line in lines])
 
     def drop_table(self):
         table_name = self.combo_tables.currentText()
-        if not table_name: return
+        if not table_name or self.conn is None: return
 
         reply = QMessageBox.warning(
             self, 
@@ -209,49 +445,315 @@ class DatabaseEditorTool(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             # We must clear the model referencing the table before dropping it
-            self.table_view.setModel(None)
-            self.model = None
+            self.close_model()
             
-            db = QSqlDatabase.database(self.db_conn_name)
-            query = QSqlQuery(db)
-            if query.exec(f"DROP TABLE {table_name}"):
+            try:
+                self.conn.execute(f"DROP TABLE {quote_ident(table_name)}")
                 QMessageBox.information(self, "Success", f"Table '{table_name}' dropped.")
                 self.refresh_tables_list()
-            else:
-                QMessageBox.critical(self, "Error", f"Failed to drop table:\n{query.lastError().text()}")
+            except sqlite3.Error as e:
+                QMessageBox.critical(self, "Error", f"Failed to drop table:\n{e}")
                 # Reload previous table view attempt
                 self.load_table(table_name)
 
+    def compact_db(self):
+        self.btn_compact.setEnabled(False)
+        self.btn_compact.setText("COMPACTING...")
+        AsyncDB.instance().submit(DBManager.recompress, on_done=self._on_compacted, on_error=self._on_compact_failed)
+
+    def _on_compacted(self, stats):
+        self.btn_compact.setEnabled(True)
+        self.btn_compact.setText("COMPACT DB")
+        QMessageBox.information(
+            self, "Compact DB",
+            f"Rewrote {stats['rewritten']} block(s).\n"
+            f"Size: {stats['size_before'] / 1024:.0f} KiB -> {stats['size_after'] / 1024:.0f} KiB"
+        )
+        if self.model is not None: self.model.reload()  # Keeps staged changes
+
+    def _on_compact_failed(self, error):
+        self.btn_compact.setEnabled(True)
+        self.btn_compact.setText("COMPACT DB")
+        QMessageBox.critical(self, "Compact DB", f"Failed to compact database:\n{error}")
+
     def execute_query(self):
-        query_str = self.txt_query.toPlainText()
+        query_str = self.txt_query.toPlainText().strip()
+        if not query_str or self.conn is None: return
+        self.stop_query()
+
+        # Runs on its own connection; rows are appended to the view as batches arrive
+        self.output_tabs.setCurrentIndex(0)
+        self.query_model = QueryResultModel(self)
+        self.query_view.setModel(self.query_model)
+        self.query_worker = QueryWorker(DBManager.get_db_path(), query_str, attached=self.attached)
+        self.query_worker.columnsReady.connect(self.query_model.set_columns)
+        self.query_worker.rowsReady.connect(self.query_model.append_rows)
+        self.query_worker.queryFinished.connect(self.on_query_finished)
+
+        self.btn_exec.setEnabled(False)
+        self.btn_cancel_query.setEnabled(True)
+        self.lbl_query_stats.setText("Running...")
+        self.query_worker.start()
+
+    def explain_query(self):
+        query_str = self.txt_query.toPlainText().strip()
         if not query_str: return
-        
-        db = QSqlDatabase.database(self.db_conn_name)
-        if not db.isOpen(): return
+        if self.plan_panel.explain_query(query_str):
+            self.output_tabs.setCurrentWidget(self.plan_panel)
 
-        q_model = QSqlQueryModel()
-        q_model.setQuery(query_str, db)
-        
-        if q_model.lastError().isValid():
-            QMessageBox.warning(self, "Query Error", q_model.lastError().text())
-        else:
-            self.query_view.setModel(q_model)
+    def cancel_query(self):
+        if self.query_worker is not None:
+            self.query_worker.cancel()
+            self.lbl_query_stats.setText("Cancelling...")
+
+    def stop_query(self):
+        """Interrupts a running query and waits for its thread (tab close / DB switch)."""
+        if self.query_worker is None: return
+        self.query_worker.queryFinished.disconnect(self.on_query_finished)
+        self.query_worker.cancel()
+        self.query_worker.wait()
+        self.query_worker = None
+        self.btn_exec.setEnabled(True)
+        self.btn_cancel_query.setEnabled(False)
+
+    def on_query_finished(self, stats):
+        # The signal is the last thing run() does; let the thread exit before dropping it
+        self.query_worker.wait()
+        sql = self.query_worker.sql
+        self.query_worker = None
+        self.btn_exec.setEnabled(True)
+        self.btn_cancel_query.setEnabled(False)
+
+        timing = f"{stats['elapsed'] * 1000:.1f} ms | ~{stats['vm_steps']:,} VM steps"
+        if not stats["cancelled"]:
+            rows = stats["rows"] if self.query_model.columns else max(stats["affected"], 0)
+            self.history_panel.record(sql, stats["elapsed"] * 1000, rows, stats["error"] or None)
+        if stats["error"]:
+            self.lbl_query_stats.setText(f"Error after {timing}")
+            QMessageBox.warning(self, "Query Error", stats["error"])
+            return
+        if stats["cancelled"]:
+            self.lbl_query_stats.setText(f"Cancelled after {timing} | {stats['rows']:,} row(s) read")
+            return
+
+        if self.query_model.columns:
+            shown = self.query_model.rowCount()
+            capped = f" (first {shown:,} shown)" if shown < stats["rows"] else ""
+            self.lbl_query_stats.setText(f"{stats['rows']:,} row(s) returned{capped} | {timing}")
             self.query_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        else:
+            affected = f"{stats['affected']:,} row(s) affected" if stats["affected"] >= 0 else "Done"
+            self.lbl_query_stats.setText(f"{affected} | {timing}")
+            # The statement may have changed the schema or the open table
+            self.refresh_tables_list()
+            if self.model is not None and not self.model.pending_count():
+                self.model.reload()
+
+    def load_saved_query(self, sql):
+        self.txt_query.setPlainText(sql)
+        self.txt_query.setFocus()
+
+    def run_saved_query(self, sql):
+        self.load_saved_query(sql)
+        self.execute_query()
+
+    # --- Attached Databases ---
+
+    def insert_name(self, name):
+        self.txt_query.insertPlainText(name)
+        self.txt_query.setFocus()
+
+    def attach_db_file(self):
+        if self.conn is None: return
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Attach Database", "", "SQLite Files (*.db);;All Files (*)"
+        )
+        if not fname: return
+        for other in [DBManager.get_db_path(), *self.attached.values()]:
+            if os.path.exists(other) and os.path.samefile(fname, other):
+                QMessageBox.information(self, "Attach Database", f"'{os.path.basename(fname)}' is already open.")
+                return
+
+        alias = suggest_alias(fname, self.attached)
+        try:
+            attach_database(self.conn, fname, alias)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Attach Database", f"Could not attach '{fname}':\n{e}")
+            return
+        self.attached[alias] = fname
+        self.schema_cache.invalidate(alias)
+        self.schema_browser.refresh()
+
+    def detach_db(self, alias):
+        if self.conn is None or alias not in self.attached: return
+        try:
+            detach_database(self.conn, alias)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Detach Database", f"Could not detach '{alias}':\n{e}")
+            return
+        del self.attached[alias]
+        self.schema_cache.invalidate(alias)
+        self.schema_browser.refresh()
+
+    # --- Export ---
+
+    def export_table(self):
+        if self.model is None: return
+        self.start_export(f"SELECT * FROM {quote_ident(self.model.table)}", self.model.table, self.model.total_rows())
+
+    def export_query(self):
+        query_str = self.txt_query.toPlainText().strip()
+        if query_str: self.start_export(query_str, "query")
+
+    def start_export(self, sql, default_name, total=None):
+        """Streams sql into a file chosen by the user; rows never go through a model."""
+        if self.conn is None or self.export_worker is not None: return
+        fname, chosen = QFileDialog.getSaveFileName(
+            self, "Export", f"{default_name}.csv", ";;".join(EXPORT_FORMATS.values())
+        )
+        if not fname: return
+        fmt = "jsonl" if chosen == EXPORT_FORMATS["jsonl"] or fname.lower().endswith(".jsonl") else "csv"
+
+        self.export_progress = QProgressDialog(f"Exporting to {fname}...", "Cancel", 0, total or 0, self)
+        self.export_progress.setWindowTitle("Export")
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.setMinimumDuration(300)
+        self.export_progress.setAutoClose(False)
+        self.export_progress.setAutoReset(False)
+        self.export_progress.canceled.connect(self.cancel_export)
+
+        self.export_worker = ExportWorker(DBManager.get_db_path(), sql, fname, fmt, attached=self.attached)
+        self.export_worker.progress.connect(self._on_export_progress)
+        self.export_worker.exportFinished.connect(self.on_export_finished)
+        self.export_worker.start()
+
+    def _on_export_progress(self, rows, size):
+        if self.export_progress is None: return
+        if self.export_progress.maximum():
+            self.export_progress.setValue(min(rows, self.export_progress.maximum()))
+        self.export_progress.setLabelText(f"Exported {rows:,} row(s), {size / 1024 / 1024:.1f} MiB")
+
+    def cancel_export(self):
+        if self.export_worker is not None: self.export_worker.cancel()
+
+    def stop_export(self):
+        """Cancels a running export and waits for its thread (tab close / DB switch)."""
+        if self.export_worker is None: return
+        self.export_worker.exportFinished.disconnect(self.on_export_finished)
+        self.export_worker.cancel()
+        self.export_worker.wait()
+        self._close_export()
+
+    def _close_export(self):
+        self.export_worker = None
+        if self.export_progress is not None:
+            self.export_progress.canceled.disconnect(self.cancel_export)
+            self.export_progress.close()
+            self.export_progress = None
+
+    def on_export_finished(self, stats):
+        self.export_worker.wait()
+        self._close_export()
+        if stats["error"]:
+            QMessageBox.critical(self, "Export", f"Export failed (no file was written):\n{stats['error']}")
+        elif not stats["cancelled"]:
+            rate = stats["rows"] / stats["elapsed"] if stats["elapsed"] > 0 else 0
+            QMessageBox.information(
+                self, "Export",
+                f"Exported {stats['rows']:,} row(s) to {stats['path']}\n"
+                f"{stats['bytes'] / 1024 / 1024:.1f} MiB in {stats['elapsed']:.1f} s ({rate:,.0f} rows/s)"
+            )
+
+    # --- Import ---
+
+    def import_file(self):
+        if self.conn is None or self.import_worker is not None: return
+        fname, _ = QFileDialog.getOpenFileName(self, "Import", "", ";;".join(IMPORT_FORMATS.values()))
+        if not fname: return
+        try:
+            dialog = ImportDialog(self, self.conn, fname)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            QMessageBox.critical(self, "Import", f"Could not read {fname}:\n{e}")
+            return
+        if not dialog.exec(): return
+        opts = dialog.options()
+        if opts["table"] == self._current_table:
+            if not self.confirm_discard_changes(): return
+            self.model.revert_all()  # The table is reloaded after the import
+
+        self.import_progress = QProgressDialog(f"Importing into '{opts['table']}'...", "Cancel", 0, 1000, self)
+        self.import_progress.setWindowTitle("Import")
+        self.import_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.import_progress.setMinimumDuration(300)
+        self.import_progress.setAutoClose(False)
+        self.import_progress.setAutoReset(False)
+        self.import_progress.canceled.connect(self.cancel_import)
+
+        table, mapping = opts.pop("table"), opts.pop("mapping")
+        self.import_worker = ImportWorker(DBManager.get_db_path(), fname, table, mapping, **opts)
+        self.import_worker.progress.connect(self._on_import_progress)
+        self.import_worker.importFinished.connect(self.on_import_finished)
+        self.import_worker.start()
+
+    def _on_import_progress(self, rows, done, total):
+        if self.import_progress is None: return
+        self.import_progress.setValue(int(done * 1000 / total) if total else 0)
+        self.import_progress.setLabelText(f"Imported {rows:,} row(s)...")
+
+    def cancel_import(self):
+        if self.import_worker is not None: self.import_worker.cancel()
+
+    def stop_import(self):
+        """Cancels a running import (rolled back) and waits for its thread."""
+        if self.import_worker is None: return
+        self.import_worker.importFinished.disconnect(self.on_import_finished)
+        self.import_worker.cancel()
+        self.import_worker.wait()
+        self._close_import()
+
+    def _close_import(self):
+        self.import_worker = None
+        if self.import_progress is not None:
+            self.import_progress.canceled.disconnect(self.cancel_import)
+            self.import_progress.close()
+            self.import_progress = None
+
+    def on_import_finished(self, stats):
+        table = self.import_worker.table
+        self.import_worker.wait()
+        self._close_import()
+        if stats["error"]:
+            QMessageBox.critical(self, "Import", f"Import failed (nothing was written):\n{stats['error']}")
+            return
+        if stats["cancelled"]:
+            return
+
+        self.refresh_tables_list()
+        if table == self._current_table: self.model.reload()
+        else: self.combo_tables.setCurrentText(table)
+        rebuilt = f"\nRebuilt {stats['indexes_rebuilt']} index(es)." if stats["indexes_rebuilt"] else ""
+        QMessageBox.information(
+            self, "Import",
+            f"Imported {stats['rows']:,} row(s) into '{table}' in {stats['elapsed']:.1f} s "
+            f"({stats['rows_per_sec']:,.0f} rows/s).{rebuilt}"
+        )
 
     def cleanup(self):
         """
         Manually release resources to ensure the database connection can be removed.
         Called by the main window before closing the tab.
         """
-        # 1. Detach models from Views
-        self.table_view.setModel(None)
+        # 1. Stop background work and detach models from Views
+        self.stop_query()
+        self.stop_export()
+        self.stop_import()
+        self.plan_panel.cancel()
+        self.maintenance_panel.cancel()
+        self.diff_panel.cancel()
+        self.close_model()
         self.query_view.setModel(None)
-        
-        # 2. Delete the Python object references to the models
-        if hasattr(self, 'model'):
-            del self.model
             
-        # 3. Close the DB connection
-        db = QSqlDatabase.database(self.db_conn_name)
-        if db.isOpen():
-            db.close()
\ No newline at end of file
+        # 2. Close the DB connection
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
\ No newline at end of file
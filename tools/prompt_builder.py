@@ -1,11 +1,12 @@
 import json
 import os
+import fnmatch
 from PyQt6.QtWidgets import (QSizePolicy, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QListWidget, QListWidgetItem, QTextEdit, QLabel,
                              QFileDialog, QSplitter, QMessageBox,
                              QAbstractItemView, QApplication, QDialog, QMenu, QComboBox, 
-                             QDialogButtonBox, QLineEdit, QCheckBox)
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QSettings, QDateTime
+                             QDialogButtonBox, QLineEdit, QCheckBox, QProgressDialog)
+from PyQt6.QtCore import Qt, QSize, pyqtSignal, QThread
 from PyQt6.QtGui import QDragEnterEvent, QDropEvent, QDragMoveEvent, QShortcut, QKeySequence
 
 # --- IMPORTS ---
@@ -13,7 +14,9 @@ from components.prompt import PromptItemWidget, DroppableLineEdit
 from components.prompt.settings import ProjectSettingsDialog
 from components.prompt.generator import generate_tree_text
 from components.db_manager import DBManager
+from components.db_worker import AsyncDB
 from components.prompt_state_dialog import PromptStateDialog  # Restored!
+from components.prompt_history_dialog import PromptHistoryDialog
 from components.styles import apply_class, C_PRIMARY, C_BG_MAIN, C_DANGER, C_BG_SECONDARY, C_BORDER, C_TEXT_MAIN
 from components.mime_parser import DragAndDropParser
 from components.plugin_system import PluginManager
@@ -41,6 +44,46 @@ def parse_gitignore_lines(file_path):
     except: pass
     return patterns
 
+# Dropping more files than this asks for confirmation before creating blocks
+BULK_CONFIRM_THRESHOLD = 300
+
+class FolderExpandWorker(QThread):
+    """
+    Walks dropped folders in the background and collects the files inside,
+    honoring the project's global ignore patterns.
+    """
+    progress = pyqtSignal(int)      # Files found so far
+    expanded = pyqtSignal(list)     # Final flat list of file paths
+
+    def __init__(self, paths, ignore_str, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.ignores = {x.strip() for x in ignore_str.split(',') if x.strip()}
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _is_ignored(self, name):
+        if name.startswith('.'): return True
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.ignores)
+
+    def run(self):
+        files = []
+        for path in self.paths:
+            if self._cancelled: return
+            if os.path.isfile(path):
+                files.append(path)
+                continue
+            for root, dirs, names in os.walk(path):
+                if self._cancelled: return
+                dirs[:] = sorted(d for d in dirs if not self._is_ignored(d))
+                for name in sorted(names):
+                    if not self._is_ignored(name):
+                        files.append(os.path.join(root, name))
+                self.progress.emit(len(files))
+        self.expanded.emit(files)
+
 class DropSelectionDialog(QDialog):
     def __init__(self, paths, plugin_manager, parent=None):
         super().__init__(parent)
@@ -60,16 +103,36 @@ class DropSelectionDialog(QDialog):
         self.list_w.setMinimumHeight(100)
         layout.addWidget(self.list_w)
         
-        has_files = any(os.path.isfile(p) for p in paths)
-        has_folders = any(os.path.isdir(p) for p in paths)
+        self.has_files = any(os.path.isfile(p) for p in paths)
+        self.has_folders = any(os.path.isdir(p) for p in paths)
+        
+        # Offer to turn dropped folders into one file block per contained file
+        self.cb_expand = QCheckBox("Expand folders into file blocks")
+        self.cb_expand.setVisible(self.has_folders)
+        self.cb_expand.toggled.connect(self._populate_combo)
+        layout.addWidget(self.cb_expand)
         
         label_select = QLabel("Import as Block Type:")
         layout.addWidget(label_select)
         self.combo = QComboBox()
         self.combo.setStyleSheet(f"background: {C_BG_SECONDARY}; color: {C_TEXT_MAIN}; border: 1px solid {C_BORDER}; padding: 5px;")
+        self._populate_combo()
+        layout.addWidget(self.combo)
+        
+        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+
+    def _populate_combo(self):
+        self.combo.clear()
+        expand = self.cb_expand.isChecked()
+        has_folders = self.has_folders and not expand
+        has_files = self.has_files or expand
         
         valid_count = 0
-        all_plugins = self.pm.get_all_plugins()
+        # Manifests: listing block types does not import the plugin modules
+        all_plugins = self.pm.get_all_manifests()
 
         for plugin in all_plugins:
             supported = plugin.drag_types 
@@ -91,16 +154,12 @@ class DropSelectionDialog(QDialog):
             for plugin in all_plugins:
                 self.combo.addItem(plugin.name, plugin.id)
             if self.combo.count() > 1: self.combo.setCurrentIndex(1)
-                
-        layout.addWidget(self.combo)
-        
-        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        btns.accepted.connect(self.accept)
-        btns.rejected.connect(self.reject)
-        layout.addWidget(btns)
 
     def get_selected_plugin_id(self):
         return self.combo.currentData()
+
+    def expand_folders(self):
+        return self.has_folders and self.cb_expand.isChecked()
         
 class OverlayFileListWidget(QListWidget):
     filesDropped = pyqtSignal(list) 
@@ -129,7 +188,7 @@ class OverlayFileListWidget(QListWidget):
         self.overlay.setGeometry(self.rect().adjusted(4, 4, -4, -4))
 
     def dragEnterEvent(self, event: QDragEnterEvent):
-        if DragAndDropParser.parse_paths(event.mimeData()):
+        if DragAndDropParser.begin_session(event.mimeData()):
             event.accept()
             self.overlay.show()
             self.overlay.raise_()
@@ -144,11 +203,13 @@ class OverlayFileListWidget(QListWidget):
 
     def dragLeaveEvent(self, event):
         self.overlay.hide()
+        DragAndDropParser.end_session()
         super().dragLeaveEvent(event)
 
     def dropEvent(self, event: QDropEvent):
         self.overlay.hide()
         paths = DragAndDropParser.parse_paths(event.mimeData())
+        DragAndDropParser.end_session()
         if paths:
             event.accept()
             self.filesDropped.emit(paths)
@@ -160,6 +221,7 @@ class PromptComposerTool(QWidget):
     statusMessage = pyqtSignal(str)
     modificationChanged = pyqtSignal(bool)
     titleChanged = pyqtSignal(str)
+    savingChanged = pyqtSignal(bool)
 
     def __init__(self):
         super().__init__()
@@ -168,7 +230,7 @@ class PromptComposerTool(QWidget):
         self.pm = PluginManager()
         
         # Prevent re-registering core plugins if we open multiple tabs
-        if not self.pm.get_all_plugins():
+        if not self.pm.get_all_manifests():
             register_core_plugins()
             
             current_dir = os.path.dirname(os.path.abspath(__file__)) 
@@ -178,7 +240,10 @@ class PromptComposerTool(QWidget):
                 self.pm.load_from_folder(plugins_dir)
 
         self.is_modified = False
+        self.is_saving = False
         self.current_save_name = None
+        self._bulk_loading = False
+        self._expand_worker = None
         
         self.project_settings = {
             "include_tree": False,
@@ -262,6 +327,11 @@ class PromptComposerTool(QWidget):
         self.options_menu.addAction("Export JSON").triggered.connect(self.export_to_json)
         self.options_menu.addAction("Export to Markdown").triggered.connect(self.export_to_markdown)
         self.options_menu.addSeparator()
+        self.options_menu.addAction("Revision History...").triggered.connect(self.open_history)
+        self.options_menu.addSeparator()
+        self.options_menu.addAction("Export Library (JSONL)...").triggered.connect(self.export_library)
+        self.options_menu.addAction("Import Library (JSONL)...").triggered.connect(self.import_library)
+        self.options_menu.addSeparator()
         self.options_menu.addAction("Import .gitignore").triggered.connect(self.import_gitignore)
         self.btn_options.setMenu(self.options_menu)
 
@@ -312,23 +382,78 @@ class PromptComposerTool(QWidget):
         dlg = DropSelectionDialog(paths, self.pm, self)
         selected_plugin_id = None
         
-        if dlg.combo.count() == 1:
+        # Folders always show the dialog so the user can choose to expand them
+        if dlg.combo.count() == 1 and not dlg.has_folders:
             selected_plugin_id = dlg.get_selected_plugin_id()
-            self.statusMessage.emit(f"Auto-importing using: {self.pm.get_plugin(selected_plugin_id).name}")
+            self.statusMessage.emit(f"Auto-importing using: {self.pm.get_manifest(selected_plugin_id).name}")
         else:
             if dlg.exec() == QDialog.DialogCode.Accepted:
                 selected_plugin_id = dlg.get_selected_plugin_id()
             else:
                 return 
 
-        if selected_plugin_id:
-            plugin_name = self.pm.get_plugin(selected_plugin_id).id
-            for path in paths:
-                data = {"path": path}
-                self.add_item({"plugin_id": selected_plugin_id, "data": data})
-            
-            self.mark_as_modified()
-            self.statusMessage.emit(f"Added {len(paths)} items.")
+        if not selected_plugin_id: return
+
+        if dlg.expand_folders():
+            self.expand_dropped_folders(paths, selected_plugin_id)
+        else:
+            self.import_paths(paths, selected_plugin_id)
+
+    def import_paths(self, paths, plugin_id):
+        """Creates one block per path using the bulk insert path."""
+        if len(paths) > BULK_CONFIRM_THRESHOLD:
+            reply = QMessageBox.question(
+                self, "Large Import",
+                f"This will create {len(paths)} blocks.\nContinue?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes: return
+
+        states = [{"plugin_id": plugin_id, "data": {"path": path}} for path in paths]
+        self.add_items_bulk(states)
+        self.statusMessage.emit(f"Added {len(paths)} items.")
+
+    def expand_dropped_folders(self, paths, plugin_id):
+        """Collects the files inside dropped folders on a worker thread, then imports them."""
+        if self._expand_worker is not None: return
+
+        progress = QProgressDialog("Scanning dropped folders...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Import Files")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+
+        worker = FolderExpandWorker(paths, self.project_settings.get("global_ignore", ""), self)
+        worker.progress.connect(lambda n: progress.setLabelText(f"Scanning dropped folders... {n} files found"))
+        worker.expanded.connect(lambda files: self.import_paths(files, plugin_id))
+        progress.canceled.connect(worker.cancel)
+        worker.finished.connect(lambda: self._on_expand_finished(progress))
+
+        self._expand_worker = worker
+        worker.start()
+
+    def _on_expand_finished(self, progress):
+        # Runs after cancel too; both Qt objects are released so drops do not pile them up
+        progress.close()
+        progress.deleteLater()
+        self._expand_worker.deleteLater()
+        self._expand_worker = None
+
+    def add_items_bulk(self, states):
+        """
+        Adds many blocks at once. Repaints and per-block modification
+        signals are suspended until every block has been created.
+        """
+        if not states: return
+        self._bulk_loading = True
+        self.list_widget.setUpdatesEnabled(False)
+        self.list_widget.blockSignals(True)
+        try:
+            for state in states: self.add_item(state)
+        finally:
+            self.list_widget.blockSignals(False)
+            self.list_widget.setUpdatesEnabled(True)
+            self._bulk_loading = False
+        self.mark_as_modified()
 
     def add_item(self, data=None):
         item = QListWidgetItem(self.list_widget)
@@ -394,83 +519,106 @@ class PromptComposerTool(QWidget):
     def refresh_all_paths(self):
         pass
 
-    def handle_unsaved_changes(self):
+    def handle_unsaved_changes(self, on_saved=None):
+        """
+        True when the caller may go on. Choosing Save starts the save and returns
+        False; on_saved (if given) runs once it has succeeded, to retry the action.
+        """
+        if self.is_saving:
+            self.statusMessage.emit("Wait for the save to finish.")
+            return False
         if not self.is_modified: return True
         msg = QMessageBox(self)
         msg.setWindowTitle("Unsaved Changes")
         msg.setText("Save unsaved changes?")
         msg.setStandardButtons(QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel)
         ret = msg.exec()
-        if ret == QMessageBox.StandardButton.Save: return self.save_content()
+        if ret == QMessageBox.StandardButton.Save:
+            self.save_content(on_saved=on_saved)
+            return False
         elif ret == QMessageBox.StandardButton.Discard: return True
         return False
 
-    def save_content(self):
+    def save_content(self, on_saved=None):
+        if self.is_saving: return
         data = self._gather_data()
         dlg = PromptStateDialog(self, mode="save", current_name=self.current_save_name)
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            save_name = dlg.selected_name
-            success, msg = DBManager.save_prompt(save_name, data)
-            if success:
-                self.current_save_name = save_name
-                self.titleChanged.emit(save_name.upper())
-                
-                # Update QSettings Registry with the Date
-                settings = QSettings("PyTools", "PromptBuilder")
-                registry = settings.value("prompt_registry", {})
-                if not isinstance(registry, dict): registry = {}
-                registry[save_name] = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-                settings.setValue("prompt_registry", registry)
-                
-                self.statusMessage.emit(f"Saved: {save_name}")
-                self.set_modified(False)
-                return True
-            else:
-                QMessageBox.critical(self, "Error", msg)
-        return False
+            self._start_save(dlg.selected_name, data, on_saved)
     
     def quick_save(self):
         """Used by Ctrl+S shortcut"""
+        if self.is_saving: return
         if self.current_save_name:
-            data = self._gather_data()
-            success, msg = DBManager.save_prompt(self.current_save_name, data)
-            if success:
-                self.set_modified(False)
-                self.statusMessage.emit(f"Quick saved: {self.current_save_name}")
-                
-                settings = QSettings("PyTools", "PromptBuilder")
-                registry = settings.value("prompt_registry", {})
-                if not isinstance(registry, dict): registry = {}
-                registry[self.current_save_name] = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-                settings.setValue("prompt_registry", registry)
-            else:
-                QMessageBox.critical(self, "Error", msg)
+            self._start_save(self.current_save_name, self._gather_data())
         else:
             self.save_content()
 
+    def _start_save(self, name, data, on_saved=None):
+        # Saving is disabled until the job settles, so saves never overlap
+        self._set_saving(True)
+        self.statusMessage.emit(f"Saving: {name}...")
+        AsyncDB.instance().save_prompt(
+            name, data,
+            on_done=lambda result: self._on_saved(name, data, result, on_saved),
+            on_error=lambda error: self._on_saved(name, data, (False, str(error))))
+
+    def _set_saving(self, saving):
+        self.is_saving = saving
+        self.shortcut_save.setEnabled(not saving)
+        self.savingChanged.emit(saving)
+
+    def _on_saved(self, name, saved_data, result, on_saved=None):
+        self._set_saving(False)
+        success, msg = result
+        if not success:
+            QMessageBox.critical(self, "Error", msg)
+            return
+        if self.current_save_name != name:
+            self.current_save_name = name
+            self.titleChanged.emit(name.upper())
+        # Only clear the flag if nothing changed while the save was in flight
+        if self._gather_data() == saved_data:
+            self.set_modified(False)
+        self.statusMessage.emit(f"Saved: {name}")
+        if on_saved: on_saved()
+
     def load_content(self):
-        if not self.handle_unsaved_changes(): return
+        if not self.handle_unsaved_changes(on_saved=self.load_content): return
         dlg = PromptStateDialog(self, mode="load")
         if dlg.exec() == QDialog.DialogCode.Accepted:
             load_name = dlg.selected_name
-            data = DBManager.load_prompt(load_name)
-            if data:
-                self._load_data(data)
-                self.current_save_name = load_name
-                self.titleChanged.emit(load_name.upper())
-                
-                # Update QSettings Registry Date when loaded
-                settings = QSettings("PyTools", "PromptBuilder")
-                registry = settings.value("prompt_registry", {})
-                if not isinstance(registry, dict): registry = {}
-                registry[load_name] = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-                settings.setValue("prompt_registry", registry)
-                
-                self.set_modified(False)
-                self.statusMessage.emit(f"Loaded: {load_name}")
+            self.statusMessage.emit(f"Loading: {load_name}...")
+            AsyncDB.instance().load_prompt(load_name, on_done=lambda data: self._on_prompt_loaded(load_name, data))
+
+    def _on_prompt_loaded(self, load_name, data):
+        if not data:
+            QMessageBox.warning(self, "Not Found", f"Prompt '{load_name}' no longer exists.")
+            return
+        self._load_data(data)
+        self.current_save_name = load_name
+        self.titleChanged.emit(load_name.upper())
+        
+        # Record the "last opened" date in the prompts table
+        AsyncDB.instance().submit(DBManager.mark_opened, load_name)
+        
+        self.set_modified(False)
+        self.statusMessage.emit(f"Loaded: {load_name}")
+
+    def open_history(self):
+        if not self.current_save_name:
+            QMessageBox.information(self, "History", "Save or load a prompt first to browse its revisions.")
+            return
+        if not self.handle_unsaved_changes(on_saved=self.open_history): return
+        dlg = PromptHistoryDialog(self, self.current_save_name)
+        if dlg.exec() == QDialog.DialogCode.Accepted and dlg.selected_data is not None:
+            self._load_data(dlg.selected_data)
+            # Restoring never rewrites history: saving appends the old state as a new revision
+            self.mark_as_modified()
+            self.statusMessage.emit(f"Restored revision {dlg.selected_rev} of {self.current_save_name} (unsaved)")
 
     def import_from_json(self):
-        if not self.handle_unsaved_changes(): return
+        if not self.handle_unsaved_changes(on_saved=self.import_from_json): return
         fname, _ = QFileDialog.getOpenFileName(self, "Import", "", "JSON (*.json)")
         if fname:
             try:
@@ -487,6 +635,47 @@ class PromptComposerTool(QWidget):
         if fname:
             with open(fname, 'w') as f: json.dump(data, f, indent=2)
 
+    def export_library(self):
+        fname, _ = QFileDialog.getSaveFileName(self, "Export Library", "prompt_library.jsonl", "JSON Lines (*.jsonl)")
+        if not fname: return
+        self.statusMessage.emit("Exporting library...")
+        AsyncDB.instance().submit(
+            DBManager.export_library, fname,
+            on_done=lambda count: self.statusMessage.emit(f"Exported {count} prompts to {os.path.basename(fname)}"),
+            on_error=lambda e: QMessageBox.critical(self, "Export Failed", str(e))
+        )
+
+    def import_library(self):
+        fname, _ = QFileDialog.getOpenFileName(self, "Import Library", "", "JSON Lines (*.jsonl)")
+        if not fname: return
+
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Import Library")
+        msg.setText("What should happen to prompts that already exist in the current database?")
+        btn_overwrite = msg.addButton("Overwrite", QMessageBox.ButtonRole.AcceptRole)
+        btn_skip = msg.addButton("Keep Existing", QMessageBox.ButtonRole.AcceptRole)
+        msg.addButton(QMessageBox.StandardButton.Cancel)
+        msg.exec()
+        if msg.clickedButton() not in (btn_overwrite, btn_skip): return
+
+        mode = "upsert" if msg.clickedButton() is btn_overwrite else "skip"
+        self.statusMessage.emit("Importing library...")
+        AsyncDB.instance().submit(
+            DBManager.import_library, fname, mode,
+            on_done=self._on_library_imported,
+            on_error=lambda e: QMessageBox.critical(self, "Import Failed", f"Nothing was imported.\n\n{e}")
+        )
+
+    def _on_library_imported(self, stats):
+        text = f"Imported {stats['imported']} prompts, skipped {stats['skipped']}."
+        if stats["errors"]:
+            lines = "\n".join(f"Line {line}: {reason}" for line, reason in stats["errors"][:10])
+            more = f"\n... and {len(stats['errors']) - 10} more" if len(stats["errors"]) > 10 else ""
+            QMessageBox.warning(self, "Import Library", f"{text}\n\n{len(stats['errors'])} invalid line(s):\n{lines}{more}")
+        else:
+            QMessageBox.information(self, "Import Library", text)
+        self.statusMessage.emit(text)
+
     def export_to_markdown(self):
         res = self.txt_result.toPlainText()
         if not res and self.list_widget.count() > 0: res = self.generate_only()
@@ -523,7 +712,7 @@ class PromptComposerTool(QWidget):
         self.list_widget.clear()
         self.txt_result.clear()
         self.lbl_outdated.hide()
-        for entry in items: self.add_item(entry)
+        self.add_items_bulk(items)
 
     def generate_only(self):
         output = []
@@ -574,6 +763,7 @@ class PromptComposerTool(QWidget):
         self.modificationChanged.emit(state)
     
     def mark_as_modified(self):
+        if self._bulk_loading: return
         if not self.is_modified: self.set_modified(True)
         if self.txt_result.toPlainText().strip(): self.lbl_outdated.setVisible(True)
 
@@ -586,4 +776,4 @@ class PromptComposerTool(QWidget):
             self.import_gitignore()
 
     def request_clear(self):
-        if self.handle_unsaved_changes(): self.clear_all()
\ No newline at end of file
+        if self.handle_unsaved_changes(on_saved=self.clear_all): self.clear_all()
\ No newline at end of file